@@ -4,106 +4,157 @@ Interactive Dashboard CLI
 A command-line interface for generating HTML dashboards from JSON data sources.
 """
 
-import json
+import csv
+import inspect
+import io
 import os
 import argparse
+import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from src.table_generator import TableGenerator
+from itertools import chain
+from typing import Callable, Dict, List, Any, Optional, Iterator, Tuple
+from urllib.parse import unquote
+from src.caching import SectionCache
+from src.serving import DEFAULT_CACHE_BYTES, RenderServer, Resolution
+from src.catalog import CATALOG_FILENAME, DatasetCatalog, summarize_dataset
+from src.sources import (CSV_DIALECTS, DECOMPRESSORS, JSON_LINES_SUFFIXES, CSVReader, CursorReader,
+                         JSONArrayReader, JSONLinesReader, file_dataset_name,
+                         is_csv, is_json_lines, load_file)
+from src.table_generator import COMPRESSION_SUFFIXES, AssetRegistry, TableGenerator, _process_pool
 from datetime import datetime
 
+# Number of leading records used to discover the columns of a streamed table;
+# columns first seen later are appended and labelled in the table footer
+STREAM_HEADER_SAMPLE = 1000
+
 
 class DashboardCLI:
     def __init__(self):
         self.data_dir = Path(__file__).parent / "data"
         self.output_dir = Path(__file__).parent
+        # csv.reader options (dialect, delimiter, header, ...) for CSV/TSV datasets
+        self.csv_options: Dict[str, Any] = {}
+        # Decompress compressed datasets in a background thread while streaming tables
+        self.decompress_thread = False
+        # SQL queries of the datasets added with add_query_dataset, by dataset name
+        self.queries: Dict[str, str] = {}
         self.available_datasets = self._discover_datasets()
         
     def _discover_datasets(self) -> Dict[str, str]:
-        """Discover available JSON datasets."""
+        """
+        Discover available JSON, JSON Lines (.jsonl/.ndjson) and CSV/TSV datasets,
+        plain or compressed (.gz/.bz2/.xz).
+        """
         datasets = {}
         if self.data_dir.exists():
-            for json_file in self.data_dir.glob("*.json"):
-                key = json_file.stem
-                datasets[key] = str(json_file)
+            for suffix in ('.json',) + JSON_LINES_SUFFIXES + tuple(CSV_DIALECTS):
+                for compression in ('',) + tuple(DECOMPRESSORS):
+                    for json_file in sorted(self.data_dir.glob(f"*{suffix}{compression}")):
+                        if json_file.name.startswith('.'):
+                            # Hidden files such as the dataset catalog are not datasets
+                            continue
+                        key = file_dataset_name(json_file)
+                        datasets[key] = str(json_file)
         return datasets
     
     def load_dataset(self, dataset_name: str) -> Dict[str, Any]:
-        """Load a JSON dataset."""
+        """Load a JSON dataset (JSON Lines records are returned under the dataset name)."""
         if dataset_name not in self.available_datasets:
             raise ValueError(f"Dataset '{dataset_name}' not found. Available: {list(self.available_datasets.keys())}")
         
-        with open(self.available_datasets[dataset_name], 'r') as f:
-            return json.load(f)
+        return load_file(self.available_datasets[dataset_name], **self.csv_options)
+    
+    def add_dataset_file(self, path: str) -> str:
+        """
+        Make a data file outside the data directory available as a dataset.
+        
+        Returns:
+            The dataset name (the file name without suffix)
+        """
+        dataset_name = file_dataset_name(path)
+        self.available_datasets[dataset_name] = str(path)
+        return dataset_name
+    
+    def add_query_dataset(self, dataset_name: str, database: str, query: str) -> str:
+        """
+        Make the result of a SQL query on a SQLite database available as a dataset.
+        
+        The database is opened read-only when the table is rendered and the
+        rows are streamed from the cursor in batches.
+        
+        Returns:
+            The dataset name
+        """
+        self.available_datasets[dataset_name] = str(database)
+        self.queries[dataset_name] = query
+        return dataset_name
+    
+    def get_catalog(self) -> DatasetCatalog:
+        """Get the metadata catalog of the data directory."""
+        return DatasetCatalog(self.data_dir / CATALOG_FILENAME)
     
     def list_datasets(self):
-        """List all available datasets."""
+        """List all available datasets (from the catalog, parsing only changed files)."""
         print("📊 Available Datasets:")
         print("=" * 50)
         
+        catalog = self.get_catalog()
         for name, path in self.available_datasets.items():
-            data = self.load_dataset(name)
-            
-            # Get dataset info
-            if isinstance(data, dict):
-                if len(data) == 1:
-                    # Single key dataset
-                    key = list(data.keys())[0]
-                    value = data[key]
-                    if isinstance(value, list):
-                        count = len(value)
-                        item_type = "records"
-                    elif isinstance(value, dict):
-                        count = len(value)
-                        item_type = "metrics"
-                    else:
-                        count = 1
-                        item_type = "item"
-                else:
-                    count = len(data)
-                    item_type = "top-level keys"
-            elif isinstance(data, list):
-                count = len(data)
-                item_type = "records"
-            else:
-                count = 1
-                item_type = "item"
-            
-            print(f"  • {name:<25} {count:>3} {item_type}")
+            try:
+                info = catalog.describe(name, path)
+            except (OSError, ValueError) as e:
+                print(f"  • {name:<25} ⚠️ unreadable ({e})")
+                continue
+            print(f"  • {name:<25} {info['count']:>3} {info['structure']}")
         
+        catalog.prune(list(self.available_datasets))
+        catalog.save()
         print(f"\n💾 Data files location: {self.data_dir}")
     
     def preview_dataset(self, dataset_name: str, limit: int = 3):
-        """Preview a dataset."""
+        """Preview a dataset (from the catalog's sample records when it holds enough)."""
         try:
-            data = self.load_dataset(dataset_name)
+            if dataset_name not in self.available_datasets:
+                raise ValueError(f"Dataset '{dataset_name}' not found. Available: {list(self.available_datasets.keys())}")
+            
+            catalog = self.get_catalog()
+            info = catalog.describe(dataset_name, self.available_datasets[dataset_name])
+            catalog.save()
+            samples = info['samples']
+            if len(samples) < min(limit, info['count']):
+                # More samples requested than the catalog keeps
+                info = summarize_dataset(self.load_dataset(dataset_name), sample_size=limit)
+                samples = info['samples']
+            samples = samples[:limit]
+            
             print(f"🔍 Preview of '{dataset_name}':")
             print("=" * 50)
             
-            if isinstance(data, dict) and len(data) == 1:
+            if info['key'] is not None:
                 # Single key dataset
-                key = list(data.keys())[0]
-                value = data[key]
-                print(f"Dataset key: {key}")
+                print(f"Dataset key: {info['key']}")
                 
-                if isinstance(value, list) and value:
-                    print(f"Records: {len(value)}")
-                    print(f"Sample records (showing {min(limit, len(value))}):")
-                    for i, record in enumerate(value[:limit]):
+                if info['structure'] == 'records' and info['count']:
+                    print(f"Records: {info['count']}")
+                    columns = [f"{column} ({info['types'][column]})" for column in info['columns']]
+                    print(f"Columns: {', '.join(columns)}")
+                    print(f"Sample records (showing {len(samples)}):")
+                    for i, record in enumerate(samples):
                         print(f"  Record {i+1}: {record}")
-                elif isinstance(value, dict):
-                    print(f"Metrics: {len(value)}")
+                elif info['structure'] == 'metrics':
+                    print(f"Metrics: {info['count']}")
                     print("Sample metrics:")
-                    for i, (k, v) in enumerate(list(value.items())[:limit]):
+                    for k, v in samples:
                         print(f"  {k}: {v}")
             else:
-                print(f"Structure: {type(data).__name__}")
-                if isinstance(data, dict):
-                    print("Keys:", list(data.keys())[:limit])
-                elif isinstance(data, list):
-                    print(f"Items: {len(data)}")
-                    print("Sample:", data[:limit])
+                print(f"Structure: {info['type']}")
+                if info['structure'] == 'top-level keys':
+                    print("Keys:", samples)
+                elif info['structure'] == 'records':
+                    print(f"Items: {info['count']}")
+                    print("Sample:", samples)
                     
         except Exception as e:
             print(f"❌ Error previewing dataset: {e}")
@@ -112,50 +163,55 @@ class DashboardCLI:
                             sortable: bool = True, striped: bool = True):
         """Generate a single HTML table from a dataset."""
         try:
-            data = self.load_dataset(dataset_name)
+            # Save file
+            if not output_file:
+                output_file = f"{dataset_name}_table.html"
             
-            # Extract the data array
-            if isinstance(data, dict) and len(data) == 1:
-                key = list(data.keys())[0]
-                table_data = data[key]
-                table_title = key.replace('_', ' ').title()
-            else:
-                table_data = data
-                table_title = dataset_name.replace('_', ' ').title()
+            output_path = self.output_dir / output_file
+            record_count = self.write_single_table(dataset_name, output_path, sortable, striped)
             
-            # Handle key_metrics special case (convert to list format)
-            if dataset_name == 'key_metrics' and isinstance(table_data, dict):
-                formatted_data = []
-                for metric_key, metric_data in table_data.items():
-                    if isinstance(metric_data, dict):
-                        row = {
-                            'Metric': metric_key.replace('_', ' ').title(),
-                            'Value': metric_data.get('formatted', str(metric_data.get('value', ''))),
-                            'Description': metric_data.get('description', ''),
-                            'Trend': metric_data.get('trend', '').title()
-                        }
-                        formatted_data.append(row)
-                table_data = formatted_data
+            print(f"✅ Table generated: {output_path}")
+            print(f"📊 Records: {record_count if record_count is not None else 'N/A'}")
+            print(f"🌐 Open in browser: file://{output_path.absolute()}")
+            
+        except Exception as e:
+            print(f"❌ Error generating table: {e}")
+    
+    def write_single_table(self, dataset_name: str, target: Any,
+                           sortable: bool = True, striped: bool = True) -> Optional[int]:
+        """
+        Render a single-table document for a dataset straight into a file or stream.
+        
+        Returns:
+            Number of records rendered, or None if the data is not a list
+        """
+        # A stream can only be rendered again (see _render_table_rows) if it can be rewound
+        start = None if isinstance(target, (str, os.PathLike)) or not target.seekable() else target.tell()
+        
+        def render(table_data: Any, table_title: str, reader: Optional[Any]) -> Optional[int]:
+            if start is not None:
+                target.seek(start)
+                target.truncate()
             
             # Generate table
             generator = TableGenerator(
                 sortable=sortable,
                 striped=striped,
                 responsive=True,
-                table_class=f'{dataset_name}-table'
+                table_class=f'{dataset_name}-table',
+                **self._stream_options(reader)
             )
             
-            table_html = generator.generate_table(table_data)
-            
-            # Create styled HTML document
+            # Create styled HTML document around the streamed table
             css = self._get_basic_css()
-            content = f"""
+            content_start = f"""
             <div class="container">
                 <h1>📊 {table_title}</h1>
-                <p class="subtitle">Generated from {dataset_name}.json</p>
+                <p class="subtitle">Generated from {Path(self.available_datasets[dataset_name]).name}</p>
                 <div class="table-section">
                     <p class="help-text">💡 Click column headers to sort data</p>
-                    {table_html}
+                    """
+            content_end = f"""
                 </div>
                 <div class="footer">
                     <p>Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
@@ -164,81 +220,394 @@ class DashboardCLI:
             </div>
             """
             
-            complete_html = generator.render_html(content, title=f"{table_title} - Data Table", css=css)
+            body = chain([content_start], generator.iter_table(table_data), [content_end])
+            generator.write_document(body, target, title=f"{table_title} - Data Table", css=css)
             
-            # Save file
+            if reader is not None:
+                return reader.count
+            return len(table_data) if isinstance(table_data, list) else None
+        
+        return self._render_table_rows(dataset_name, render,
+                                       retry=start is not None or isinstance(target, (str, os.PathLike)))
+    
+    def _render_table_rows(self, dataset_name: str, render: Callable[[Any, str, Optional[Any]], Any],
+                           retry: bool = True) -> Any:
+        """
+        Call render(table data, title, reader) with the table rows of a dataset.
+        
+        Whether a streamed JSON record array is the whole document is only
+        known once it has been read. If other members follow it, the document
+        is loaded whole and rendered again the way the dashboard renders it,
+        which needs render to be able to overwrite its earlier output (retry).
+        """
+        table_data, table_title, reader = self._open_table_rows(dataset_name)
+        try:
+            return render(table_data, table_title, reader)
+        except ValueError:
+            if not (retry and isinstance(reader, JSONArrayReader) and reader.other_members):
+                raise
+        finally:
+            if reader is not None:
+                reader.close()
+        table_data, table_title = self._extract_table_data(dataset_name, self.load_dataset(dataset_name))
+        return render(table_data, table_title, None)
+    
+    def _open_table_rows(self, dataset_name: str) -> Tuple[Any, str, Optional[Any]]:
+        """
+        Get the table rows of a dataset, streaming them when the file allows it.
+        
+        Query results, JSON Lines and CSV/TSV datasets, and datasets holding a
+        record array (``{"name": [...]}`` or a bare array) are read row by row, so
+        memory does not grow with the file size (see _render_table_rows for
+        arrays that turn out not to be the whole document). Anything else is
+        loaded whole and converted by _extract_table_data.
+        
+        Returns:
+            Tuple of (table data, title, streaming reader or None); the reader
+            is the table data when set and counts the records read from it
+        """
+        if dataset_name not in self.available_datasets:
+            raise ValueError(f"Dataset '{dataset_name}' not found. Available: {list(self.available_datasets.keys())}")
+        
+        path = self.available_datasets[dataset_name]
+        if dataset_name in self.queries:
+            connection = sqlite3.connect(f"{Path(path).absolute().as_uri()}?mode=ro", uri=True)
+            try:
+                reader = CursorReader(connection.execute(self.queries[dataset_name]),
+                                      connection=connection).open()
+            except BaseException:
+                connection.close()
+                raise
+            return reader, dataset_name.replace('_', ' ').title(), reader
+        
+        if is_json_lines(path) or is_csv(path):
+            reader = (JSONLinesReader(path, threaded=self.decompress_thread) if is_json_lines(path) else
+                      CSVReader(path, threaded=self.decompress_thread, **self.csv_options)).open()
+            return reader, dataset_name.replace('_', ' ').title(), reader
+        
+        try:
+            reader = JSONArrayReader(path, threaded=self.decompress_thread).open()
+        except ValueError:
+            # Not a record array (e.g. key_metrics) or malformed; load_dataset reports the latter
+            table_data, table_title = self._extract_table_data(dataset_name, self.load_dataset(dataset_name))
+            return table_data, table_title, None
+        
+        table_title = (reader.key or dataset_name).replace('_', ' ').title()
+        return reader, table_title, reader
+    
+    def _stream_options(self, reader: Optional[Any]) -> Dict[str, Any]:
+        """Get the TableGenerator options for rows read from a streaming reader."""
+        if reader is None:
+            return {}
+        return {'header_sample': STREAM_HEADER_SAMPLE, 'late_keys': 'append'}
+    
+    def generate_paginated_table(self, dataset_name: str, output_file: str = None, page_size: int = 1000,
+                                 sortable: bool = True, striped: bool = True):
+        """Generate a dataset table split over several HTML pages plus an index page."""
+        try:
             if not output_file:
                 output_file = f"{dataset_name}_table.html"
             
             output_path = self.output_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(complete_html)
             
-            print(f"✅ Table generated: {output_path}")
-            print(f"📊 Records: {len(table_data) if isinstance(table_data, list) else 'N/A'}")
-            print(f"🌐 Open in browser: file://{output_path.absolute()}")
+            def render(table_data: Any, table_title: str,
+                       reader: Optional[Any]) -> Tuple[str, List[str]]:
+                generator = TableGenerator(
+                    sortable=sortable,
+                    striped=striped,
+                    responsive=True,
+                    table_class=f'{dataset_name}-table',
+                    **self._stream_options(reader)
+                )
+                return generator.write_pages(
+                    table_data,
+                    output_path.parent,
+                    page_size=page_size,
+                    basename=output_path.stem,
+                    title=f"{table_title} - Data Table",
+                    css=self._get_basic_css()
+                )
+            
+            index_path, page_paths = self._render_table_rows(dataset_name, render)
+            
+            print(f"✅ Paginated table generated: {index_path}")
+            print(f"📄 Pages: {len(page_paths)} ({page_size} records per page)")
+            print(f"🌐 Open in browser: file://{Path(index_path).absolute()}")
             
         except Exception as e:
             print(f"❌ Error generating table: {e}")
     
-    def generate_dashboard(self, datasets: List[str] = None, output_file: str = "interactive_dashboard.html"):
-        """Generate a comprehensive dashboard from multiple datasets."""
+    def generate_dashboard(self, datasets: List[str] = None, output_file: str = "interactive_dashboard.html",
+                           jobs: int = 1, external_assets: bool = False,
+                           compression: Optional[str] = None, compresslevel: Optional[int] = None,
+                           keep_plain: bool = False, cache_dir: Optional[str] = None):
+        """
+        Generate a comprehensive dashboard from multiple datasets.
+        
+        The CSS and JavaScript shared by the sections are emitted once; with
+        external_assets they go into content-hashed files next to the output.
+        With compression the dashboard is compressed while it is written, to
+        e.g. dashboard.html.gz, and keep_plain also writes dashboard.html.
+        With cache_dir, rendered sections are cached there and only sections
+        whose dataset file or configuration changed are rendered again.
+        """
         try:
             if not datasets:
                 datasets = list(self.available_datasets.keys())
             
             print(f"🚀 Generating dashboard with datasets: {', '.join(datasets)}")
             
-            # Load all datasets
-            all_data = {}
+            dataset_names = []
             for dataset_name in datasets:
                 if dataset_name in self.available_datasets:
-                    all_data[dataset_name] = self.load_dataset(dataset_name)
+                    dataset_names.append(dataset_name)
                 else:
                     print(f"⚠️ Warning: Dataset '{dataset_name}' not found, skipping...")
             
-            # Generate tables for each dataset
-            sections = []
+            output_path = self.output_dir / output_file
+            assets = AssetRegistry(output_path.parent if external_assets else None)
             
-            for dataset_name, data in all_data.items():
-                section_html = self._generate_dashboard_section(dataset_name, data)
-                sections.append(section_html)
+            target = output_path
+            if compression and not keep_plain:
+                # The compressed document replaces the plain one
+                target = output_path.with_name(output_path.name + COMPRESSION_SUFFIXES[compression])
             
-            # Create dashboard
-            dashboard_content = self._create_dashboard_layout(sections)
+            cache = SectionCache(cache_dir) if cache_dir else None
+            section_count = self.write_dashboard(dataset_names, target, jobs, assets, cache,
+                                                 compression=compression,
+                                                 compresslevel=compresslevel,
+                                                 sidecar=keep_plain)
+            if cache is not None:
+                print(f"♻️ Reused {cache.hits} cached section(s), rendered {cache.misses}")
             
-            # Generate complete HTML
-            generator = TableGenerator(sortable=True, striped=True)
-            complete_html = generator.render_html(
-                dashboard_content,
-                title="Interactive Business Dashboard",
-                css=self._get_dashboard_css()
-            )
-            
-            # Save file
-            output_path = self.output_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(complete_html)
-            
-            print(f"✅ Dashboard generated: {output_path}")
-            print(f"📊 Sections: {len(sections)}")
-            print(f"🌐 Open in browser: file://{output_path.absolute()}")
+            print(f"✅ Dashboard generated: {target}")
+            if compression and keep_plain:
+                print(f"🗜️ Compressed copy: {output_path}{COMPRESSION_SUFFIXES[compression]}")
+            print(f"📊 Sections: {section_count}")
+            if target == output_path:
+                print(f"🌐 Open in browser: file://{output_path.absolute()}")
             
         except Exception as e:
             print(f"❌ Error generating dashboard: {e}")
     
-    def _generate_dashboard_section(self, dataset_name: str, data: Dict[str, Any]) -> str:
-        """Generate a dashboard section for a dataset."""
+    def write_dashboard(self, dataset_names: List[str], target: Any, jobs: int = 1,
+                        assets: Optional[AssetRegistry] = None,
+                        cache: Optional[SectionCache] = None, **write_options) -> int:
+        """
+        Render the dashboard of the given datasets into a file or stream.
+        
+        Args:
+            dataset_names: Names of available datasets, in section order
+            target: File path, or a text or binary stream open for writing
+            jobs: Load and render sections with this many workers
+            assets: Registry collecting the shared CSS/JS (inline by default)
+            cache: Section cache to reuse unchanged sections from
+            **write_options: compression, compresslevel and sidecar, as for
+                             TableGenerator.write_document
+        
+        Returns:
+            Number of sections rendered (failing datasets are skipped)
+        """
+        if assets is None:
+            assets = AssetRegistry()
+        
+        # Load datasets and generate tables for each one
+        sections = self._generate_dashboard_sections(dataset_names, jobs, assets, cache)
+        
+        # Write complete HTML around the dashboard layout
+        generator = TableGenerator(sortable=True, striped=True, assets=assets)
+        generator.write_document(
+            self._iter_dashboard_layout(sections),
+            target,
+            title="Interactive Business Dashboard",
+            css=self._get_dashboard_css(),
+            **write_options
+        )
+        return len(sections)
+    
+    def _generate_dashboard_sections(self, dataset_names: List[str], jobs: int = 1,
+                                     assets: Optional[AssetRegistry] = None,
+                                     cache: Optional[SectionCache] = None) -> List[str]:
+        """
+        Load and render the dashboard sections, in dataset order.
+        
+        With jobs > 1, files are loaded in a thread pool and sections are
+        rendered in a process pool as soon as their data is loaded. A section
+        that fails to load or render is reported and left out. The assets
+        each section needs are collected into the given registry. Sections
+        found in the cache are reused without loading their dataset.
+        """
+        results: Dict[str, Any] = {}
+        stats: Dict[str, Dict[str, int]] = {}
+        pending = []
+        for dataset_name in dataset_names:
+            if cache is not None:
+                path = self.available_datasets[dataset_name]
+                try:
+                    # Taken before loading so a file changed mid-build is not cached
+                    stats[dataset_name] = cache.stat(path)
+                except OSError:
+                    pass
+                cached = cache.get(dataset_name, path, self._section_config(dataset_name))
+                if cached is not None:
+                    results[dataset_name] = (cached['html'], AssetRegistry.from_dict(cached['assets']))
+                    continue
+            pending.append(dataset_name)
+        
+        if jobs <= 1:
+            for dataset_name in pending:
+                try:
+                    data = self.load_dataset(dataset_name)
+                    results[dataset_name] = self._generate_dashboard_section(dataset_name, data)
+                except Exception as e:
+                    results[dataset_name] = e
+        else:
+            # Render workers start while loader threads run, so they must not be forked
+            with ThreadPoolExecutor(max_workers=jobs) as load_pool, \
+                    _process_pool(jobs) as render_pool:
+                loads = {load_pool.submit(self.load_dataset, name): name for name in pending}
+                renders = {}
+                for future in as_completed(loads):
+                    dataset_name = loads[future]
+                    try:
+                        renders[dataset_name] = render_pool.submit(
+                            self._generate_dashboard_section, dataset_name, future.result())
+                    except Exception as e:
+                        results[dataset_name] = e
+                for dataset_name, future in renders.items():
+                    try:
+                        results[dataset_name] = future.result()
+                    except Exception as e:
+                        results[dataset_name] = e
+        
+        if cache is not None:
+            for dataset_name in pending:
+                result = results[dataset_name]
+                if dataset_name in stats and not isinstance(result, Exception):
+                    section_html, section_assets = result
+                    cache.put(dataset_name, self.available_datasets[dataset_name],
+                              self._section_config(dataset_name),
+                              {'html': section_html, 'assets': section_assets.to_dict()},
+                              stats[dataset_name])
+        
+        sections = []
+        for dataset_name in dataset_names:
+            result = results[dataset_name]
+            if isinstance(result, Exception):
+                print(f"⚠️ Warning: Section '{dataset_name}' failed: {result}")
+            else:
+                section_html, section_assets = result
+                if assets is not None:
+                    assets.update(section_assets)
+                sections.append(section_html)
+        return sections
+    
+    def serve(self, host: str = "127.0.0.1", port: int = 8000,
+              cache_bytes: int = DEFAULT_CACHE_BYTES, warm: bool = False):
+        """
+        Serve the dashboard and dataset tables over HTTP, rendering them on demand.
+        
+        Routes: ``/`` (dashboard of all datasets, or ``/?datasets=a,b``) and
+        ``/table/<dataset>``. Rendered pages are cached in memory until their
+        dataset files change; see make_server.
+        """
+        server = self.make_server(host, port, cache_bytes)
+        if warm:
+            urls = ["/"] + [f"/table/{name}" for name in self.available_datasets]
+            failed = server.warm(urls)
+            print(f"🔥 Warmed {len(urls) - len(failed)} page(s) "
+                  f"({server.cache.current_bytes / 1024:.0f} KB cached)")
+        
+        host, port = server.server_address[:2]
+        print(f"🌐 Serving dashboards on http://{host}:{port}/ (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Server stopped")
+        finally:
+            server.server_close()
+    
+    def make_server(self, host: str = "127.0.0.1", port: int = 8000,
+                    cache_bytes: int = DEFAULT_CACHE_BYTES, quiet: bool = False) -> RenderServer:
+        """
+        Create the HTTP server used by serve (not yet serving).
+        
+        Pages are cached under the size and mtime of every dataset file they
+        are rendered from, so they are rendered again as soon as a file
+        changes, and answered with 304 Not Modified while it does not.
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            cache_bytes: Maximum size of the rendered page cache
+            quiet: Do not log every request
+        """
+        return RenderServer((host, port), self._resolve_request, cache_bytes, quiet)
+    
+    def _resolve_request(self, path: str, params: Dict[str, List[str]]) -> Optional[Resolution]:
+        """Map a request to its page cache key and render function (None if unknown)."""
+        # Pick up datasets added to or removed from the data directory
+        self.available_datasets = self._discover_datasets()
+        
+        if path in ("/", "/dashboard"):
+            if "datasets" in params:
+                names = [name for value in params["datasets"] for name in value.split(",") if name]
+            else:
+                names = list(self.available_datasets)
+            fingerprint = self._dataset_fingerprint(names)
+            if fingerprint is None:
+                return None
+            
+            def render_dashboard() -> bytes:
+                output = io.BytesIO()
+                self.write_dashboard(names, output)
+                return output.getvalue()
+            return ("dashboard", fingerprint), render_dashboard
+        
+        if path.startswith("/table/"):
+            name = unquote(path[len("/table/"):])
+            fingerprint = self._dataset_fingerprint([name])
+            if fingerprint is None:
+                return None
+            
+            def render_table() -> bytes:
+                output = io.BytesIO()
+                self.write_single_table(name, output)
+                return output.getvalue()
+            return ("table", fingerprint), render_table
+        
+        return None
+    
+    def _dataset_fingerprint(self, dataset_names: List[str]) -> Optional[Tuple]:
+        """Get the (name, size, mtime) of every dataset file, or None if one is missing."""
+        fingerprint = []
+        for dataset_name in dataset_names:
+            if dataset_name not in self.available_datasets:
+                return None
+            try:
+                stat = os.stat(self.available_datasets[dataset_name])
+            except OSError:
+                return None
+            fingerprint.append((dataset_name, stat.st_size, stat.st_mtime_ns))
+        return tuple(fingerprint)
+    
+    def _extract_table_data(self, dataset_name: str, data: Any):
+        """
+        Extract the table rows and a display title from a loaded dataset.
+        
+        Returns:
+            Tuple of (table data, title)
+        """
         # Extract the data array
         if isinstance(data, dict) and len(data) == 1:
             key = list(data.keys())[0]
             table_data = data[key]
-            section_title = key.replace('_', ' ').title()
+            table_title = key.replace('_', ' ').title()
         else:
             table_data = data
-            section_title = dataset_name.replace('_', ' ').title()
+            table_title = dataset_name.replace('_', ' ').title()
         
-        # Handle key_metrics special case
+        # Handle key_metrics special case (convert to list format)
         if dataset_name == 'key_metrics' and isinstance(table_data, dict):
             formatted_data = []
             for metric_key, metric_data in table_data.items():
@@ -252,17 +621,23 @@ class DashboardCLI:
                     formatted_data.append(row)
             table_data = formatted_data
         
-        # Create generator with dataset-specific styling
-        color_map = {
-            'quarterly_performance': '#4a90e2',
-            'regional_performance': '#5cb85c',
-            'product_performance': '#d9534f',
-            'key_metrics': '#8e44ad',
-            'employee_data': '#f39c12'
-        }
+        return table_data, table_title
+    
+    def _generate_dashboard_section(self, dataset_name: str,
+                                    data: Dict[str, Any]) -> Tuple[str, AssetRegistry]:
+        """
+        Generate a dashboard section for a dataset.
         
-        color = color_map.get(dataset_name, '#6c757d')
+        Returns:
+            Tuple of (section HTML, registry of the CSS/JS the section needs);
+            the registry is returned rather than shared so sections can be
+            rendered in worker processes
+        """
+        table_data, section_title = self._extract_table_data(dataset_name, data)
+        config = self._section_config(dataset_name)
+        color = config['color']
         
+        # Create generator with dataset-specific styling
         generator = TableGenerator(
             sortable=True,
             striped=True,
@@ -271,7 +646,8 @@ class DashboardCLI:
             styles={
                 'th': f'background-color: {color}; color: white; padding: 12px; border: 1px solid #ddd;',
                 'td': 'padding: 10px; border: 1px solid #ddd;'
-            }
+            },
+            assets=AssetRegistry()
         )
         
         table_html = generator.generate_table(table_data)
@@ -280,17 +656,46 @@ class DashboardCLI:
         collapsible_section = generator.make_collapsible_with_css(
             table_html,
             title=f"📊 {section_title}",
-            collapsed=dataset_name != 'key_metrics',  # Keep key_metrics expanded
+            collapsed=config['collapsed'],
             container_class=f'{dataset_name}-section'
         )
         
-        return collapsible_section
+        return collapsible_section, generator.assets
+    
+    def _section_config(self, dataset_name: str) -> Dict[str, Any]:
+        """
+        Get everything besides the dataset that affects how a section renders.
+        
+        Used both to render the section and as part of its build cache key;
+        the renderer fingerprint invalidates cached sections when the code changes.
+        """
+        color_map = {
+            'quarterly_performance': '#4a90e2',
+            'regional_performance': '#5cb85c',
+            'product_performance': '#d9534f',
+            'key_metrics': '#8e44ad',
+            'employee_data': '#f39c12'
+        }
+        renderer = []
+        for source in (inspect.getfile(TableGenerator), __file__):
+            stat = os.stat(source)
+            renderer.append([os.path.basename(source), stat.st_size, stat.st_mtime_ns])
+        
+        return {
+            'color': color_map.get(dataset_name, '#6c757d'),
+            'collapsed': dataset_name != 'key_metrics',  # Keep key_metrics expanded
+            'renderer': renderer
+        }
     
     def _create_dashboard_layout(self, sections: List[str]) -> str:
         """Create the dashboard layout."""
+        return ''.join(self._iter_dashboard_layout(sections))
+    
+    def _iter_dashboard_layout(self, sections: List[str]) -> Iterator[str]:
+        """Yield the dashboard layout piece by piece, one section at a time."""
         current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
         
-        return f"""
+        yield f"""
         <div class="dashboard-container">
             <div class="dashboard-header">
                 <h1>🏢 Interactive Business Dashboard</h1>
@@ -299,7 +704,9 @@ class DashboardCLI:
             </div>
             
             <div class="dashboard-sections">
-                {''.join(sections)}
+                """
+        yield from sections
+        yield f"""
             </div>
             
             <div class="dashboard-footer">
@@ -466,7 +873,17 @@ Examples:
   %(prog)s table employee_data                     # Generate single table
   %(prog)s dashboard                               # Generate full dashboard
   %(prog)s dashboard --datasets key_metrics regional_performance
+  %(prog)s dashboard --jobs 8                      # Parallel load and render
+  %(prog)s dashboard --external-assets             # Shared CSS/JS in cacheable files
+  %(prog)s dashboard --compress gzip --keep-plain  # Also write interactive_dashboard.html.gz
+  %(prog)s dashboard --cache-dir .dashboard_cache  # Re-render changed datasets only
   %(prog)s table product_performance --output products.html
+  %(prog)s table employee_data --page-size 2       # Paginated output
+  %(prog)s table exports/orders.csv                # Stream a CSV/TSV file
+  %(prog)s table exports/events.jsonl.xz           # Decompressed while streaming
+  %(prog)s table --sqlite shop.db --query "SELECT * FROM orders" --output orders.html
+  %(prog)s serve --port 8000 --warm                # Render on request with an in-memory cache
+  %(prog)s table report.csv --delimiter ";" --no-header
         """
     )
     
@@ -482,18 +899,59 @@ Examples:
     
     # Single table command
     table_parser = subparsers.add_parser('table', help='Generate single HTML table')
-    table_parser.add_argument('dataset', help='Dataset name to generate table from')
+    table_parser.add_argument('dataset', nargs='?',
+                              help='Dataset name, or path of a JSON/JSON Lines/CSV/TSV file '
+                                   '(with --sqlite: name of the query result, default "query")')
     table_parser.add_argument('--output', help='Output HTML file name')
     table_parser.add_argument('--no-sort', action='store_true', help='Disable sorting')
     table_parser.add_argument('--no-stripe', action='store_true', help='Disable striped rows')
+    table_parser.add_argument('--page-size', type=int,
+                              help='Split the table into pages of N records plus an index page')
+    table_parser.add_argument('--dialect', choices=sorted(csv.list_dialects()),
+                              help='CSV dialect (default: excel-tab for .tsv, excel otherwise)')
+    table_parser.add_argument('--delimiter', help='CSV field delimiter, overriding the dialect')
+    table_parser.add_argument('--no-header', action='store_true',
+                              help='The CSV file has no header row (columns are numbered)')
+    table_parser.add_argument('--decompress-thread', action='store_true',
+                              help='Decompress .gz/.bz2/.xz input in a background thread')
+    table_parser.add_argument('--sqlite', metavar='DATABASE',
+                              help='Render the result of --query on this SQLite database')
+    table_parser.add_argument('--query', help='SQL query to run with --sqlite')
     
     # Dashboard command
     dashboard_parser = subparsers.add_parser('dashboard', help='Generate comprehensive dashboard')
     dashboard_parser.add_argument('--datasets', nargs='+', help='Specific datasets to include')
     dashboard_parser.add_argument('--output', default='interactive_dashboard.html', help='Output HTML file name')
+    dashboard_parser.add_argument('--jobs', type=int, default=1,
+                                  help='Load and render sections in parallel with N workers')
+    dashboard_parser.add_argument('--external-assets', action='store_true',
+                                  help='Write the shared CSS/JS to content-hashed files next to the output')
+    dashboard_parser.add_argument('--compress', choices=sorted(COMPRESSION_SUFFIXES),
+                                  help='Compress the dashboard while writing it (adds .gz/.bz2/.xz)')
+    dashboard_parser.add_argument('--compress-level', type=int,
+                                  help='Compression level (codec default if omitted)')
+    dashboard_parser.add_argument('--keep-plain', action='store_true',
+                                  help='With --compress, also write the uncompressed dashboard')
+    dashboard_parser.add_argument('--cache-dir',
+                                  help='Cache rendered sections here and only re-render changed datasets')
+    
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Serve dashboards over HTTP, rendered on request')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    serve_parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    serve_parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                              help='Maximum size in MB of the rendered page cache')
+    serve_parser.add_argument('--warm', action='store_true',
+                              help='Render the dashboard and every table into the cache at startup')
     
     args = parser.parse_args()
     
+    if args.command == 'table':
+        if bool(args.sqlite) != bool(args.query):
+            table_parser.error("--sqlite and --query must be used together")
+        if not args.sqlite and not args.dataset:
+            table_parser.error("the dataset argument is required without --sqlite")
+    
     if not args.command:
         parser.print_help()
         return
@@ -509,15 +967,43 @@ Examples:
             cli.preview_dataset(args.dataset, args.limit)
             
         elif args.command == 'table':
-            cli.generate_single_table(
-                args.dataset,
-                args.output,
-                sortable=not args.no_sort,
-                striped=not args.no_stripe
-            )
+            if args.sqlite:
+                args.dataset = cli.add_query_dataset(args.dataset or 'query', args.sqlite, args.query)
+            elif args.dataset not in cli.available_datasets and os.path.isfile(args.dataset):
+                args.dataset = cli.add_dataset_file(args.dataset)
+            if args.dialect:
+                cli.csv_options['dialect'] = args.dialect
+            if args.delimiter:
+                cli.csv_options['delimiter'] = args.delimiter
+            if args.no_header:
+                cli.csv_options['header'] = False
+            cli.decompress_thread = args.decompress_thread
+            if args.page_size:
+                cli.generate_paginated_table(
+                    args.dataset,
+                    args.output,
+                    page_size=args.page_size,
+                    sortable=not args.no_sort,
+                    striped=not args.no_stripe
+                )
+            else:
+                cli.generate_single_table(
+                    args.dataset,
+                    args.output,
+                    sortable=not args.no_sort,
+                    striped=not args.no_stripe
+                )
             
         elif args.command == 'dashboard':
-            cli.generate_dashboard(args.datasets, args.output)
+            cli.generate_dashboard(args.datasets, args.output, jobs=args.jobs,
+                                   external_assets=args.external_assets,
+                                   compression=args.compress,
+                                   compresslevel=args.compress_level,
+                                   keep_plain=args.keep_plain,
+                                   cache_dir=args.cache_dir)
+            
+        elif args.command == 'serve':
+            cli.serve(args.host, args.port, cache_bytes=args.cache_size * 1024 * 1024, warm=args.warm)
             
     except Exception as e:
         print(f"❌ Error: {e}")
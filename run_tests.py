@@ -68,7 +68,12 @@ def main():
     test_suites = [
         ("tests.test_table_generator", "Core Functionality Tests"),
         ("tests.test_examples", "Usage Example Tests"),
-        ("tests.test_performance", "Performance Tests")
+        ("tests.test_performance", "Performance Tests"),
+        ("tests.test_dashboard_cli", "Dashboard CLI Tests"),
+        ("tests.test_caching", "Build Cache Tests"),
+        ("tests.test_catalog", "Dataset Catalog Tests"),
+        ("tests.test_sources", "Streaming Source Tests"),
+        ("tests.test_serving", "HTTP Serving Tests")
     ]
     
     total_tests = 0
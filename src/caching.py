@@ -0,0 +1,148 @@
+"""
+Build cache for incremental dashboard rebuilds.
+
+Each rendered section is stored together with a fingerprint of its input
+file and of the configuration it was rendered with, so a rebuild only has to
+re-render the sections whose data or configuration changed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Union
+
+from src.table_generator import _atomic_write
+
+# Bump when the layout of cache entries changes; older entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+# Size of the blocks read while hashing input files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Union[str, os.PathLike]) -> str:
+    """Get the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def config_digest(config: Any) -> str:
+    """Get a stable digest of a JSON-serializable configuration."""
+    text = json.dumps(config, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class SectionCache:
+    """
+    On-disk cache of rendered sections, one JSON file per section.
+
+    An entry is valid while the section configuration is unchanged and the
+    input file is unchanged. The input check first compares size and mtime,
+    which needs only a stat() call; if they differ (e.g. the file was touched
+    or copied) the content hash decides, so an unchanged file is never
+    re-rendered just because its timestamp moved.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike]):
+        """
+        Initialize the section cache.
+
+        Args:
+            directory: Directory holding the cache entries (created on first write)
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def stat(self, path: Union[str, os.PathLike]) -> Dict[str, int]:
+        """Get the quick fingerprint (size and mtime) of an input file."""
+        result = os.stat(path)
+        return {'size': result.st_size, 'mtime_ns': result.st_mtime_ns}
+
+    def get(self, key: str, path: Union[str, os.PathLike], config: Any) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached value of a section.
+
+        Args:
+            key: Section name
+            path: Input file the section is rendered from
+            config: Everything besides the input that affects the rendering
+
+        Returns:
+            The cached value, or None if there is no valid entry
+        """
+        entry = self._read_entry(key)
+        if (entry is None or entry.get('version') != CACHE_FORMAT_VERSION or
+                entry.get('config') != config_digest(config)):
+            self.misses += 1
+            return None
+
+        try:
+            stat = self.stat(path)
+            if stat != entry['stat']:
+                if file_digest(path) != entry['sha256']:
+                    self.misses += 1
+                    return None
+                # Same content under a new timestamp: refresh the quick check
+                entry['stat'] = stat
+                self._write_entry(key, entry)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry['value']
+
+    def put(self, key: str, path: Union[str, os.PathLike], config: Any,
+            value: Any, stat: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Store the rendered value of a section.
+
+        Args:
+            key: Section name
+            path: Input file the section was rendered from
+            config: Configuration the section was rendered with
+            value: JSON-serializable rendered section
+            stat: Fingerprint taken with stat() before the input was read; if
+                  the file changed since, nothing is stored
+
+        Returns:
+            Whether the entry was stored
+        """
+        try:
+            current = self.stat(path)
+            if stat is not None and stat != current:
+                return False
+            entry = {
+                'version': CACHE_FORMAT_VERSION,
+                'config': config_digest(config),
+                'stat': current,
+                'sha256': file_digest(path),
+                'value': value
+            }
+        except OSError:
+            return False
+        self._write_entry(key, entry)
+        return True
+
+    def _entry_path(self, key: str) -> str:
+        """Get the file holding a section's entry."""
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a section's entry; unreadable or corrupt entries count as missing."""
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and entry.get('key') == key else None
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        """Atomically write a section's entry."""
+        os.makedirs(self.directory, exist_ok=True)
+        _atomic_write(self._entry_path(key), json.dumps(dict(entry, key=key), ensure_ascii=False))
@@ -0,0 +1,175 @@
+"""
+Dataset catalog: cached metadata about the JSON datasets in a directory.
+
+The catalog is a sidecar index file next to the datasets. It records, per
+dataset, the row count, column names and inferred types, byte size, content
+fingerprint and a few sample records, so listing and previewing datasets
+only needs a stat() call per file instead of parsing every file.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from src.caching import file_digest
+from src.sources import load_file
+from src.table_generator import _atomic_write
+
+# File name of the sidecar index, stored in the dataset directory
+CATALOG_FILENAME = '.catalog.json'
+
+# Bump when the layout of catalog entries changes; older entries are rebuilt
+CATALOG_FORMAT_VERSION = 1
+
+# Number of sample records kept per dataset for previews
+CATALOG_SAMPLE_SIZE = 10
+
+_JSON_TYPE_NAMES = {bool: 'boolean', int: 'integer', float: 'number', str: 'string',
+                    type(None): 'null', dict: 'object', list: 'array'}
+
+
+def summarize_dataset(data: Any, sample_size: int = CATALOG_SAMPLE_SIZE) -> Dict[str, Any]:
+    """
+    Describe the structure of a loaded dataset.
+
+    Datasets are usually a dictionary with a single key holding the records
+    (or a dictionary of metrics), but bare lists and other dictionaries are
+    described too.
+
+    Returns:
+        Dictionary with 'key' (the single top-level key, or None), 'type' (the
+        top-level JSON type), 'structure' ('records', 'metrics', 'item' or
+        'top-level keys'), 'count', 'columns', 'types' (column name to JSON
+        type) and 'samples' (the first records, [key, value] pairs for
+        metrics, or key names for other dictionaries)
+    """
+    key = None
+    value = data
+    if isinstance(data, dict) and len(data) == 1:
+        key, value = next(iter(data.items()))
+
+    summary = {'key': key, 'type': type(data).__name__, 'columns': [], 'types': {}, 'samples': []}
+    if isinstance(value, list):
+        summary.update(structure='records', count=len(value), samples=value[:sample_size])
+        summary['columns'], summary['types'] = infer_columns(value)
+    elif isinstance(value, dict) and key is not None:
+        summary.update(structure='metrics', count=len(value),
+                       samples=[[name, item] for name, item in list(value.items())[:sample_size]])
+    elif isinstance(value, dict):
+        summary.update(structure='top-level keys', count=len(value), samples=list(value)[:sample_size])
+    else:
+        summary.update(structure='item', count=1)
+    return summary
+
+
+def infer_columns(records: List[Any]) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Get the column names (in first-seen order) and JSON types of dictionary records.
+
+    Null values do not affect a column's type, integers and floats combine
+    to 'number', and any other combination is 'mixed'.
+    """
+    types: Dict[str, str] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for column, value in record.items():
+            value_type = _JSON_TYPE_NAMES.get(type(value), 'string')
+            current = types.get(column)
+            if current is None or current == 'null':
+                types[column] = value_type
+            elif value_type != current and value_type != 'null':
+                numeric = {current, value_type} <= {'integer', 'number'}
+                types[column] = 'number' if numeric else 'mixed'
+    return list(types), types
+
+
+class DatasetCatalog:
+    """
+    Persistent metadata index of datasets, refreshed only when a file changes.
+
+    An entry is reused while the file's size and mtime are unchanged; if they
+    differ, the content hash decides whether the file really changed. Only
+    changed files are parsed again.
+    """
+
+    def __init__(self, index_path: Union[str, os.PathLike],
+                 loader: Callable[[Union[str, os.PathLike]], Any] = load_file):
+        """
+        Initialize the catalog.
+
+        Args:
+            index_path: Path of the sidecar index file
+            loader: Function that parses a dataset file
+        """
+        self.index_path = index_path
+        self.loader = loader
+        self._entries = self._read_index()
+        self._dirty = False
+
+    def describe(self, name: str, path: Union[str, os.PathLike]) -> Dict[str, Any]:
+        """
+        Get the metadata of a dataset, refreshing it if the file changed.
+
+        Returns:
+            The summarize_dataset() description plus 'bytes', 'mtime_ns' and 'sha256'
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not valid JSON
+        """
+        stat = os.stat(path)
+        entry = self._entries.get(name)
+        if entry is not None and entry.get('version') == CATALOG_FORMAT_VERSION:
+            if entry['bytes'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                return entry
+            if entry['bytes'] == stat.st_size and entry['sha256'] == file_digest(path):
+                entry['mtime_ns'] = stat.st_mtime_ns
+                self._dirty = True
+                return entry
+
+        entry = summarize_dataset(self.loader(path))
+        entry.update(version=CATALOG_FORMAT_VERSION, bytes=stat.st_size,
+                     mtime_ns=stat.st_mtime_ns, sha256=file_digest(path))
+        self._entries[name] = entry
+        self._dirty = True
+        return entry
+
+    def prune(self, names: List[str]) -> None:
+        """Drop the entries of datasets that no longer exist."""
+        for name in list(self._entries):
+            if name not in names:
+                del self._entries[name]
+                self._dirty = True
+
+    def save(self) -> bool:
+        """
+        Write the index if it changed.
+
+        The catalog is only an optimization, so a read-only dataset directory
+        is not an error.
+
+        Returns:
+            Whether the index file is up to date
+        """
+        if not self._dirty:
+            return True
+        index = {'version': CATALOG_FORMAT_VERSION, 'datasets': self._entries}
+        try:
+            _atomic_write(self.index_path, json.dumps(index, ensure_ascii=False))
+        except OSError:
+            return False
+        self._dirty = False
+        return True
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read the index file; a missing or corrupt index is empty."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get('version') != CATALOG_FORMAT_VERSION:
+            return {}
+        datasets = index.get('datasets')
+        return datasets if isinstance(datasets, dict) else {}
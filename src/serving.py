@@ -0,0 +1,277 @@
+"""
+HTTP serving of rendered documents with an in-memory response cache.
+
+The server does not know how documents are rendered: a resolver maps each
+request to a cache key (which must change whenever the input data or the
+rendering options change) and a function rendering the document. Rendered
+documents are kept in a size-bounded LRU cache together with their gzip
+encoding and strong ETags, so repeated requests for unchanged data are
+answered from memory or with 304 Not Modified.
+"""
+
+import gzip
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Default maximum number of bytes held by the response cache
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Compression level of the cached gzip encoding (compressed once per render)
+GZIP_LEVEL = 6
+
+# Resolver result: cache key and a function rendering the document as UTF-8 HTML
+Resolution = Tuple[Hashable, Callable[[], bytes]]
+
+
+class RenderedResponse:
+    """A rendered document with its gzip encoding and the ETag of each encoding."""
+
+    __slots__ = ('body', 'gzip_body', 'etag', 'gzip_etag')
+
+    def __init__(self, body: bytes):
+        """
+        Initialize the response, compressing the body once.
+
+        Args:
+            body: UTF-8 encoded document
+        """
+        self.body = body
+        self.gzip_body = gzip.compress(body, GZIP_LEVEL, mtime=0)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Strong ETags identify exact bytes, so each encoding gets its own
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    @property
+    def size(self) -> int:
+        """Number of bytes held by the response."""
+        return len(self.body) + len(self.gzip_body)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of rendered responses bounded by their total size.
+
+    Responses larger than the whole cache are not stored.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached responses
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, RenderedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[RenderedResponse]:
+        """Get a cached response, marking it as most recently used."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: Hashable, response: RenderedResponse) -> bool:
+        """
+        Store a response, evicting the least recently used ones to make room.
+
+        Returns:
+            Whether the response was stored
+        """
+        size = response.size
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.size
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.size
+            self._entries[key] = response
+            self.current_bytes += size
+        return True
+
+
+class RenderServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server rendering documents on demand through a resolver.
+
+    Example:
+        def resolve(path, params):
+            if path == '/':
+                return ('home', data_version()), lambda: render_home().encode('utf-8')
+            return None
+
+        RenderServer(('127.0.0.1', 8000), resolve).serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int],
+                 resolver: Callable[[str, Dict[str, List[str]]], Optional[Resolution]],
+                 cache_bytes: int = DEFAULT_CACHE_BYTES, quiet: bool = False):
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            resolver: Function mapping a request path and its query parameters
+                      to a (cache key, render function) pair, or None for 404
+            cache_bytes: Maximum total size of the response cache
+            quiet: Do not log every request to stderr
+        """
+        self.resolver = resolver
+        self.cache = ResponseCache(cache_bytes)
+        self.quiet = quiet
+        super().__init__(address, RenderRequestHandler)
+
+    def get_response(self, path: str, params: Dict[str, List[str]]) -> Optional[RenderedResponse]:
+        """
+        Get the response for a request from the cache, rendering it on a miss.
+
+        Returns:
+            The response, or None if the resolver does not know the path
+        """
+        resolution = self.resolver(path, params)
+        if resolution is None:
+            return None
+        key, render = resolution
+        response = self.cache.get(key)
+        if response is None:
+            response = RenderedResponse(render())
+            self.cache.put(key, response)
+        return response
+
+    def warm(self, urls: Iterable[str]) -> List[str]:
+        """
+        Render documents into the cache before serving requests.
+
+        Args:
+            urls: Request paths (with optional query strings) to render
+
+        Returns:
+            The URLs that could not be rendered
+        """
+        failed = []
+        for url in urls:
+            parts = urlsplit(url)
+            try:
+                if self.get_response(parts.path, parse_qs(parts.query)) is None:
+                    failed.append(url)
+            except Exception as e:
+                print(f"⚠️ Warning: Could not warm {url}: {e}", file=sys.stderr)
+                failed.append(url)
+        return failed
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Request handler answering GET/HEAD from a RenderServer's cache."""
+
+    server: RenderServer
+    # Every response has a Content-Length, so connections can be kept alive
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        self._respond(include_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(include_body=False)
+
+    def _respond(self, include_body: bool) -> None:
+        """Send the document for the request path, honouring If-None-Match and Accept-Encoding."""
+        parts = urlsplit(self.path)
+        try:
+            response = self.server.get_response(parts.path, parse_qs(parts.query))
+        except Exception as e:
+            self.log_error("Rendering %s failed: %s", self.path, e)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, include_body)
+            return
+        if response is None:
+            self._send_error(HTTPStatus.NOT_FOUND, include_body)
+            return
+
+        if self._accepts_gzip():
+            body, etag, encoding = response.gzip_body, response.gzip_etag, 'gzip'
+        else:
+            body, etag, encoding = response.body, response.etag, None
+
+        if self._etag_matches(etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, etag: str) -> None:
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        # Cached copies must be revalidated, which is cheap thanks to the ETag
+        self.send_header('Cache-Control', 'no-cache')
+
+    def _send_error(self, status: HTTPStatus, include_body: bool) -> None:
+        body = f"<h1>{status.value} {status.phrase}</h1>".encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def _accepts_gzip(self) -> bool:
+        """Tell whether the Accept-Encoding header allows gzip (with a non-zero q-value)."""
+        for coding in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = coding.strip().partition(';')
+            if name.strip().lower() not in ('gzip', '*'):
+                continue
+            quality = params.strip().lower()
+            if quality.startswith('q='):
+                try:
+                    return float(quality[2:]) > 0
+                except ValueError:
+                    return False
+            return True
+        return False
+
+    def _etag_matches(self, etag: str) -> bool:
+        """Tell whether If-None-Match lists the ETag (weak comparison, as for GET/HEAD)."""
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        if header.strip() == '*':
+            return True
+        candidates = (candidate.strip() for candidate in header.split(','))
+        return any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
@@ -0,0 +1,789 @@
+"""
+Streaming row sources for large input files.
+
+The readers here yield records one at a time so they can be passed straight
+to TableGenerator.iter_table / write_table. Only the current record and the
+read buffer are held in memory, never the whole file. Paths ending in .gz,
+.bz2 or .xz are decompressed on the fly.
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import queue
+import re
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+# Number of characters read from the file at a time
+READ_BUFFER_SIZE = 1024 * 1024
+
+# File suffixes of newline-delimited JSON (one record per line)
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+# File suffixes of delimited text and the csv dialect used for each by default
+CSV_DIALECTS = {'.csv': 'excel', '.tsv': 'excel-tab'}
+
+# Compressed input suffixes and the function opening each for binary reading
+DECOMPRESSORS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+# Number of decompressed chunks a decompression thread may read ahead
+THREAD_READ_AHEAD = 4
+
+# Default number of rows fetched per fetchmany() call from a database cursor
+CURSOR_FETCH_SIZE = 1000
+
+# Insignificant whitespace between JSON tokens
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+# Characters that may continue a number cut off at the end of the buffer (e.g. '1' + 'e5')
+_NUMBER_TAIL_RE = re.compile(r'[0-9eE.+-]*\Z')
+
+_decoder = json.JSONDecoder()
+
+
+def split_compression(path: Union[str, os.PathLike]) -> Tuple[str, Optional[str]]:
+    """
+    Split the compression suffix off a file path.
+
+    Returns:
+        Tuple of (path without the compression suffix, suffix or None),
+        e.g. ('logs.jsonl', '.xz') for 'logs.jsonl.xz'
+    """
+    root, suffix = os.path.splitext(os.fspath(path))
+    if suffix.lower() in DECOMPRESSORS:
+        return root, suffix.lower()
+    return os.fspath(path), None
+
+
+def open_input(path: Union[str, os.PathLike], threaded: bool = False,
+               buffer_size: int = READ_BUFFER_SIZE) -> BinaryIO:
+    """
+    Open a possibly compressed file for binary reading.
+
+    Args:
+        path: File path; .gz, .bz2 and .xz files are decompressed while reading
+        threaded: Decompress in a background thread that reads ahead of the
+                  consumer, so decompression overlaps with parsing and rendering
+                  (the codecs release the GIL while they work)
+        buffer_size: Size of the chunks read ahead by the background thread
+
+    Returns:
+        Binary stream of the (decompressed) content
+    """
+    suffix = split_compression(path)[1]
+    if suffix is None:
+        return open(path, 'rb', buffering=buffer_size)
+    stream = DECOMPRESSORS[suffix](path, 'rb')
+    if threaded:
+        return io.BufferedReader(_ThreadedReader(stream, buffer_size), buffer_size)
+    return stream
+
+
+class _ThreadedReader(io.RawIOBase):
+    """Raw stream reading another stream ahead in a background thread."""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        super().__init__()
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._chunks: 'queue.Queue' = queue.Queue(THREAD_READ_AHEAD)
+        self._stop = threading.Event()
+        self._pending = memoryview(b'')
+        self._done = False
+        self._thread = threading.Thread(target=self._read_ahead, daemon=True)
+        self._thread.start()
+
+    def _read_ahead(self) -> None:
+        """Read chunks into the queue until the end of the stream (an empty chunk)."""
+        try:
+            while not self._stop.is_set():
+                chunk = self._stream.read(self._chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except BaseException as e:
+            # Handed over to the consumer, which raises it from readinto()
+            self._put(e)
+
+    def _put(self, item: Union[bytes, BaseException]) -> None:
+        """Queue an item, giving up when the reader is closed."""
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending and not self._done:
+            item = self._chunks.get()
+            if isinstance(item, BaseException):
+                self._done = True
+                raise item
+            if not item:
+                self._done = True
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._stream.close()
+        super().close()
+
+
+def _open_text(source: Union[str, os.PathLike, TextIO, BinaryIO], buffer_size: int,
+               newline: Optional[str] = None, threaded: bool = False):
+    """
+    Get a text stream for a path or an open file.
+
+    Args:
+        source: File path (possibly compressed), or a text or binary stream open for reading
+        buffer_size: Read buffer size in bytes for files opened here
+        newline: Newline translation of streams opened here ('' for csv)
+        threaded: Decompress compressed paths in a background thread (see open_input)
+
+    Returns:
+        Tuple of (text stream, whether the caller opened it and must close it)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if split_compression(source)[1] is None:
+            return open(source, 'r', encoding='utf-8', buffering=buffer_size, newline=newline), True
+        stream = open_input(source, threaded, buffer_size)
+        return io.TextIOWrapper(stream, encoding='utf-8', newline=newline), True
+    if isinstance(source, io.TextIOBase):
+        return source, False
+    # Binary streams (e.g. from gzip.open) are decoded as UTF-8
+    return io.TextIOWrapper(source, encoding='utf-8', newline=newline), False
+
+
+class JSONArrayReader:
+    """
+    Incremental reader of the records of a JSON array.
+
+    Reads the array at the top level of a document, or the array held by a
+    top-level object member (datasets are usually shaped as
+    ``{"name": [...records...]}``), and yields its elements one by one. The
+    document is read in chunks and each element is parsed with
+    json.JSONDecoder.raw_decode as soon as it is complete.
+
+    Example:
+        with JSONArrayReader("data/employee_data.json") as reader:
+            generator.write_table(reader, "employees.html")
+            print(reader.key)  # 'employee_data'
+    """
+
+    def __init__(self, source: Union[str, os.PathLike, TextIO, BinaryIO],
+                 key: Optional[str] = None, buffer_size: int = READ_BUFFER_SIZE,
+                 threaded: bool = False):
+        """
+        Initialize the reader.
+
+        Args:
+            source: File path (possibly compressed), or a text or binary stream open for reading
+            key: Top-level member holding the array (other members are
+                 skipped); by default the array is the document itself or the
+                 value of its only member, and iterating raises ValueError
+                 when the document holds anything else
+            buffer_size: Number of characters read at a time
+            threaded: Decompress a compressed path in a background thread
+        """
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be a positive integer")
+        self.source = source
+        self.key = key
+        self.buffer_size = buffer_size
+        self.threaded = threaded
+        self.count = 0
+        self._stream = None
+        self._owns_stream = False
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._started = False
+        # An array picked implicitly must be the whole document (see _check_end);
+        # other_members tells callers that it was the first of several members
+        self._implicit = key is None
+        self.other_members = False
+        self._in_object = False
+
+    def open(self) -> 'JSONArrayReader':
+        """
+        Read up to the start of the array, setting key to the member holding it.
+
+        Raises:
+            ValueError: If the document is not valid JSON or holds no such array
+        """
+        if self._started:
+            return self
+        self._stream, self._owns_stream = _open_text(self.source, self.buffer_size,
+                                                     threaded=self.threaded)
+        self._started = True
+        try:
+            self._find_array()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def close(self) -> None:
+        """Close the underlying file if the reader opened it."""
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+        self._buffer = ''
+
+    def __enter__(self) -> 'JSONArrayReader':
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yield the elements of the array.
+
+        Raises:
+            ValueError: If the document is not valid JSON
+        """
+        self.open()
+        try:
+            yield from self._iter_elements()
+        finally:
+            self.close()
+
+    def _iter_elements(self) -> Iterator[Any]:
+        """Yield the array elements; the position is just after the opening bracket."""
+        if self._peek() == ']':
+            self._pos += 1
+            self._check_end()
+            return
+        while True:
+            yield self._decode_value()
+            self.count += 1
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                self._check_end()
+                return
+            if separator != ',':
+                self._error("Expected ',' or ']' in array")
+
+    def _check_end(self) -> None:
+        """
+        Check that an implicitly picked array is followed by the end of the document.
+
+        Otherwise the records would not be the whole dataset (another member
+        follows) or the document would not be valid JSON.
+
+        Raises:
+            ValueError: If anything but the closing brace of a single-member
+                        object follows the array
+        """
+        if not self._implicit:
+            return
+        if self._in_object:
+            following = self._peek()
+            if following == ',':
+                self.other_members = True
+                raise ValueError(f"The JSON object has other members besides '{self.key}'")
+            if following != '}':
+                self._error("Expected ',' or '}' in object")
+            self._pos += 1
+        if self._peek():
+            self._error("Extra data after the JSON document")
+
+    def _find_array(self) -> None:
+        """Advance to just after the opening bracket of the array to read."""
+        start = self._peek()
+        if start == '[' and self.key is None:
+            self._pos += 1
+            return
+        if start != '{':
+            self._error("Expected a JSON array or object")
+        self._pos += 1
+        self._in_object = True
+
+        if self._peek() == '}':
+            self._error("No array found in the JSON object")
+        while True:
+            name = self._decode_value()
+            if not isinstance(name, str):
+                self._error("Expected a member name")
+            if self._peek() != ':':
+                self._error("Expected ':' after member name")
+            self._pos += 1
+
+            if self.key is None or name == self.key:
+                if self._peek() != '[':
+                    self._error(f"Member '{name}' does not hold an array")
+                self._pos += 1
+                self.key = name
+                return
+
+            # Skip the value of another member
+            self._decode_value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == '}':
+                raise ValueError(f"Member '{self.key}' not found in the JSON object")
+            if separator != ',':
+                self._error("Expected ',' or '}' in object")
+
+    def _peek(self) -> str:
+        """Skip whitespace and get the next character ('' at the end of the input)."""
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or self._eof:
+                return self._buffer[self._pos:self._pos + 1]
+            self._fill()
+
+    def _decode_value(self) -> Any:
+        """Decode the next value, reading more input until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A number near the end of the buffer may continue in the next read
+            if not self._eof and _NUMBER_TAIL_RE.match(self._buffer, end):
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _fill(self) -> None:
+        """Drop the consumed input and append the next chunk."""
+        # Read at least as much as is buffered, so a huge element is re-scanned only O(log n) times
+        size = max(self.buffer_size, len(self._buffer) - self._pos)
+        chunk = self._stream.read(size)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        if not chunk:
+            self._eof = True
+
+    def _error(self, message: str):
+        """Raise a ValueError for malformed input at the current position."""
+        found = self._buffer[self._pos:self._pos + 20] or 'end of input'
+        raise ValueError(f"{message} (found {found!r})")
+
+
+def iter_json_records(source: Union[str, os.PathLike, TextIO, BinaryIO],
+                      key: Optional[str] = None,
+                      buffer_size: int = READ_BUFFER_SIZE) -> Iterator[Any]:
+    """
+    Stream the records of a JSON array without loading the whole document.
+
+    Args:
+        source: File path, or a text or binary stream open for reading
+        key: Top-level member holding the array (see JSONArrayReader)
+        buffer_size: Number of characters read at a time
+
+    Yields:
+        The elements of the array
+
+    Raises:
+        ValueError: If the document is not valid JSON or holds no such array
+    """
+    return iter(JSONArrayReader(source, key, buffer_size))
+
+
+class JSONLinesReader:
+    """
+    Incremental reader of newline-delimited JSON (JSON Lines / NDJSON).
+
+    Every non-blank line holds one record. Lines are read in batches of about
+    buffer_size characters and each batch is decoded with a single json.loads
+    call (line by line only to locate an invalid line), so memory holds one
+    batch of lines at a time. Offers the same interface as JSONArrayReader (key is
+    always None).
+    """
+
+    def __init__(self, source: Union[str, os.PathLike, TextIO, BinaryIO],
+                 buffer_size: int = READ_BUFFER_SIZE, threaded: bool = False):
+        """
+        Initialize the reader.
+
+        Args:
+            source: File path (possibly compressed), or a text or binary stream open for reading
+            buffer_size: Approximate number of characters read at a time
+            threaded: Decompress a compressed path in a background thread
+        """
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be a positive integer")
+        self.source = source
+        self.key = None
+        self.buffer_size = buffer_size
+        self.threaded = threaded
+        self.count = 0
+        self._stream = None
+        self._owns_stream = False
+
+    def open(self) -> 'JSONLinesReader':
+        """Open the source for reading."""
+        if self._stream is None:
+            self._stream, self._owns_stream = _open_text(self.source, self.buffer_size,
+                                                         threaded=self.threaded)
+        return self
+
+    def close(self) -> None:
+        """Close the underlying file if the reader opened it."""
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self) -> 'JSONLinesReader':
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yield the record of every non-blank line.
+
+        Raises:
+            ValueError: If a line is not valid JSON
+        """
+        self.open()
+        line_number = 0
+        try:
+            while True:
+                lines = self._stream.readlines(self.buffer_size)
+                if not lines:
+                    return
+                records = self._decode_lines(lines, line_number)
+                line_number += len(lines)
+                self.count += len(records)
+                yield from records
+        finally:
+            self.close()
+
+    def _decode_lines(self, lines: List[str], line_number: int) -> List[Any]:
+        """Decode a batch of lines, the first being line line_number + 1."""
+        values = [line for line in lines if not line.isspace()]
+        # One decoder call per batch is several times faster than one per line
+        try:
+            records = json.loads(f"[{','.join(values)}]")
+            if len(records) == len(values):
+                return records
+        except ValueError:
+            pass
+        # Invalid batch (or a line holding several values): find the offending line
+        records = []
+        for line_number, line in enumerate(lines, line_number + 1):
+            if line.isspace():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}") from None
+        return records
+
+
+def iter_json_lines(source: Union[str, os.PathLike, TextIO, BinaryIO],
+                    buffer_size: int = READ_BUFFER_SIZE) -> Iterator[Any]:
+    """
+    Stream the records of a JSON Lines / NDJSON file.
+
+    Args:
+        source: File path, or a text or binary stream open for reading
+        buffer_size: Approximate number of characters read at a time
+
+    Yields:
+        The record of every non-blank line
+
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    return iter(JSONLinesReader(source, buffer_size))
+
+
+class CSVReader:
+    """
+    Incremental reader of CSV / TSV files as CSV-like rows.
+
+    Yields the header row first and then every data row as a list of
+    strings, which iter_table renders positionally without building a
+    dictionary per row. Offers the same interface as JSONArrayReader (key is
+    always None, count excludes the header row).
+    """
+
+    def __init__(self, source: Union[str, os.PathLike, TextIO, BinaryIO],
+                 dialect: Union[str, csv.Dialect, None] = None,
+                 header: bool = True,
+                 fieldnames: Optional[Sequence[str]] = None,
+                 buffer_size: int = READ_BUFFER_SIZE,
+                 threaded: bool = False,
+                 **fmtparams):
+        """
+        Initialize the reader.
+
+        Args:
+            source: File path (possibly compressed), or a text or binary stream open for reading
+            dialect: csv dialect name or class; by default 'excel-tab' for
+                     .tsv paths and 'excel' (comma separated) otherwise
+            header: Whether the first row holds the column names
+            fieldnames: Column names to use instead; with header=True the
+                        file's own header row is skipped
+            buffer_size: Read buffer size in bytes for files opened here
+            threaded: Decompress a compressed path in a background thread
+            **fmtparams: Formatting parameters overriding the dialect
+                         (delimiter, quotechar, ...), as for csv.reader
+        """
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be a positive integer")
+        if dialect is None:
+            suffix = _data_suffix(source) if isinstance(source, (str, os.PathLike)) else ''
+            dialect = CSV_DIALECTS.get(suffix, 'excel')
+        self.source = source
+        self.dialect = dialect
+        self.header = header
+        self.fieldnames = list(fieldnames) if fieldnames is not None else None
+        self.fmtparams = fmtparams
+        self.key = None
+        self.buffer_size = buffer_size
+        self.threaded = threaded
+        self.count = 0
+        self._stream = None
+        self._owns_stream = False
+
+    def open(self) -> 'CSVReader':
+        """Open the source for reading."""
+        if self._stream is None:
+            self._stream, self._owns_stream = _open_text(self.source, self.buffer_size, newline='',
+                                                         threaded=self.threaded)
+        return self
+
+    def close(self) -> None:
+        """Close the underlying file if the reader opened it."""
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self) -> 'CSVReader':
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """
+        Yield the header row, then the data rows.
+
+        Without a header row or fieldnames the columns are named
+        'Column 1', 'Column 2', ... after the width of the first row.
+
+        Raises:
+            ValueError: If the file is not valid for the dialect (csv.Error)
+        """
+        self.open()
+        rows = None
+        try:
+            rows = csv.reader(self._stream, self.dialect, **self.fmtparams)
+            first = next(rows, None)
+            if first is None:
+                if self.fieldnames is not None:
+                    yield self.fieldnames
+                return
+            if self.fieldnames is not None:
+                yield self.fieldnames
+            elif self.header:
+                yield first
+            else:
+                yield [f"Column {index}" for index in range(1, len(first) + 1)]
+            if not self.header:
+                self.count += 1
+                yield first
+            for row in rows:
+                self.count += 1
+                yield row
+        except csv.Error as e:
+            line = f" on line {rows.line_num}" if rows is not None else ""
+            raise ValueError(f"Invalid CSV{line}: {e}") from None
+        finally:
+            self.close()
+
+    def iter_records(self) -> Iterator[Dict[str, str]]:
+        """Yield the data rows as dictionaries keyed by column name."""
+        rows = iter(self)
+        columns = next(rows, None)
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def iter_csv_rows(source: Union[str, os.PathLike, TextIO, BinaryIO],
+                  dialect: Union[str, csv.Dialect, None] = None,
+                  header: bool = True,
+                  fieldnames: Optional[Sequence[str]] = None,
+                  buffer_size: int = READ_BUFFER_SIZE,
+                  **fmtparams) -> Iterator[List[str]]:
+    """
+    Stream a CSV / TSV file as CSV-like rows (header row first).
+
+    Args:
+        source: File path, or a text or binary stream open for reading
+        dialect: csv dialect (see CSVReader)
+        header: Whether the first row holds the column names
+        fieldnames: Column names to use instead of the header row
+        buffer_size: Read buffer size in bytes for files opened here
+        **fmtparams: Formatting parameters overriding the dialect
+
+    Yields:
+        The header row, then every data row, as lists of strings
+
+    Raises:
+        ValueError: If the file is not valid for the dialect
+    """
+    return iter(CSVReader(source, dialect, header, fieldnames, buffer_size, **fmtparams))
+
+
+class CursorReader:
+    """
+    Reader of a DB-API 2.0 cursor's result set as CSV-like rows.
+
+    Yields the column names from cursor.description first and then the
+    result rows as the cursor returns them (tuples), fetched in batches with
+    fetchmany(), so iter_table renders them positionally and memory holds
+    one batch no matter how large the result set is. Offers the same
+    interface as the file readers (key is always None, count excludes the
+    header row).
+
+    Example:
+        cursor = connection.execute("SELECT name, total FROM orders")
+        generator.write_table(CursorReader(cursor), "orders.html")
+    """
+
+    def __init__(self, cursor: Any, arraysize: int = CURSOR_FETCH_SIZE, connection: Any = None):
+        """
+        Initialize the reader.
+
+        Args:
+            cursor: Cursor on which a query returning rows was executed
+            arraysize: Number of rows fetched per fetchmany() call
+            connection: Connection to close together with the reader (e.g.
+                        one opened just for this query)
+        """
+        if arraysize < 1:
+            raise ValueError("arraysize must be a positive integer")
+        self.cursor = cursor
+        self.arraysize = arraysize
+        self.connection = connection
+        self.key = None
+        self.count = 0
+
+    def open(self) -> 'CursorReader':
+        """
+        Check that the cursor holds a result set.
+
+        Raises:
+            ValueError: If the executed statement returns no rows (no description)
+        """
+        if self.cursor.description is None:
+            raise ValueError("The query did not return a result set")
+        return self
+
+    def close(self) -> None:
+        """Close the cursor (and the connection given to the reader)."""
+        self.cursor.close()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self) -> 'CursorReader':
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Sequence[Any]]:
+        """Yield the column names, then the result rows."""
+        self.open()
+        yield [column[0] for column in self.cursor.description]
+        fetchmany = self.cursor.fetchmany
+        arraysize = self.arraysize
+        while True:
+            rows = fetchmany(arraysize)
+            if not rows:
+                return
+            self.count += len(rows)
+            yield from rows
+
+
+def iter_cursor_rows(cursor: Any, arraysize: int = CURSOR_FETCH_SIZE) -> Iterator[Sequence[Any]]:
+    """
+    Stream a DB-API cursor's result set as CSV-like rows (column names first).
+
+    Args:
+        cursor: Cursor on which a query returning rows was executed
+        arraysize: Number of rows fetched per fetchmany() call
+
+    Yields:
+        The column names, then every result row
+
+    Raises:
+        ValueError: If the executed statement returns no rows
+    """
+    return iter(CursorReader(cursor, arraysize))
+
+
+def _data_suffix(path: Union[str, os.PathLike]) -> str:
+    """Get the lower-case format suffix of a file name, ignoring a compression suffix."""
+    return os.path.splitext(split_compression(path)[0])[1].lower()
+
+
+def file_dataset_name(path: Union[str, os.PathLike]) -> str:
+    """Get the dataset name of a file: its name without format and compression suffixes."""
+    return os.path.splitext(os.path.basename(split_compression(path)[0]))[0]
+
+
+def is_csv(path: Union[str, os.PathLike]) -> bool:
+    """Tell whether a file name has a delimited text suffix (.csv or .tsv, possibly compressed)."""
+    return _data_suffix(path) in CSV_DIALECTS
+
+
+def is_json_lines(path: Union[str, os.PathLike]) -> bool:
+    """Tell whether a file name has a JSON Lines suffix (.jsonl or .ndjson, possibly compressed)."""
+    return _data_suffix(path) in JSON_LINES_SUFFIXES
+
+
+def load_file(path: Union[str, os.PathLike], **csv_options) -> Any:
+    """
+    Load a whole dataset file.
+
+    JSON Lines and CSV / TSV files are returned in the usual dataset shape, a
+    dictionary holding the records under the file's name (without suffix).
+    Compressed files are decompressed while they are parsed.
+
+    Args:
+        path: Dataset file
+        **csv_options: CSVReader options for CSV / TSV files
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON / JSON Lines / CSV
+    """
+    name = file_dataset_name(path)
+    if is_json_lines(path):
+        return {name: list(iter_json_lines(path))}
+    if is_csv(path):
+        return {name: list(CSVReader(path, **csv_options).iter_records())}
+    stream, _ = _open_text(path, READ_BUFFER_SIZE)
+    with stream:
+        return json.load(stream)
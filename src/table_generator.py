@@ -1,5 +1,432 @@
+import asyncio
+import bz2
+import functools
+import gzip
+import hashlib
+import heapq
 import html
-from typing import Dict, List, Union, Any, Optional, Tuple
+import io
+import json
+import locale
+import lzma
+import multiprocessing
+import os
+import re
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timezone
+from itertools import chain, islice
+from typing import (Dict, List, Union, Any, Optional, Tuple, Iterable, Iterator, Mapping, Sequence,
+                    AsyncIterable, AsyncIterator)
+
+# Default size (in characters) of the chunks yielded by iter_table
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Maximum number of compiled render plans kept per generator
+RENDER_PLAN_CACHE_SIZE = 32
+
+# Number of rows formatted per column batch by the columnar input path
+COLUMN_BLOCK_SIZE = 4096
+
+# Default number of distinct escaped strings memoized per generator
+ESCAPE_CACHE_SIZE = 4096
+
+# Below this many rows, workers=N renders in-process to avoid pool startup cost
+PARALLEL_MIN_ROWS = 50_000
+
+# Number of rows sent to a worker process per task
+PARALLEL_BATCH_ROWS = 10_000
+
+# Default row height in pixels assumed by virtual tables before measuring
+VIRTUAL_ROW_HEIGHT = 32
+
+# Largest integer that survives a round trip through a JavaScript number
+_MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+# Policies for keys that appear after the header sample (see TableGenerator.late_keys)
+LATE_KEY_POLICIES = ('ignore', 'append', 'error')
+
+# String collations available for sort_by (see TableGenerator.collation)
+SORT_COLLATIONS = ('natural', 'locale')
+
+# Number of distinct strings whose sort keys are memoized during one sort
+SORT_KEY_CACHE_SIZE = 65536
+
+# Strings that look like ISO 8601 dates or date-times
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?'
+                          r'(?:Z|[+-]\d{2}:?\d{2})?$')
+
+# Splits strings into alternating text and digit runs for natural ordering
+_DIGIT_RUN_RE = re.compile(r'([0-9]+)')
+
+# Stream compression codecs for write_table/write_document and their file suffixes
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'bz2': '.bz2', 'lzma': '.xz'}
+
+# Markup profiles: indented 'pretty' markup, or compact 'lean' markup without
+# indentation, optional end tags, per-row classes or per-cell style attributes
+MARKUP_PROFILES = ('pretty', 'lean')
+
+# Row background applied by the lean profile's generated stylesheet to striped tables
+DEFAULT_STRIPE_STYLE = 'background-color: #f2f2f2;'
+
+# Class shared by every collapsible container when styles come from an AssetRegistry
+COLLAPSIBLE_BASE_CLASS = 'collapsible-table'
+
+# Scalar types whose str() can never contain HTML special characters
+_NUMERIC_TYPES = (int, float, bool)
+
+# array.array typecodes holding numbers (the others, 'u' and 'w', hold characters)
+_NUMERIC_TYPECODES = frozenset('bBhHiIlLqQfd')
+
+# Number of rows fetched from an async row source per round trip to the event loop
+ASYNC_BATCH_ROWS = 1000
+
+
+def _make_cell_escaper(cache_size: int = ESCAPE_CACHE_SIZE):
+    """
+    Build a type-specialized cell escaping function.
+    
+    ints, floats and bools are converted with str() and never escaped, ASCII
+    strings without special characters are returned unchanged, and the
+    remaining strings are escaped through a bounded LRU cache so repeated
+    values (e.g. categorical columns) are escaped once. The returned function
+    exposes the cache statistics as ``escape.cache_info()``.
+    
+    A closure is used rather than a class because a __call__ method adds a
+    measurable per-cell overhead.
+    """
+    cached_escape = functools.lru_cache(maxsize=cache_size)(html.escape)
+    numeric_types = _NUMERIC_TYPES
+    
+    def escape(value: Any) -> str:
+        value_type = type(value)
+        if value_type is str:
+            if value.isascii() and not ('&' in value or '<' in value or '>' in value or
+                                        '"' in value or "'" in value):
+                return value
+            return cached_escape(value)
+        if value is None:
+            return ""
+        # Exact type match: subclasses (e.g. enums) may override __str__
+        if value_type in numeric_types:
+            return str(value)
+        return html.escape(str(value))
+    
+    escape.cache_info = cached_escape.cache_info
+    return escape
+
+
+@contextmanager
+def _atomic_output(path: Union[str, os.PathLike], buffering: int = -1) -> Iterator[io.BufferedWriter]:
+    """
+    Open a binary file that replaces path only once it is completely written.
+    
+    The content goes to a temporary file next to path, which is moved into
+    place when the block exits normally and removed when it raises, so a
+    failed write leaves the previous file untouched.
+    """
+    temporary_path = f"{os.fspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary_path, 'wb', buffering=buffering) as f:
+            yield f
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+
+def _atomic_write(path: Union[str, os.PathLike], data: Union[str, bytes]) -> None:
+    """
+    Replace a file with new content in one step (see _atomic_output).
+    
+    Also used for the dashboard's cache entries and dataset catalog.
+    
+    Raises:
+        OSError: If the file cannot be written
+    """
+    with _atomic_output(path) as f:
+        f.write(data.encode('utf-8') if isinstance(data, str) else data)
+
+
+def _timestamp(value: datetime) -> float:
+    """POSIX timestamp of a datetime; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _make_sort_key(collation: str = 'natural'):
+    """
+    Build a function mapping a cell value to a typed sort key.
+    
+    Keys are (rank, value) tuples so any mix of values is totally ordered:
+    numbers come first, then dates (datetime objects and ISO 8601 strings,
+    compared as instants), then other strings in natural order, so that
+    'EMP2' sorts before 'EMP10'. The text runs of strings are compared
+    case-insensitively, or with locale.strxfrm for the 'locale' collation.
+    String keys are memoized for the lifetime of the returned function.
+    """
+    transform = locale.strxfrm if collation == 'locale' else str.casefold
+    
+    @functools.lru_cache(maxsize=SORT_KEY_CACHE_SIZE)
+    def string_key(text: str) -> Tuple:
+        if _ISO_DATE_RE.match(text):
+            try:
+                # Older fromisoformat versions do not accept a 'Z' suffix
+                parsed = datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+                return (1, _timestamp(parsed))
+            except ValueError:
+                pass
+        parts = _DIGIT_RUN_RE.split(text)
+        parts[0::2] = map(transform, parts[0::2])
+        parts[1::2] = map(int, parts[1::2])
+        return (2, tuple(parts))
+    
+    def sort_key(value: Any) -> Tuple:
+        value_type = type(value)
+        if value_type is str:
+            return string_key(value)
+        if value_type is int or value_type is float or value_type is bool:
+            # NaN compares false with everything, so it sorts after the numbers
+            return (0, value) if value == value else (0.5, 0)
+        if isinstance(value, datetime):
+            return (1, _timestamp(value))
+        if isinstance(value, date):
+            return (1, _timestamp(datetime(value.year, value.month, value.day)))
+        return string_key(str(value))
+    
+    return sort_key
+
+
+class _Descending:
+    """Wrapper that inverts the ordering of a sort key (for mixed-direction heaps)."""
+    
+    __slots__ = ('key',)
+    
+    def __init__(self, key: Tuple):
+        self.key = key
+    
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.key < self.key
+    
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.key == other.key
+
+
+# Per-process state of parallel render workers, set by _init_render_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _process_pool(max_workers: int, **kwargs: Any) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers are not forked from the calling process.
+    
+    Pools are started from threads (executor threads running aiter_table,
+    server request threads, dashboard loaders) and forking a multi-threaded
+    process can deadlock the children, so the workers are started by the
+    forkserver where available and spawned elsewhere.
+    """
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context(start_method), **kwargs)
+
+
+def _init_render_worker(generator: 'TableGenerator', headers: List[str],
+                        positions: Optional[List[Optional[int]]]) -> None:
+    """Process pool initializer: receive the generator and headers once per worker."""
+    _worker_state['generator'] = generator
+    _worker_state['plan'] = generator._get_render_plan(headers)
+    _worker_state['positions'] = positions
+
+
+def _render_row_batch(rows: List, start_index: int) -> str:
+    """Process pool task: render a batch of rows starting at row start_index."""
+    generator = _worker_state['generator']
+    return generator._render_row_batch(_worker_state['plan'], rows,
+                                       _worker_state['positions'], start_index)
+
+
+class _AsyncRowBridge:
+    """
+    Synchronous iterator over an async iterable of rows.
+    
+    Used by aiter_table to feed async sources to the synchronous rendering
+    pipeline while it runs in an executor thread: rows are fetched on the
+    event loop in batches of ASYNC_BATCH_ROWS. Must not be iterated on the
+    event loop's own thread, which would deadlock.
+    """
+    
+    def __init__(self, rows: AsyncIterable, loop: asyncio.AbstractEventLoop):
+        self._rows = rows.__aiter__()
+        self._loop = loop
+        self._batch = deque()
+        self._exhausted = False
+    
+    def __iter__(self) -> '_AsyncRowBridge':
+        return self
+    
+    def __next__(self) -> Any:
+        if not self._batch:
+            if self._exhausted:
+                raise StopIteration
+            batch = asyncio.run_coroutine_threadsafe(self._fetch_batch(), self._loop).result()
+            if len(batch) < ASYNC_BATCH_ROWS:
+                self._exhausted = True
+            if not batch:
+                raise StopIteration
+            self._batch.extend(batch)
+        return self._batch.popleft()
+    
+    async def _fetch_batch(self) -> List:
+        """Fetch the next rows on the event loop."""
+        batch = []
+        async for row in _islice_async(self._rows, ASYNC_BATCH_ROWS):
+            batch.append(row)
+        return batch
+
+
+def _close_after_render(chunks: Iterator[str], future: 'asyncio.Future') -> None:
+    """Close the chunk generator of a cancelled aiter_table once its executor call is done."""
+    if not future.cancelled():
+        # Retrieve the outcome so an exception raised by the render is not reported as unhandled
+        future.exception()
+    chunks.close()
+
+
+async def _islice_async(rows: AsyncIterator, count: int) -> AsyncIterator:
+    """Yield at most count items from an async iterator without closing it."""
+    for _ in range(count):
+        try:
+            yield await rows.__anext__()
+        except StopAsyncIteration:
+            return
+
+
+class _RenderPlan:
+    """
+    Precompiled static markup for one generator configuration and header set.
+    
+    Everything that does not depend on cell values is rendered once: the table
+    header block, the closing tags, and one str.format template per stripe
+    parity that holds the row tags and every ``<td ...>`` prefix/suffix.
+    """
+    __slots__ = ('headers', 'header_row', 'head', 'row_templates', 'tail')
+
+    def __init__(self, headers: List[str], header_row: str, head: str,
+                 row_templates: Tuple[str, str], tail: str):
+        self.headers = headers
+        self.header_row = header_row
+        self.head = head
+        self.row_templates = row_templates
+        self.tail = tail
+
+
+class AssetRegistry:
+    """
+    Collects the CSS and JavaScript fragments needed by one HTML document.
+    
+    Share a registry between all generators whose tables go into the same
+    document: every fragment is registered under a name, so the sort script
+    or the collapsible styles are emitted once however many tables use them.
+    With a directory, the fragments are written to content-hashed files that
+    browsers can cache across documents and referenced with <link> and
+    <script src> tags instead of being inlined.
+    """
+
+    def __init__(self, directory: Optional[Union[str, os.PathLike]] = None,
+                 url_prefix: str = '', basename: str = 'assets'):
+        """
+        Initialize the asset registry.
+        
+        Args:
+            directory: Write the assets to files in this directory instead of
+                       inlining them (None inlines them)
+            url_prefix: Prefix of the asset file URLs, relative to the document
+            basename: File name prefix of the asset files
+        """
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.basename = basename
+        self._css: Dict[str, str] = {}
+        self._javascript: Dict[str, str] = {}
+        self._emitted: set = set()
+
+    def add_css(self, name: str, css: str) -> None:
+        """Register a CSS fragment; later registrations of the same name are ignored."""
+        self._css.setdefault(name, css)
+
+    def add_javascript(self, name: str, javascript: str) -> None:
+        """Register a JavaScript fragment; later registrations of the same name are ignored."""
+        self._javascript.setdefault(name, javascript)
+
+    def update(self, other: 'AssetRegistry') -> None:
+        """Register every fragment of another registry (e.g. one filled in a worker process)."""
+        for name, css in other._css.items():
+            self.add_css(name, css)
+        for name, javascript in other._javascript.items():
+            self.add_javascript(name, javascript)
+
+    def to_dict(self) -> Dict[str, Dict[str, str]]:
+        """Get the registered fragments as a JSON-serializable dictionary."""
+        return {'css': dict(self._css), 'javascript': dict(self._javascript)}
+
+    @classmethod
+    def from_dict(cls, fragments: Mapping[str, Mapping[str, str]], **kwargs) -> 'AssetRegistry':
+        """Create a registry holding the fragments returned by to_dict()."""
+        registry = cls(**kwargs)
+        for name, css in fragments.get('css', {}).items():
+            registry.add_css(name, css)
+        for name, javascript in fragments.get('javascript', {}).items():
+            registry.add_javascript(name, javascript)
+        return registry
+
+    def names(self) -> List[str]:
+        """Get the names of the registered CSS and JavaScript fragments."""
+        return list(self._css) + [name for name in self._javascript if name not in self._css]
+
+    def start_document(self) -> None:
+        """Begin a new document: every fragment will be emitted again."""
+        self._emitted.clear()
+
+    def render_css(self) -> str:
+        """Render the CSS fragments not yet emitted in the current document."""
+        return self._render(self._css, 'css')
+
+    def render_javascript(self) -> str:
+        """Render the JavaScript fragments not yet emitted in the current document."""
+        return self._render(self._javascript, 'js')
+
+    def _render(self, fragments: Dict[str, str], kind: str) -> str:
+        """Render and mark as emitted the pending fragments of one kind."""
+        pending = [name for name in fragments if (kind, name) not in self._emitted]
+        if not pending:
+            return ""
+        self._emitted.update((kind, name) for name in pending)
+        content = ''.join(fragments[name] for name in pending)
+        
+        if self.directory is None:
+            return f"<style>{content}</style>" if kind == 'css' else f"<script>{content}</script>"
+        
+        url = html.escape(self.url_prefix + self._write_asset(content, kind))
+        if kind == 'css':
+            return f'<link rel="stylesheet" href="{url}">'
+        return f'<script src="{url}"></script>'
+
+    def _write_asset(self, content: str, extension: str) -> str:
+        """Write content to a content-hashed file (once) and return its file name."""
+        data = content.encode('utf-8')
+        filename = f"{self.basename}-{hashlib.sha256(data).hexdigest()[:16]}.{extension}"
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            _atomic_write(path, data)
+        return filename
 
 
 class TableGenerator:
@@ -12,7 +439,15 @@ class TableGenerator:
                  sortable: bool = False,
                  striped: bool = False,
                  responsive: bool = False,
-                 styles: Optional[Dict[str, str]] = None):
+                 styles: Optional[Dict[str, str]] = None,
+                 escape_cache_size: int = ESCAPE_CACHE_SIZE,
+                 header_sample: Optional[int] = None,
+                 late_keys: Optional[str] = None,
+                 virtual: bool = False,
+                 virtual_height: int = 600,
+                 collation: str = 'natural',
+                 assets: Optional[AssetRegistry] = None,
+                 markup: str = 'pretty'):
         """
         Initialize the HTML Table Generator.
         
@@ -26,7 +461,37 @@ class TableGenerator:
             striped: Whether to add striped row styling
             responsive: Whether to make table responsive
             styles: Custom CSS styles for table elements
+            escape_cache_size: Number of distinct escaped strings to memoize
+            header_sample: Infer headers from the first N rows only instead of
+                           scanning every row (iterators always use a sample,
+                           of one row by default)
+            late_keys: What to do with keys that first appear after the header
+                       sample: 'ignore' them, 'append' them as new columns
+                       (labelled in a trailing <tfoot>), or raise an 'error'.
+                       By default they are appended for iterators and ignored
+                       for lists with a header_sample
+            virtual: Emit the rows as a compact JSON payload rendered by a
+                     virtual-scrolling script instead of as <tr> elements
+            virtual_height: Height in pixels of the virtual table viewport
+            collation: How sort_by compares text: 'natural' (case-insensitive,
+                       digit runs compared as numbers) or 'locale' (natural
+                       order with text compared using the current LC_COLLATE)
+            assets: Registry shared by the tables of one document; the CSS and
+                    JavaScript they need are registered there and emitted once
+            markup: 'pretty' (indented, default) or 'lean': no indentation,
+                    optional end tags omitted, striping through nth-child and
+                    the th/td styles in a generated stylesheet class (include
+                    it with render_html, write_document or an AssetRegistry)
         """
+        if header_sample is not None and header_sample < 1:
+            raise ValueError("header_sample must be a positive integer")
+        if late_keys is not None and late_keys not in LATE_KEY_POLICIES:
+            raise ValueError(f"late_keys must be one of {', '.join(LATE_KEY_POLICIES)}")
+        if markup not in MARKUP_PROFILES:
+            raise ValueError(f"markup must be one of {', '.join(MARKUP_PROFILES)}")
+        if collation not in SORT_COLLATIONS:
+            raise ValueError(f"collation must be one of {', '.join(SORT_COLLATIONS)}")
+        
         self.table_class = table_class
         self.table_id = table_id
         self.custom_attributes = custom_attributes or {}
@@ -36,16 +501,46 @@ class TableGenerator:
         self.striped = striped
         self.responsive = responsive
         self.styles = styles or {}
+        self.header_sample = header_sample
+        self.late_keys = late_keys
+        self.virtual = virtual
+        self.virtual_height = virtual_height
+        self.collation = collation
+        self.assets = assets
+        self.markup = markup
+        self._plan_cache: Dict[Tuple, _RenderPlan] = {}
+        self.escape_cache_size = escape_cache_size
+        self._escaper = _make_cell_escaper(escape_cache_size)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Caches are rebuilt on unpickling (the escaper closure is not picklable)
+        state = self.__dict__.copy()
+        del state['_plan_cache']
+        del state['_escaper']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._plan_cache = {}
+        self._escaper = _make_cell_escaper(self.escape_cache_size)
 
     def _escape_html(self, value: Any) -> str:
         """Escape HTML characters in values."""
-        if value is None:
-            return ""
-        return html.escape(str(value))
+        return self._escaper(value)
+
+    def escape_cache_info(self):
+        """
+        Get statistics of the escaped-string cache.
+        
+        Returns:
+            functools-style CacheInfo named tuple (hits, misses, maxsize, currsize)
+        """
+        return self._escaper.cache_info()
 
     def _get_table_attributes(self) -> str:
         """Generate table attributes string."""
         attributes = []
+        lean_class = self._get_lean_class()
         
         if self.table_class:
             class_list = [self.table_class]
@@ -55,6 +550,8 @@ class TableGenerator:
                 class_list.append('striped')
             if self.responsive:
                 class_list.append('responsive')
+            if lean_class:
+                class_list.append(lean_class)
             attributes.append(f'class="{" ".join(class_list)}"')
         else:
             class_list = []
@@ -64,6 +561,8 @@ class TableGenerator:
                 class_list.append('striped')
             if self.responsive:
                 class_list.append('responsive')
+            if lean_class:
+                class_list.append(lean_class)
             if class_list:
                 attributes.append(f'class="{" ".join(class_list)}"')
         
@@ -86,6 +585,35 @@ class TableGenerator:
         """Get cell style string."""
         return f' style="{self.styles["td"]}"' if 'td' in self.styles else ''
 
+    def _get_lean_class(self) -> Optional[str]:
+        """
+        Get the generated class carrying the lean profile's cell styles.
+        
+        The name is derived from the styles, so tables with the same styles
+        share one class (and one stylesheet in an AssetRegistry).
+        """
+        if self.markup != 'lean' or not (self.striped or 'th' in self.styles or 'td' in self.styles):
+            return None
+        styles = (self.styles.get('th'), self.styles.get('td'),
+                  self.styles.get('stripe', DEFAULT_STRIPE_STYLE) if self.striped else None)
+        return f"lean-{hashlib.sha256(repr(styles).encode('utf-8')).hexdigest()[:8]}"
+
+    def _get_lean_css(self) -> str:
+        """Generate the stylesheet that replaces per-cell styles and row classes in lean markup."""
+        lean_class = self._get_lean_class()
+        if not lean_class:
+            return ""
+        rules = []
+        if 'th' in self.styles:
+            rules.append(f".{lean_class} th {{\n    {self.styles['th']}\n}}")
+        if 'td' in self.styles:
+            rules.append(f".{lean_class} td {{\n    {self.styles['td']}\n}}")
+        if self.striped:
+            # Rows are numbered from 1 here, so the even rows are the 'odd' class of pretty markup
+            rules.append(f".{lean_class} > tbody > tr:nth-child(even) {{\n"
+                         f"    {self.styles.get('stripe', DEFAULT_STRIPE_STYLE)}\n}}")
+        return "\n/* Lean table styles */\n" + "\n\n".join(rules) + "\n"
+
     def _get_row_class(self, row_index: int) -> str:
         """Get row class for striping."""
         if self.striped:
@@ -102,24 +630,31 @@ class TableGenerator:
                 # First row contains headers
                 headers = [str(header) for header in data[0]]
             else:
-                # Get all unique keys from all dictionaries
-                all_keys = set()
-                for item in data:
+                # Get all unique keys in first-seen order, from a single pass
+                # over every row (or over the first header_sample rows)
+                rows = data if self.header_sample is None else islice(data, self.header_sample)
+                all_keys = {}
+                for item in rows:
                     if isinstance(item, dict):
-                        all_keys.update(item.keys())
+                        # Only the (ordered) keys matter; values are overwritten
+                        all_keys.update(item)
                 headers = list(all_keys)
         else:
             return []
         
-        # Apply custom ordering if specified
+        return self._apply_headers_order(headers)
+
+    def _apply_headers_order(self, headers: List[str]) -> List[str]:
+        """Apply the configured headers_order to a list of discovered headers."""
         if self.headers_order:
-            ordered_headers = []
-            for header in self.headers_order:
-                if header in headers:
-                    ordered_headers.append(header)
+            available = set(headers)
+            ordered_headers = [header for header in dict.fromkeys(self.headers_order)
+                               if header in available]
             # Add any remaining headers not in the order
+            seen = set(ordered_headers)
             for header in headers:
-                if header not in ordered_headers:
+                if header not in seen:
+                    seen.add(header)
                     ordered_headers.append(header)
             return ordered_headers
         
@@ -176,51 +711,15 @@ class TableGenerator:
         """Generate JavaScript code for table sorting functionality."""
         return """
 function sortTable(table, column, dataType = 'auto') {
-    const tbody = table.querySelector('tbody');
-    const rows = Array.from(tbody.querySelectorAll('tr'));
     const isAscending = table.dataset.sortDirection !== 'asc';
     
-    // Determine data type if auto
-    if (dataType === 'auto') {
-        const sampleValue = rows[0]?.cells[column]?.textContent.trim();
-        if (sampleValue && !isNaN(sampleValue.replace(/[,$%]/g, ''))) {
-            dataType = 'number';
-        } else if (sampleValue && !isNaN(Date.parse(sampleValue))) {
-            dataType = 'date';
-        } else {
-            dataType = 'string';
-        }
+    if (table._virtualTable) {
+        // Virtual tables sort their data model and re-render the visible window
+        table._virtualTable.sort(column, isAscending);
+    } else {
+        sortTableRows(table, column, dataType, isAscending);
     }
     
-    // Sort rows
-    rows.sort((a, b) => {
-        const aText = a.cells[column]?.textContent.trim() || '';
-        const bText = b.cells[column]?.textContent.trim() || '';
-        
-        let aVal, bVal;
-        
-        switch (dataType) {
-            case 'number':
-                aVal = parseFloat(aText.replace(/[,$%]/g, '')) || 0;
-                bVal = parseFloat(bText.replace(/[,$%]/g, '')) || 0;
-                break;
-            case 'date':
-                aVal = new Date(aText);
-                bVal = new Date(bText);
-                break;
-            default:
-                aVal = aText.toLowerCase();
-                bVal = bText.toLowerCase();
-        }
-        
-        if (aVal < bVal) return isAscending ? -1 : 1;
-        if (aVal > bVal) return isAscending ? 1 : -1;
-        return 0;
-    });
-    
-    // Update tbody with sorted rows
-    rows.forEach(row => tbody.appendChild(row));
-    
     // Update sort direction
     table.dataset.sortDirection = isAscending ? 'asc' : 'desc';
     
@@ -234,9 +733,102 @@ function sortTable(table, column, dataType = 'auto') {
     });
 }
 
+function sortTableRows(table, column, dataType, isAscending) {
+    const tbody = table.tBodies[0];
+    const rows = Array.from(tbody.rows);
+    
+    // Prefer the column type computed by the generator
+    if (dataType === 'auto') {
+        const header = table.tHead?.rows[0]?.cells[column];
+        dataType = header?.dataset.sortType || 'auto';
+    }
+    const keys = getSortKeys(table, rows, column, dataType);
+    const direction = isAscending ? 1 : -1;
+    
+    // Decorate-sort-undecorate: compare precomputed keys, break ties by original order
+    const decorated = rows.map(row => ({key: keys[row._sortIndex], index: row._sortIndex, row}));
+    decorated.sort((a, b) => {
+        if (a.key < b.key) return -direction;
+        if (a.key > b.key) return direction;
+        return a.index - b.index;
+    });
+    
+    // Reattach all rows at once to avoid a reflow per row
+    const striped = table.classList.contains('striped');
+    const fragment = document.createDocumentFragment();
+    decorated.forEach((item, position) => {
+        if (striped) {
+            item.row.className = position % 2 === 1 ? 'odd' : 'even';
+        }
+        fragment.appendChild(item.row);
+    });
+    tbody.appendChild(fragment);
+}
+
+function getSortKeys(table, rows, column, dataType) {
+    if (!table._sortKeys || table._sortRowCount !== rows.length) {
+        // Number rows in their original order; keys are cached against these indexes
+        rows.forEach((row, index) => { row._sortIndex = index; });
+        table._sortRowCount = rows.length;
+        table._sortKeys = {};
+    }
+    const cacheKey = column + ':' + dataType;
+    if (table._sortKeys[cacheKey]) {
+        return table._sortKeys[cacheKey];
+    }
+    
+    // Read and parse every cell exactly once
+    const texts = new Array(rows.length);
+    rows.forEach(row => {
+        texts[row._sortIndex] = row.cells[column]?.textContent.trim() || '';
+    });
+    if (dataType === 'auto') {
+        dataType = detectSortType(texts);
+    }
+    
+    let keys;
+    switch (dataType) {
+        case 'number':
+            keys = texts.map(text => parseFloat(text.replace(/[,$%]/g, '')) || 0);
+            break;
+        case 'date':
+            keys = texts.map(text => Date.parse(text) || 0);
+            break;
+        default:
+            keys = texts.map(text => text.toLowerCase());
+    }
+    table._sortKeys[cacheKey] = keys;
+    return keys;
+}
+
+function detectSortType(texts) {
+    let numeric = true;
+    let date = true;
+    let seen = false;
+    for (const text of texts) {
+        if (!text) {
+            continue;
+        }
+        seen = true;
+        if (numeric && isNaN(text.replace(/[,$%]/g, ''))) {
+            numeric = false;
+        }
+        if (date && isNaN(Date.parse(text))) {
+            date = false;
+        }
+        if (!numeric && !date) {
+            break;
+        }
+    }
+    if (!seen) {
+        return 'string';
+    }
+    return numeric ? 'number' : (date ? 'date' : 'string');
+}
+
 function initializeSortableTables() {
     document.querySelectorAll('table.sortable').forEach(table => {
-        const headers = table.querySelectorAll('th');
+        const headers = table.querySelectorAll('thead th');
         headers.forEach((header, index) => {
             header.setAttribute('data-sortable', 'true');
             header.style.cursor = 'pointer';
@@ -308,25 +900,209 @@ if (document.readyState === 'loading') {
 }
 """
 
+    def _get_virtual_javascript(self) -> str:
+        """Generate JavaScript code for virtual scrolling tables."""
+        return """
+function initializeVirtualTables() {
+    document.querySelectorAll('.virtual-table').forEach(container => {
+        const table = container.querySelector('table');
+        const dataScript = container.querySelector('script.virtual-table-data');
+        if (!table || !dataScript || table._virtualTable) {
+            return;
+        }
+        
+        const payload = JSON.parse(dataScript.textContent);
+        const tbody = table.tBodies[0];
+        const columnCount = payload.columns.length;
+        const rowCount = payload.rows;
+        const striped = table.classList.contains('striped');
+        let rowHeight = parseFloat(container.dataset.rowHeight) || 32;
+        let order = Array.from({length: rowCount}, (_, index) => index);
+        
+        // Dictionary-encoded columns hold indexes into payload.dictionaries
+        const cellValue = (row, column) => {
+            const raw = payload.columns[column][row];
+            const dictionary = payload.dictionaries[column];
+            return String(dictionary ? dictionary[raw] : raw);
+        };
+        
+        const createSpacer = () => {
+            const spacer = document.createElement('tr');
+            spacer.className = 'virtual-spacer';
+            const cell = document.createElement('td');
+            cell.colSpan = columnCount;
+            spacer.appendChild(cell);
+            return spacer;
+        };
+        
+        // A fixed pool of <tr> nodes is recycled while scrolling
+        const topSpacer = createSpacer();
+        const bottomSpacer = createSpacer();
+        const poolSize = Math.min(rowCount, Math.ceil(container.clientHeight / rowHeight) + 20);
+        const pool = [];
+        tbody.appendChild(topSpacer);
+        for (let i = 0; i < poolSize; i++) {
+            const row = document.createElement('tr');
+            for (let column = 0; column < columnCount; column++) {
+                const cell = document.createElement('td');
+                if (payload.cellStyle) {
+                    cell.style.cssText = payload.cellStyle;
+                }
+                row.appendChild(cell);
+            }
+            tbody.appendChild(row);
+            pool.push(row);
+        }
+        tbody.appendChild(bottomSpacer);
+        
+        let firstRow = -1;
+        const render = (force = false) => {
+            const overscan = 10;
+            const start = Math.max(0, Math.min(rowCount - poolSize,
+                Math.floor(container.scrollTop / rowHeight) - overscan));
+            if (start === firstRow && !force) {
+                return;
+            }
+            firstRow = start;
+            topSpacer.firstChild.style.height = (start * rowHeight) + 'px';
+            bottomSpacer.firstChild.style.height = ((rowCount - start - poolSize) * rowHeight) + 'px';
+            pool.forEach((row, offset) => {
+                const position = start + offset;
+                const dataRow = order[position];
+                if (striped) {
+                    row.className = position % 2 === 1 ? 'odd' : 'even';
+                }
+                for (let column = 0; column < columnCount; column++) {
+                    row.cells[column].textContent = cellValue(dataRow, column);
+                }
+            });
+        };
+        
+        let scheduled = false;
+        container.addEventListener('scroll', () => {
+            if (!scheduled) {
+                scheduled = true;
+                requestAnimationFrame(() => {
+                    scheduled = false;
+                    render();
+                });
+            }
+        });
+        
+        table._virtualTable = {
+            sort(column, ascending) {
+                // Decorate once per sort instead of re-parsing inside the comparator
+                const texts = Array.from({length: rowCount}, (_, row) => cellValue(row, column).trim());
+                const numeric = texts.every(text => text === '' || !isNaN(Number(text.replace(/[,$%]/g, ''))));
+                const keys = numeric
+                    ? texts.map(text => text === '' ? -Infinity : Number(text.replace(/[,$%]/g, '')))
+                    : texts.map(text => text.toLowerCase());
+                const direction = ascending ? 1 : -1;
+                order.sort((a, b) => {
+                    if (keys[a] < keys[b]) return -direction;
+                    if (keys[a] > keys[b]) return direction;
+                    return a - b;
+                });
+                render(true);
+            }
+        };
+        
+        render(true);
+        if (pool.length) {
+            // Use the real row height once the first rows are laid out
+            rowHeight = pool[0].getBoundingClientRect().height || rowHeight;
+            render(true);
+        }
+    });
+}
+
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', initializeVirtualTables);
+} else {
+    initializeVirtualTables();
+}
+"""
+
+    def _get_virtual_css(self) -> str:
+        """Generate CSS for virtual scrolling tables."""
+        return """
+/* Virtual scrolling table styles */
+.virtual-table {
+    overflow-y: auto;
+    position: relative;
+}
+
+.virtual-table thead th {
+    position: sticky;
+    top: 0;
+    z-index: 1;
+}
+
+.virtual-table td {
+    white-space: nowrap;
+}
+
+.virtual-table .virtual-spacer td {
+    padding: 0;
+    border: none;
+}
+"""
+
+    def _register_assets(self) -> None:
+        """Register the CSS and JavaScript this generator's tables need in the shared registry."""
+        if self.assets is None:
+            return
+        if self.virtual:
+            self.assets.add_css('virtual', self._get_virtual_css())
+            self.assets.add_javascript('virtual', self._get_virtual_javascript())
+        if self.sortable:
+            self.assets.add_css('sort', self._get_sort_css())
+            self.assets.add_javascript('sort', self._get_sort_javascript())
+        lean_class = self._get_lean_class()
+        if lean_class:
+            self.assets.add_css(lean_class, self._get_lean_css())
+
     def _render_javascript(self) -> str:
-        """Render JavaScript for table sorting if sortable."""
+        """Render JavaScript for table sorting and virtual scrolling if enabled."""
+        scripts = []
+        if self.virtual:
+            scripts.append(self._get_virtual_javascript())
         if self.sortable:
-            return f"<script>{self._get_sort_javascript()}</script>"
+            scripts.append(self._get_sort_javascript())
+        if scripts:
+            return f"<script>{''.join(scripts)}</script>"
         return ""
 
     def _render_css(self) -> str:
-        """Render CSS for sortable tables if sortable."""
+        """Render CSS for sortable and virtual tables if enabled."""
+        styles = []
         if self.sortable:
-            return f"<style>{self._get_sort_css()}</style>"
+            styles.append(self._get_sort_css())
+        if self.virtual:
+            styles.append(self._get_virtual_css())
+        lean_css = self._get_lean_css()
+        if lean_css:
+            styles.append(lean_css)
+        if styles:
+            return f"<style>{''.join(styles)}</style>"
         return ""
 
-    def generate_table(self, data: Union[Dict, List[Dict], List[List]]) -> str:
+    def generate_table(self, data: Union[Dict, List[Dict], List[List]],
+                       workers: Optional[int] = None,
+                       sort_by: Optional[Sequence[Tuple[str, str]]] = None,
+                       limit: Optional[int] = None) -> str:
         """
         Generate HTML table from dictionary, list of dictionaries, or CSV-like data.
         
         Args:
             data: Dictionary, list of dictionaries, or CSV-like data (list of lists/tuples 
                   where first row contains headers) to convert to HTML table
+            workers: Render rows in this many worker processes (tables with fewer
+                     than PARALLEL_MIN_ROWS rows are still rendered in-process)
+            sort_by: Sort the rows before rendering by these (column, 'asc' or
+                     'desc') pairs, most significant first; missing values sort last
+            limit: Render at most this many rows (the first ones after sorting;
+                   with sort_by only the top rows are kept instead of sorting everything)
             
         Returns:
             HTML table string
@@ -336,60 +1112,704 @@ if (document.readyState === 'loading') {
         """
         if not isinstance(data, (dict, list)):
             raise ValueError("Input must be a dictionary, list of dictionaries, or CSV-like data (list of lists)")
+        sort_by = self._check_sort_options(sort_by, limit)
         
-        # Handle empty data
-        if not data:
-            return f'<table{self._get_table_attributes()}>\n</table>'
-        
-        # Check if data is CSV-like and convert to dictionaries
-        if isinstance(data, list) and self._is_csv_like_data(data):
-            data_list = self._convert_csv_to_dicts(data)
-        elif isinstance(data, dict):
-            # Convert single dict to list for uniform processing
-            data_list = [data]
-        else:
-            # Already a list of dictionaries
-            data_list = data
+        return ''.join(self._iter_table_parts(data, workers=workers, sort_by=sort_by, limit=limit))
+
+    def iter_table(self, rows: Union[Dict, Iterable], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   headers: Optional[List[str]] = None,
+                   workers: Optional[int] = None,
+                   sort_by: Optional[Sequence[Tuple[str, str]]] = None,
+                   limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Generate an HTML table as a stream of chunks.
+        
+        Accepts everything generate_table accepts, plus any other iterable of
+        rows (generators, database cursors, ...). Rows are consumed lazily and
+        the full document is never held in memory; joining the chunks gives
+        exactly the output of generate_table for the same data.
+        
+        For lists the headers are discovered exactly as in generate_table. For
+        other iterables the headers are taken from the ``headers`` argument,
+        from the first row when it is a list/tuple (CSV-like header row), or
+        from the keys of the first dictionary row.
+        
+        Args:
+            rows: Dictionary, list, or any iterable of dictionaries or CSV-like rows
+            chunk_size: Approximate size in characters of each yielded chunk
+            headers: Explicit column keys to render, skipping header discovery
+            workers: Render rows in this many worker processes (see generate_table)
+            sort_by: Sort the rows by these (column, direction) pairs (see generate_table)
+            limit: Render at most this many rows (see generate_table)
+            
+        Yields:
+            HTML table fragments of roughly ``chunk_size`` characters
+            
+        Raises:
+            ValueError: If rows is not a supported format
+        """
+        if isinstance(rows, (str, bytes)) or not isinstance(rows, (dict, Iterable)):
+            raise ValueError("Input must be a dictionary or an iterable of dictionaries or CSV-like rows")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        sort_by = self._check_sort_options(sort_by, limit)
+        
+        return self._chunk_parts(self._iter_table_parts(rows, headers, workers, sort_by, limit),
+                                 chunk_size)
+
+    async def aiter_table(self, rows: Union[Dict, Iterable, AsyncIterable],
+                          chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          headers: Optional[List[str]] = None,
+                          workers: Optional[int] = None,
+                          sort_by: Optional[Sequence[Tuple[str, str]]] = None,
+                          limit: Optional[int] = None,
+                          executor: Optional[Executor] = None) -> AsyncIterator[str]:
+        """
+        Generate an HTML table as an async stream of chunks, for asyncio applications.
+        
+        The chunks are those of iter_table. Control returns to the event loop
+        after every chunk, so a large table never blocks other tasks for
+        longer than one chunk (see chunk_size). With an executor, each chunk
+        is rendered in the executor instead of on the event loop thread.
+        
+        Example:
+            async for chunk in generator.aiter_table(rows, executor=pool):
+                await response.write(chunk.encode('utf-8'))
+        
+        Args:
+            rows: Anything accepted by iter_table, or an async iterable of
+                  dictionaries or CSV-like rows (e.g. an async database cursor)
+            chunk_size: Approximate size in characters of each yielded chunk
+            headers: Explicit column keys to render, skipping header discovery
+            workers: Render rows in this many worker processes (see generate_table)
+            sort_by: Sort the rows by these (column, direction) pairs (see generate_table)
+            limit: Render at most this many rows (see generate_table)
+            executor: Thread pool rendering the chunks off the event loop;
+                      async iterables always render in one (the loop's
+                      default executor if None) while their rows are
+                      fetched on the loop
+            
+        Yields:
+            HTML table fragments of roughly ``chunk_size`` characters
+            
+        Raises:
+            ValueError: If rows is not a supported format
+        """
+        loop = asyncio.get_running_loop()
+        from_async = isinstance(rows, AsyncIterable)
+        if from_async:
+            rows = _AsyncRowBridge(rows, loop)
+        chunks = self.iter_table(rows, chunk_size, headers, workers, sort_by, limit)
+        
+        if executor is None and not from_async:
+            for chunk in chunks:
+                yield chunk
+                await asyncio.sleep(0)
+            return
+        
+        pending = None
+        try:
+            while True:
+                pending = loop.run_in_executor(executor, next, chunks, None)
+                # Shielded so that cancelling the consumer leaves the future
+                # tracking the executor thread until next() has returned
+                chunk = await asyncio.shield(pending)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            if pending is None or pending.done():
+                chunks.close()
+            else:
+                # Closing a generator that is still executing raises ValueError,
+                # so close it once the executor is done with the current chunk
+                pending.add_done_callback(functools.partial(_close_after_render, chunks))
+
+    def _chunk_parts(self, parts: Iterable[str], chunk_size: int) -> Iterator[str]:
+        """Coalesce small HTML fragments into chunks of about chunk_size characters."""
+        buffer = []
+        size = 0
+        for part in parts:
+            buffer.append(part)
+            size += len(part)
+            if size >= chunk_size:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer)
+
+    def _prepare_rows(self, data: Union[Dict, Iterable],
+                      headers: Optional[List[str]] = None
+                      ) -> Tuple[List[str], Iterator, Optional[List[Optional[int]]], bool]:
+        """
+        Resolve headers and the row iterator for any supported input.
+        
+        Returns:
+            Tuple of (headers, row iterator, positions, sampled). For CSV-like
+            data the rows are the raw sequences and positions holds the column
+            index of each header (None if the header is not in the header row);
+            for dictionary rows positions is None. sampled tells whether rows
+            may contain keys missing from the headers because only a sample was
+            used for discovery.
+        """
+        explicit = headers is not None
+        
+        if isinstance(data, dict):
+            return (headers if explicit else self._extract_headers(data)), iter([data]), None, False
+        
+        if isinstance(data, list):
+            if self._is_csv_like_data(data):
+                return self._prepare_positional(data[0], islice(data, 1, None), headers)
+            if explicit:
+                return headers, iter(data), None, False
+            # Lists are only sampled on request, so late keys are ignored unless a policy is set
+            sampled = (self.late_keys is not None and self.header_sample is not None and
+                       len(data) > self.header_sample)
+            return self._extract_headers(data), iter(data), None, sampled
+        
+        # Arbitrary iterable: peek at the first row to decide how to read it
+        rows = iter(data)
+        sample = list(islice(rows, 1))
+        if not sample:
+            return (headers or []), iter(()), None, False
+        
+        first = sample[0]
+        if isinstance(first, (list, tuple)):
+            return self._prepare_positional(first, rows, headers)
+        
+        if explicit:
+            return headers, chain(sample, rows), None, False
+        
+        # Buffer the header sample so the rows can still be rendered afterwards;
+        # late keys are appended by default (late_keys=None) rather than dropped
+        sample.extend(islice(rows, (self.header_sample or 1) - 1))
+        return self._extract_headers(sample), chain(sample, rows), None, True
+
+    def _prepare_positional(self, header_row: Union[List, Tuple], rows: Iterator,
+                            headers: Optional[List[str]] = None
+                            ) -> Tuple[List[str], Iterator, List[Optional[int]], bool]:
+        """Map headers to column positions for CSV-like rows (header row first)."""
+        keys = [str(header) for header in header_row]
+        # Like the dictionary conversion, a repeated header name is one column
+        # (at its first position) holding the value of its last column
+        key_index = {key: index for index, key in enumerate(keys)}
+        if headers is None:
+            headers = self._apply_headers_order(list(key_index))
+        positions = [key_index.get(header) for header in headers]
+        return headers, rows, positions, False
 
-        # Check and convert CSV-like data
-        if self._is_csv_like_data(data_list):
-            data_list = self._convert_csv_to_dicts(data_list)
+    def _iter_table_parts(self, data: Union[Dict, Iterable],
+                          headers: Optional[List[str]] = None,
+                          workers: Optional[int] = None,
+                          sort_by: Optional[List[Tuple[str, bool]]] = None,
+                          limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the table markup piece by piece.
         
-        # Extract headers
-        headers = self._extract_headers(data_list)
+        Every piece after the first starts with the newline that separates it
+        from the previous line, so ''.join() of the pieces is the table HTML.
+        """
+        self._register_assets()
+        headers, rows, positions, sampled = self._prepare_rows(data, headers)
         if not headers:
-            return f'<table{self._get_table_attributes()}>\n</table>'
+            yield f'<table{self._get_table_attributes()}>\n</table>'
+            return
+        if sort_by or limit is not None:
+            rows = self._sort_rows(rows, headers, positions, sort_by, limit)
+        
+        sort_types = None
+        if self.sortable and not self.virtual and isinstance(data, (dict, list)):
+            # Rows already in memory can be typed up front for the client-side sort
+            sort_types = self._infer_sort_types(self._iter_data_columns(data, headers, positions))
+        plan = self._get_render_plan(headers, sort_types)
+        if self.virtual:
+            yield from self._iter_virtual_parts(plan, self._collect_columns(headers, rows, positions))
+            return
+        yield plan.head
+        # Appending late keys changes the columns mid-stream, so it stays in-process
+        if workers and workers > 1 and (positions is not None or not sampled or
+                                        self.late_keys == 'ignore'):
+            yield from self._iter_parallel_row_parts(plan, rows, positions, workers)
+            yield plan.tail
+            return
+        yield from self._iter_body_parts(plan, rows, positions, sampled)
+
+    def _iter_body_parts(self, plan: _RenderPlan, rows: Iterable,
+                         positions: Optional[List[Optional[int]]], sampled: bool):
+        """
+        Yield the row markup and closing tags of a table whose head was already yielded.
         
-        # Start building HTML
-        html_parts = [f'<table{self._get_table_attributes()}>']
+        Returns (as the generator's return value) the plan in use after the
+        last row, which covers any columns appended by the late_keys policy.
+        """
+        if positions is not None:
+            yield from self._iter_positional_row_parts(plan, rows, positions)
+            yield plan.tail
+            return plan
+        if not sampled or self.late_keys == 'ignore':
+            yield from self._iter_row_parts(plan, rows)
+            yield plan.tail
+            return plan
         
-        # Generate header
-        html_parts.append('  <thead>')
-        html_parts.append('    <tr>')
-        for header in headers:
-            display_header = self._get_display_header(header)
-            html_parts.append(f'      <th{self._get_header_style()}>{self._escape_html(display_header)}</th>')
-        html_parts.append('    </tr>')
-        html_parts.append('  </thead>')
+        final_plan = yield from self._iter_late_key_row_parts(plan, rows)
+        if final_plan is plan:
+            yield plan.tail
+        else:
+            # The header row was already written, so label the appended columns in a footer
+            if self.markup == 'lean':
+                yield f'\n<tfoot>\n{final_plan.header_row}\n</table>'
+            else:
+                yield f'\n  </tbody>\n  <tfoot>\n{final_plan.header_row}\n  </tfoot>\n</table>'
+        return final_plan
+
+    def _check_sort_options(self, sort_by: Optional[Sequence[Tuple[str, str]]],
+                            limit: Optional[int]) -> Optional[List[Tuple[str, bool]]]:
+        """
+        Validate sort_by and limit.
+        
+        Returns:
+            sort_by as a list of (column, descending) pairs, or None
+            
+        Raises:
+            ValueError: If a sort_by entry is not a (column, 'asc'|'desc') pair
+                        or limit is negative
+        """
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise ValueError("limit must be a non-negative integer")
+        if not sort_by:
+            return None
+        
+        order = []
+        for entry in sort_by:
+            if (not isinstance(entry, (list, tuple)) or len(entry) != 2 or
+                    entry[1] not in ('asc', 'desc')):
+                raise ValueError("sort_by entries must be (column, 'asc' or 'desc') pairs")
+            order.append((entry[0], entry[1] == 'desc'))
+        return order
+
+    def _sort_rows(self, rows: Iterable, headers: List[str],
+                   positions: Optional[List[Optional[int]]],
+                   sort_by: Optional[List[Tuple[str, bool]]], limit: Optional[int]) -> Iterator:
+        """
+        Apply sort_by and limit to the rows before rendering.
+        
+        A full sort is done as one stable sort per column, least significant
+        first. With a limit, heapq.nsmallest keeps only the top rows on a
+        combined key instead of sorting everything.
+        
+        Raises:
+            ValueError: If a sort column is not one of the table's columns
+        """
+        if not sort_by:
+            return islice(rows, limit)
+        
+        sort_key = _make_sort_key(self.collation)
+        getters = []
+        for column, descending in sort_by:
+            if column not in headers:
+                raise ValueError(f"Cannot sort by '{column}': column not found")
+            if positions is None:
+                getter = lambda row, column=column: row.get(column)
+            else:
+                index = positions[headers.index(column)]
+                if index is None:
+                    raise ValueError(f"Cannot sort by '{column}': column not found")
+                getter = lambda row, index=index: row[index] if index < len(row) else None
+            
+            # Missing values sort last in both directions
+            if descending:
+                def column_key(row, getter=getter):
+                    value = getter(row)
+                    return (0,) if value is None else (1, sort_key(value))
+            else:
+                def column_key(row, getter=getter):
+                    value = getter(row)
+                    return (1,) if value is None else (0, sort_key(value))
+            getters.append((column_key, descending))
+        
+        if positions is None:
+            # Rows that are not dictionaries are never rendered
+            rows = (row for row in rows if isinstance(row, dict))
+        
+        if limit is not None:
+            def combined_key(row):
+                return tuple(_Descending(column_key(row)) if descending else column_key(row)
+                             for column_key, descending in getters)
+            return iter(heapq.nsmallest(limit, rows, key=combined_key))
         
-        # Generate body
-        html_parts.append('  <tbody>')
-        for row_index, row_data in enumerate(data_list):
+        rows = list(rows)
+        for column_key, descending in reversed(getters):
+            rows.sort(key=column_key, reverse=descending)
+        return iter(rows)
+
+    def _iter_data_columns(self, data: Union[Dict, List], headers: List[str],
+                           positions: Optional[List[Optional[int]]]) -> Iterator[Iterator]:
+        """Yield an iterator over each header's values for data held in a dict or list."""
+        if isinstance(data, dict):
+            for header in headers:
+                yield iter([data.get(header)])
+        elif positions is not None:
+            for index in positions:
+                if index is None:
+                    yield iter(())
+                else:
+                    yield (row[index] for row in islice(data, 1, None) if index < len(row))
+        else:
+            for header in headers:
+                yield (row.get(header) for row in data if isinstance(row, dict))
+
+    def _infer_sort_types(self, columns: Iterable[Iterable]) -> List[Optional[str]]:
+        """
+        Determine which columns the client-side sort can compare as numbers.
+        
+        Returns 'number' for columns whose values are all ints or floats (ignoring
+        None) and None otherwise, leaving the type to be detected in the browser.
+        """
+        sort_types = []
+        for values in columns:
+            dtype = getattr(values, 'dtype', None)
+            if dtype is not None and getattr(dtype, 'kind', None) in ('i', 'u', 'f'):
+                sort_types.append('number')
+                continue
+            if isinstance(values, array):
+                sort_types.append('number' if values.typecode in _NUMERIC_TYPECODES else None)
+                continue
+            
+            sort_type = None
+            for value in values:
+                if value is None:
+                    continue
+                if type(value) is not int and type(value) is not float:
+                    sort_type = None
+                    break
+                sort_type = 'number'
+            sort_types.append(sort_type)
+        return sort_types
+
+    def _collect_columns(self, headers: List[str], rows: Iterable,
+                         positions: Optional[List[Optional[int]]]) -> List[List]:
+        """Transpose dictionary or positional rows into one value list per header."""
+        columns = [[] for _ in headers]
+        if positions is not None:
+            for row in rows:
+                length = len(row)
+                for column, index in zip(columns, positions):
+                    column.append(row[index] if index is not None and index < length else None)
+        else:
+            for row in rows:
+                if not isinstance(row, dict):
+                    continue
+                get = row.get
+                for column, header in zip(columns, headers):
+                    column.append(get(header))
+        return columns
+
+    def _iter_virtual_parts(self, plan: _RenderPlan, columns: List[List]) -> Iterator[str]:
+        """
+        Yield a virtual table: header markup, an empty body and a JSON payload.
+        
+        The payload is columnar; integers are kept as JSON numbers, every other
+        value is sent as its display string, and string columns with repeated
+        values are dictionary-encoded so each distinct value is sent once.
+        """
+        row_count = len(columns[0]) if columns else 0
+        yield (f'<div class="virtual-table" data-row-height="{VIRTUAL_ROW_HEIGHT}" '
+               f'style="height: {int(self.virtual_height)}px;">\n')
+        yield plan.head
+        yield '\n  </tbody>\n</table>\n<script type="application/json" class="virtual-table-data">'
+        yield f'{{"rows":{row_count},"cellStyle":{self._to_script_json("" if self.markup == "lean" else self.styles.get("td", ""))},"columns":['
+        
+        dictionaries = {}
+        for column_index, values in enumerate(columns):
+            values = [self._virtual_value(value) for value in values]
+            distinct = dict.fromkeys(values)
+            if len(distinct) * 2 <= len(values) and any(type(value) is str for value in distinct):
+                codes = {value: code for code, value in enumerate(distinct)}
+                dictionaries[str(column_index)] = list(distinct)
+                values = [codes[value] for value in values]
+            yield (',' if column_index else '') + self._to_script_json(values)
+        
+        yield f'],"dictionaries":{self._to_script_json(dictionaries)}}}</script>\n</div>'
+
+    def _virtual_value(self, value: Any) -> Union[int, str]:
+        """Convert a cell value to its virtual table payload form."""
+        if value is None:
+            return ""
+        # JavaScript formats other numbers differently (e.g. 1.0 -> "1"), so only
+        # integers that survive the round trip are sent as numbers
+        if type(value) is int and -_MAX_SAFE_INTEGER <= value <= _MAX_SAFE_INTEGER:
+            return value
+        return str(value)
+
+    def _to_script_json(self, value: Any) -> str:
+        """Serialize a value as compact JSON that is safe inside a <script> element."""
+        text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        return text.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+
+    def _render_row_batch(self, plan: _RenderPlan, rows: Iterable,
+                          positions: Optional[List[Optional[int]]], start_index: int) -> str:
+        """Render a batch of dictionary or positional rows into one string."""
+        if positions is not None:
+            return ''.join(self._iter_positional_row_parts(plan, rows, positions, start_index))
+        return ''.join(self._iter_row_parts(plan, rows, start_index))
+
+    def _iter_parallel_row_parts(self, plan: _RenderPlan, rows: Iterable,
+                                 positions: Optional[List[Optional[int]]],
+                                 workers: int) -> Iterator[str]:
+        """
+        Render rows in a process pool, yielding the rendered batches in order.
+        
+        Each batch carries the index of its first row, so stripe parity is
+        preserved across batch boundaries. At most two batches per worker are
+        in flight, which keeps memory bounded for streamed input.
+        """
+        rows = iter(rows)
+        head = list(islice(rows, PARALLEL_MIN_ROWS))
+        if len(head) < PARALLEL_MIN_ROWS:
+            # Too small to be worth starting a pool
+            yield self._render_row_batch(plan, head, positions, 0)
+            return
+        
+        batches = chain([head[i:i + PARALLEL_BATCH_ROWS] for i in range(0, len(head), PARALLEL_BATCH_ROWS)],
+                        iter(lambda: list(islice(rows, PARALLEL_BATCH_ROWS)), []))
+        del head
+        
+        pool = _process_pool(workers, initializer=_init_render_worker,
+                             initargs=(self, plan.headers, positions))
+        try:
+            pending = deque()
+            start_index = 0
+            for batch in batches:
+                pending.append(pool.submit(_render_row_batch, batch, start_index))
+                start_index += len(batch)
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _iter_positional_row_parts(self, plan: _RenderPlan, rows: Iterable,
+                                   positions: List[Optional[int]],
+                                   start_index: int = 0) -> Iterator[str]:
+        """
+        Render CSV-like rows straight from their sequences, one string per row.
+        
+        Short rows are padded with empty cells and extra values are dropped,
+        matching the None-padding of the dictionary conversion.
+        """
+        templates = plan.row_templates
+        escape = self._escaper
+        width = len(positions)
+        in_order = positions == list(range(width))
+        for row_index, row in enumerate(rows, start_index):
+            if in_order and len(row) == width:
+                cells = map(escape, row)
+            else:
+                length = len(row)
+                cells = [escape(row[index]) if index is not None and index < length else ''
+                         for index in positions]
+            yield templates[row_index & 1].format(*cells)
+
+    def _iter_late_key_row_parts(self, plan: _RenderPlan, rows: Iterable):
+        """
+        Render dictionary rows while applying the late_keys policy.
+        
+        Returns (as the generator's return value) the plan in use after the
+        last row, which covers any appended columns.
+        """
+        known = set(plan.headers)
+        headers = plan.headers
+        templates = plan.row_templates
+        escape = self._escaper
+        for row_index, row_data in enumerate(rows):
+            if not isinstance(row_data, dict):
+                continue
+            if not known.issuperset(row_data):
+                late = [key for key in row_data if key not in known]
+                if self.late_keys == 'error':
+                    raise ValueError(f"Row {row_index} has keys not found in the header sample: {late}")
+                known.update(late)
+                plan = self._get_render_plan(headers + late)
+                headers = plan.headers
+                templates = plan.row_templates
+            get = row_data.get
+            yield templates[row_index & 1].format(*[escape(get(header)) for header in headers])
+        return plan
+
+    def _iter_row_parts(self, plan: _RenderPlan, rows: Iterable, start_index: int = 0) -> Iterator[str]:
+        """Render dictionary rows with a compiled plan, one string per row."""
+        headers = plan.headers
+        templates = plan.row_templates
+        escape = self._escaper
+        for row_index, row_data in enumerate(rows, start_index):
             if not isinstance(row_data, dict):
                 continue
+            get = row_data.get
+            yield templates[row_index & 1].format(*[escape(get(header)) for header in headers])
+
+    def _render_config_key(self) -> Tuple:
+        """Hashable snapshot of every setting that affects the static markup."""
+        return (self.markup, self.table_class, self.table_id, self.sortable, self.striped, self.responsive,
+                tuple(self.custom_attributes.items()), tuple(self.custom_headers.items()),
+                tuple(self.styles.items()))
+
+    def _get_render_plan(self, headers: List[str],
+                         sort_types: Optional[Sequence[Optional[str]]] = None) -> _RenderPlan:
+        """Return the cached render plan for the current configuration and headers."""
+        sort_types = tuple(sort_types) if sort_types and any(sort_types) else None
+        key = (self._render_config_key(), tuple(headers), sort_types)
+        plan = self._plan_cache.get(key)
+        if plan is None:
+            plan = self._compile_render_plan(list(headers), sort_types)
+            if len(self._plan_cache) >= RENDER_PLAN_CACHE_SIZE:
+                # Evict the oldest plan
+                del self._plan_cache[next(iter(self._plan_cache))]
+            self._plan_cache[key] = plan
+        return plan
+
+    def _compile_render_plan(self, headers: List[str],
+                             sort_types: Optional[Sequence[Optional[str]]] = None) -> _RenderPlan:
+        """Build the static markup for a table with the given headers."""
+        if self.markup == 'lean':
+            return self._compile_lean_render_plan(headers, sort_types)
+        
+        header_lines = ['    <tr>']
+        header_style = self._get_header_style()
+        for index, header in enumerate(headers):
+            display_header = self._get_display_header(header)
+            sort_type = sort_types[index] if sort_types else None
+            sort_attribute = f' data-sort-type="{sort_type}"' if sort_type else ''
+            header_lines.append(f'      <th{header_style}{sort_attribute}>{self._escape_html(display_header)}</th>')
+        header_lines.append('    </tr>')
+        header_row = '\n'.join(header_lines)
+        head = f'<table{self._get_table_attributes()}>\n  <thead>\n{header_row}\n  </thead>\n  <tbody>'
+        
+        # Static fragments may contain braces (e.g. in styles), so escape them for str.format
+        cell = f'      <td{self._get_cell_style()}>'.replace('{', '{{').replace('}', '}}') + '{}</td>'
+        cells = '\n'.join([cell] * len(headers))
+        row_templates = tuple(
+            '\n    <tr{}>\n'.format(self._get_row_class(parity).replace('{', '{{').replace('}', '}}')) +
+            cells + '\n    </tr>'
+            for parity in (0, 1)
+        )
+        
+        return _RenderPlan(headers, header_row, head, row_templates, '\n  </tbody>\n</table>')
+
+    def _compile_lean_render_plan(self, headers: List[str],
+                                  sort_types: Optional[Sequence[Optional[str]]] = None) -> _RenderPlan:
+        """
+        Build the static markup of the lean profile.
+        
+        Rows are one line each without indentation; the optional </th>, </td>,
+        </tr>, </thead> and </tbody> end tags are omitted, and styling comes
+        from the generated stylesheet class instead of attributes.
+        """
+        header_cells = []
+        for index, header in enumerate(headers):
+            sort_type = sort_types[index] if sort_types else None
+            sort_attribute = f' data-sort-type="{sort_type}"' if sort_type else ''
+            header_cells.append(f'<th{sort_attribute}>{self._escape_html(self._get_display_header(header))}')
+        header_row = '<tr>' + ''.join(header_cells)
+        head = f'<table{self._get_table_attributes()}>\n<thead>\n{header_row}\n<tbody>'
+        
+        row_template = '\n<tr>' + '<td>{}' * len(headers)
+        return _RenderPlan(headers, header_row, head, (row_template, row_template), '\n</table>')
+
+    def generate_columns(self, columns: Mapping[str, Sequence]) -> str:
+        """
+        Generate HTML table from column-oriented data.
+        
+        Args:
+            columns: Mapping of column name to a sequence of values (list, tuple,
+                     array.array, NumPy array, ...); all columns must have the
+                     same length
             
-            row_class = self._get_row_class(row_index)
-            html_parts.append(f'    <tr{row_class}>')
+        Returns:
+            HTML table string
             
-            for header in headers:
-                value = row_data.get(header)
-                html_parts.append(f'      <td{self._get_cell_style()}>{self._escape_html(value)}</td>')
+        Raises:
+            ValueError: If columns is not a mapping or the columns differ in length
+        """
+        return ''.join(self._iter_column_parts(columns))
+
+    def iter_columns(self, columns: Mapping[str, Sequence], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     block_size: int = COLUMN_BLOCK_SIZE) -> Iterator[str]:
+        """
+        Generate an HTML table from column-oriented data as a stream of chunks.
+        
+        Columns are formatted ``block_size`` rows at a time: numeric columns are
+        converted with a single batched str() pass and never escaped, so the data
+        is never transposed into per-row dictionaries.
+        
+        Args:
+            columns: Mapping of column name to a sequence of values
+            chunk_size: Approximate size in characters of each yielded chunk
+            block_size: Number of rows formatted per column batch
+            
+        Yields:
+            HTML table fragments of roughly ``chunk_size`` characters
             
-            html_parts.append('    </tr>')
-        html_parts.append('  </tbody>')
-        html_parts.append('</table>')
+        Raises:
+            ValueError: If columns is not a mapping or the columns differ in length
+        """
+        if chunk_size < 1 or block_size < 1:
+            raise ValueError("chunk_size and block_size must be positive integers")
+        return self._chunk_parts(self._iter_column_parts(columns, block_size), chunk_size)
+
+    def _iter_column_parts(self, columns: Mapping[str, Sequence],
+                           block_size: int = COLUMN_BLOCK_SIZE) -> Iterator[str]:
+        """Yield the table markup for column-oriented data, one row per piece."""
+        if not isinstance(columns, Mapping):
+            raise ValueError("Columns must be a mapping of column name to a sequence of values")
+        
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        
+        self._register_assets()
+        headers = self._apply_headers_order(list(columns.keys()))
+        if not headers:
+            yield f'<table{self._get_table_attributes()}>\n</table>'
+            return
+        
+        ordered_columns = [columns[header] for header in headers]
+        sort_types = self._infer_sort_types(ordered_columns) if self.sortable and not self.virtual else None
+        plan = self._get_render_plan(headers, sort_types)
+        templates = plan.row_templates
+        row_count = lengths.pop()
         
-        return '\n'.join(html_parts)
+        if self.virtual:
+            yield from self._iter_virtual_parts(plan, [
+                values.tolist() if hasattr(values, 'dtype') and hasattr(values, 'tolist') else list(values)
+                for values in ordered_columns
+            ])
+            return
+        
+        yield plan.head
+        for start in range(0, row_count, block_size):
+            stop = min(start + block_size, row_count)
+            formatted = [self._format_column(values[start:stop]) for values in ordered_columns]
+            for row_index, cells in enumerate(zip(*formatted), start):
+                yield templates[row_index & 1].format(*cells)
+        yield plan.tail
+
+    def _format_column(self, values: Sequence) -> List[str]:
+        """Format and escape a batch of column values."""
+        # NumPy arrays (and anything else exposing dtype/tolist) are detected by
+        # duck typing so NumPy stays an optional dependency
+        dtype = getattr(values, 'dtype', None)
+        if dtype is not None and hasattr(values, 'tolist'):
+            values = values.tolist()
+            if getattr(dtype, 'kind', None) in ('b', 'i', 'u', 'f'):
+                return list(map(str, values))
+        elif isinstance(values, array) and values.typecode in _NUMERIC_TYPECODES:
+            return list(map(str, values))
+        elif all(type(value) in _NUMERIC_TYPES for value in values):
+            return list(map(str, values))
+        
+        return list(map(self._escaper, values))
 
     def render_html(self, table_html: str, title: str = "HTML Table", css: Optional[str] = None) -> str:
         """
@@ -403,13 +1823,22 @@ if (document.readyState === 'loading') {
         Returns:
             Complete HTML document string
         """
+        return (self._render_html_prologue(title, css) + table_html +
+                self._render_html_epilogue())
+
+    def _render_html_prologue(self, title: str = "HTML Table", css: Optional[str] = None) -> str:
+        """Render the document markup that precedes the body content."""
         css_section = ""
         if css:
             css_section = f"<style>\n{css}\n</style>\n"
         
         # Add sortable functionality if enabled
-        sortable_styles = self._render_css()
-        sortable_script = self._render_javascript()
+        if self.assets is not None:
+            self.assets.start_document()
+            self._register_assets()
+            sortable_styles = self.assets.render_css()
+        else:
+            sortable_styles = self._render_css()
         
         return f"""<!DOCTYPE html>
 <html>
@@ -418,21 +1847,276 @@ if (document.readyState === 'loading') {
 <title>{self._escape_html(title)}</title>
 {css_section}{sortable_styles}</head>
 <body>
-{table_html}
-{sortable_script}</body>
+"""
+
+    def _render_html_epilogue(self) -> str:
+        """Render the document markup that follows the body content."""
+        if self.assets is not None:
+            # CSS registered while the body was streamed could not go into <head>
+            scripts = self.assets.render_css() + self.assets.render_javascript()
+        else:
+            scripts = self._render_javascript()
+        return f"""
+{scripts}</body>
 </html>"""
 
-    def _render_javascript(self) -> str:
-        """Render JavaScript for table sorting if sortable."""
-        if self.sortable:
-            return f"<script>{self._get_sort_javascript()}</script>"
-        return ""
+    def write_table(self, data: Union[Dict, Iterable], target: Any,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    headers: Optional[List[str]] = None,
+                    workers: Optional[int] = None,
+                    sort_by: Optional[Sequence[Tuple[str, str]]] = None,
+                    limit: Optional[int] = None,
+                    compression: Optional[str] = None,
+                    compresslevel: Optional[int] = None,
+                    sidecar: bool = False) -> None:
+        """
+        Write an HTML table directly to a file or stream.
+        
+        The table is rendered with iter_table and written in chunks, so the
+        complete table string is never built. With compression, the chunks are
+        compressed as they are written.
+        
+        Args:
+            data: Anything accepted by iter_table
+            target: File path, or a text or binary stream open for writing
+            chunk_size: Approximate size in characters of each write
+            headers: Explicit column keys to render, skipping header discovery
+            workers: Render rows in this many worker processes (see generate_table)
+            sort_by: Sort the rows by these (column, direction) pairs (see generate_table)
+            limit: Render at most this many rows (see generate_table)
+            compression: Compress the output with 'gzip', 'bz2' or 'lzma'
+            compresslevel: Compression level (codec default if None)
+            sidecar: Write the plain file to the target path and the compressed
+                     copy next to it (e.g. table.html.gz) in the same pass,
+                     instead of compressing the target itself
+        """
+        self._write_chunks(self.iter_table(data, chunk_size, headers, workers, sort_by, limit),
+                           target, chunk_size, compression, compresslevel, sidecar)
 
-    def _render_css(self) -> str:
-        """Render CSS for sortable tables if sortable."""
-        if self.sortable:
-            return f"<style>{self._get_sort_css()}</style>"
-        return ""
+    def write_document(self, body: Union[str, Iterable[str]], target: Any,
+                       title: str = "HTML Table", css: Optional[str] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       compression: Optional[str] = None,
+                       compresslevel: Optional[int] = None,
+                       sidecar: bool = False) -> None:
+        """
+        Write a complete HTML document directly to a file or stream.
+        
+        Produces the same output as render_html, but the body can be an
+        iterable of chunks (e.g. from iter_table) that is written as it is
+        produced instead of being joined into one string first.
+        
+        Args:
+            body: Body HTML as a string or an iterable of string chunks
+            target: File path, or a text or binary stream open for writing
+            title: Page title
+            css: Additional CSS to include
+            chunk_size: Approximate size in characters of each write
+            compression: Compress the output with 'gzip', 'bz2' or 'lzma'
+            compresslevel: Compression level (codec default if None)
+            sidecar: Also write the plain document (see write_table)
+        """
+        if isinstance(body, str):
+            body = [body]
+        self._write_chunks(self._iter_document_parts(body, title, css), target, chunk_size,
+                           compression, compresslevel, sidecar)
+
+    def _iter_document_parts(self, body: Iterable[str], title: str,
+                             css: Optional[str]) -> Iterator[str]:
+        """Yield a complete document around a streamed body."""
+        yield self._render_html_prologue(title, css)
+        yield from body
+        # Rendered only after the body, which may have registered more assets
+        yield self._render_html_epilogue()
+
+    def write_pages(self, data: Union[Dict, Iterable], directory: Union[str, os.PathLike],
+                    page_size: int = 1000, basename: str = "table", title: str = "HTML Table",
+                    css: Optional[str] = None, headers: Optional[List[str]] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[str, List[str]]:
+        """
+        Write a large table as a series of paginated HTML documents.
+        
+        Rows are split into pages of ``page_size`` rows; every page is a
+        complete document with the same header markup and previous/next links,
+        and an index page links to all pages. Pages are written as the rows
+        are read, so memory is bounded by one page.
+        
+        Args:
+            data: Anything accepted by iter_table
+            directory: Directory to write the pages into (created if missing)
+            page_size: Number of rows per page
+            basename: Index file name without extension; pages are named
+                      ``<basename>_page_0001.html``, ...
+            title: Title used for the index and (with the page number) each page
+            css: Additional CSS to include in every page
+            headers: Explicit column keys to render, skipping header discovery
+            chunk_size: Approximate size in characters of each write
+            
+        Returns:
+            Tuple of (index page path, list of page paths)
+            
+        Raises:
+            ValueError: If page_size is not positive or data is not a supported format
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer")
+        if isinstance(data, (str, bytes)) or not isinstance(data, (dict, Iterable)):
+            raise ValueError("Input must be a dictionary or an iterable of dictionaries or CSV-like rows")
+        
+        os.makedirs(directory, exist_ok=True)
+        headers, rows, positions, sampled = self._prepare_rows(data, headers)
+        plan = self._get_render_plan(headers) if headers else None
+        
+        def page_body(page_rows: List, nav: str) -> Iterator[str]:
+            # Columns appended under late_keys='append' carry over to the next pages
+            nonlocal plan
+            yield nav
+            yield plan.head
+            plan = yield from self._iter_body_parts(plan, page_rows, positions, sampled)
+            yield nav
+        css = f"{css}\n{self._get_pagination_css()}" if css else self._get_pagination_css()
+        
+        page_paths = []
+        page_ranges = []
+        row_count = 0
+        while True:
+            page_rows = list(islice(rows, page_size))
+            # Peek one row ahead to know whether a next page exists
+            lookahead = list(islice(rows, 1))
+            page_number = len(page_paths) + 1
+            nav = self._render_page_nav(basename, page_number, bool(lookahead))
+            
+            if plan is None:
+                body = [nav, f'<table{self._get_table_attributes()}>\n</table>', nav]
+            else:
+                body = page_body(page_rows, nav)
+            
+            path = os.path.join(directory, self._page_filename(basename, page_number))
+            self.write_document(body, path, title=f"{title} - Page {page_number}",
+                                css=css, chunk_size=chunk_size)
+            
+            page_paths.append(path)
+            # Only the single page of empty input has no rows
+            page_ranges.append((row_count + 1, row_count + len(page_rows)) if page_rows else None)
+            row_count += len(page_rows)
+            if not lookahead:
+                break
+            rows = chain(lookahead, rows)
+        
+        index_path = os.path.join(directory, f"{basename}.html")
+        items = []
+        for page_number, page_range in enumerate(page_ranges, 1):
+            href = self._escape_html(self._page_filename(basename, page_number))
+            rows_label = f"rows {page_range[0]}–{page_range[1]}" if page_range else "no rows"
+            items.append(f'  <li><a href="{href}">Page {page_number}</a> '
+                         f'<span class="page-rows">{rows_label}</span></li>')
+        index_html = (f'<nav class="table-pagination-index">\n<h1>{self._escape_html(title)}</h1>\n'
+                      f'<p>{row_count} rows in {len(page_paths)} pages</p>\n<ul>\n' +
+                      '\n'.join(items) + '\n</ul>\n</nav>')
+        self.write_document(index_html, index_path, title=title, css=css, chunk_size=chunk_size)
+        
+        return index_path, page_paths
+
+    def _page_filename(self, basename: str, page_number: int) -> str:
+        """Get the file name of a numbered page."""
+        return f"{basename}_page_{page_number:04d}.html"
+
+    def _render_page_nav(self, basename: str, page_number: int, has_next: bool) -> str:
+        """Render the navigation bar shown above and below each page."""
+        links = [f'<a href="{self._escape_html(basename)}.html">Index</a>']
+        if page_number > 1:
+            previous_page = self._escape_html(self._page_filename(basename, page_number - 1))
+            links.append(f'<a href="{previous_page}" rel="prev">← Previous</a>')
+        links.append(f'<span class="page-number">Page {page_number}</span>')
+        if has_next:
+            next_page = self._escape_html(self._page_filename(basename, page_number + 1))
+            links.append(f'<a href="{next_page}" rel="next">Next →</a>')
+        return f'\n<nav class="table-pagination">{" | ".join(links)}</nav>\n'
+
+    def _get_pagination_css(self) -> str:
+        """Generate CSS for the pagination navigation."""
+        return """
+.table-pagination {
+    margin: 10px 0;
+    font-family: Arial, sans-serif;
+}
+
+.table-pagination a {
+    text-decoration: none;
+}
+
+.table-pagination-index ul {
+    list-style: none;
+    padding: 0;
+}
+
+.table-pagination-index .page-rows {
+    color: #6c757d;
+}
+"""
+
+    def _write_chunks(self, parts: Iterable[str], target: Any, chunk_size: int,
+                      compression: Optional[str] = None, compresslevel: Optional[int] = None,
+                      sidecar: bool = False) -> None:
+        """
+        Coalesce parts into large chunks and write them to a path or stream.
+        
+        Raises:
+            ValueError: If the target is not writable, the codec is unknown, or
+                        compression or a sidecar is requested for a stream that
+                        cannot take it
+        """
+        if compression is not None and compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"compression must be one of {', '.join(COMPRESSION_SUFFIXES)}")
+        chunks = self._chunk_parts(parts, chunk_size)
+        
+        if isinstance(target, (str, os.PathLike)):
+            # Files are replaced only after the last chunk, so a render that
+            # fails mid-stream keeps the previous output
+            with ExitStack() as stack:
+                outputs = []
+                if compression is None or sidecar:
+                    outputs.append(stack.enter_context(_atomic_output(target, chunk_size)))
+                if compression is not None:
+                    path = f"{os.fspath(target)}{COMPRESSION_SUFFIXES[compression]}" if sidecar else target
+                    raw = stack.enter_context(_atomic_output(path, chunk_size))
+                    outputs.append(stack.enter_context(
+                        self._open_compressed(raw, compression, compresslevel)))
+                # Encode once and feed every output from the same pass
+                for chunk in chunks:
+                    data = chunk.encode('utf-8')
+                    for output in outputs:
+                        output.write(data)
+            return
+        
+        if not hasattr(target, 'write'):
+            raise ValueError("Target must be a file path or a writable stream")
+        if sidecar:
+            raise ValueError("sidecar output needs a file path target")
+        
+        binary = (isinstance(target, (io.RawIOBase, io.BufferedIOBase)) or
+                  'b' in str(getattr(target, 'mode', '')))
+        if compression is not None:
+            if not binary:
+                raise ValueError("Compressed output needs a binary stream")
+            with self._open_compressed(target, compression, compresslevel) as output:
+                for chunk in chunks:
+                    output.write(chunk.encode('utf-8'))
+            return
+        
+        for chunk in chunks:
+            target.write(chunk.encode('utf-8') if binary else chunk)
+
+    def _open_compressed(self, fileobj: Any, compression: str,
+                         compresslevel: Optional[int] = None) -> io.BufferedIOBase:
+        """Wrap a binary file object in a compressing writer (closing it leaves fileobj open)."""
+        if compression == 'gzip':
+            # A fixed mtime and no file name keep the output reproducible
+            return gzip.GzipFile(filename='', fileobj=fileobj, mode='wb', mtime=0,
+                                 compresslevel=9 if compresslevel is None else compresslevel)
+        if compression == 'bz2':
+            return bz2.BZ2File(fileobj, 'wb', compresslevel=9 if compresslevel is None else compresslevel)
+        return lzma.LZMAFile(fileobj, 'wb', preset=compresslevel)
 
     def make_collapsible(self, table_html: str, title: str = "Table", 
                         collapsed: bool = False, container_class: str = "collapsible-table") -> str:
@@ -448,12 +2132,19 @@ if (document.readyState === 'loading') {
         Returns:
             HTML string with table wrapped in collapsible container
         """
+        return self._wrap_collapsible(table_html, title, collapsed, container_class)
+
+    def _wrap_collapsible(self, table_html: str, title: str, collapsed: bool,
+                          container_class: str, style: str = '') -> str:
+        """Render the collapsible container markup, optionally with an inline style."""
         # Generate unique ID for this collapsible
         import random
         collapse_id = f"collapse-{random.randint(1000, 9999)}"
         
         # Determine initial state
         details_attrs = 'open' if not collapsed else ''
+        if style:
+            details_attrs += f' style="{style}"'
         
         collapsible_html = f"""<details class="{container_class}" {details_attrs}>
   <summary class="collapsible-header">
@@ -469,24 +2160,50 @@ if (document.readyState === 'loading') {
     
     def make_collapsible_with_css(self, table_html: str, title: str = "Table", 
                                  collapsed: bool = False, 
-                                 container_class: str = "collapsible-table") -> str:
+                                 container_class: str = "collapsible-table",
+                                 header_background: Optional[str] = None) -> str:
         """
         Wrap an HTML table in a collapsible container with built-in CSS styling.
         
+        Without an asset registry the styles are prepended to the returned
+        HTML. With one, a single stylesheet for COLLAPSIBLE_BASE_CLASS is
+        registered for the whole document and the container gets both the
+        base class and container_class.
+        
         Args:
             table_html: The HTML table string to make collapsible
             title: Title text for the collapsible header
             collapsed: Whether the table should start collapsed (default: False)
             container_class: CSS class for the collapsible container
+            header_background: CSS background of this container's header
+                               (overrides the default gradient)
             
         Returns:
             HTML string with table wrapped in styled collapsible container
         """
-        collapsible_html = self.make_collapsible(table_html, title, collapsed, container_class)
+        if self.assets is not None:
+            self.assets.add_css('collapsible', self._get_collapsible_css(COLLAPSIBLE_BASE_CLASS))
+            if container_class != COLLAPSIBLE_BASE_CLASS:
+                container_class = f"{COLLAPSIBLE_BASE_CLASS} {container_class}"
+            css = ""
+        else:
+            css = f"<style>{self._get_collapsible_css(container_class)}</style>\n"
+        
+        style = ''
+        if header_background:
+            # Per-container colours only override the custom properties of the shared styles
+            background = self._escape_html(header_background)
+            style = (f'--collapsible-header-background: {background}; '
+                     f'--collapsible-header-hover-background: {background};')
         
-        # Built-in CSS for collapsible styling
-        css = f"""<style>
+        return css + self._wrap_collapsible(table_html, title, collapsed, container_class, style)
+
+    def _get_collapsible_css(self, container_class: str) -> str:
+        """Generate the CSS for collapsible containers with the given class."""
+        return f"""
 .{container_class} {{
+    --collapsible-header-background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    --collapsible-header-hover-background: linear-gradient(135deg, #5a67d8 0%, #6b46c1 100%);
     border: 1px solid #ddd;
     border-radius: 8px;
     margin: 10px 0;
@@ -495,7 +2212,7 @@ if (document.readyState === 'loading') {
 }}
 
 .{container_class} summary {{
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    background: var(--collapsible-header-background);
     color: white;
     padding: 15px 20px;
     cursor: pointer;
@@ -509,7 +2226,7 @@ if (document.readyState === 'loading') {
 }}
 
 .{container_class} summary:hover {{
-    background: linear-gradient(135deg, #5a67d8 0%, #6b46c1 100%);
+    background: var(--collapsible-header-hover-background);
 }}
 
 .{container_class} summary:focus {{
@@ -560,7 +2277,4 @@ if (document.readyState === 'loading') {
     border-radius: 0;
     border: none;
 }}
-</style>
-{collapsible_html}"""
-        
-        return css
\ No newline at end of file
+"""
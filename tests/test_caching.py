@@ -0,0 +1,82 @@
+"""
+Tests for the incremental build cache.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import caching
+from src.caching import SectionCache
+
+
+class TestSectionCache(unittest.TestCase):
+    """Section cache tests using a temporary directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp_dir.name, "sales.json")
+        self.write_data('{"sales": [1, 2, 3]}')
+        self.cache = SectionCache(os.path.join(self.tmp_dir.name, "cache"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_data(self, text, mtime_ns=None):
+        with open(self.data_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        if mtime_ns is not None:
+            os.utime(self.data_path, ns=(mtime_ns, mtime_ns))
+
+    def test_roundtrip(self):
+        """Test storing and reusing a section"""
+        self.assertIsNone(self.cache.get("sales", self.data_path, {"color": "red"}))
+        self.assertTrue(self.cache.put("sales", self.data_path, {"color": "red"}, {"html": "<table>"}))
+
+        self.assertEqual(self.cache.get("sales", self.data_path, {"color": "red"}), {"html": "<table>"})
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_config_change_invalidates(self):
+        """Test that a different section configuration is a miss"""
+        self.cache.put("sales", self.data_path, {"color": "red"}, "cached")
+
+        self.assertIsNone(self.cache.get("sales", self.data_path, {"color": "blue"}))
+
+    def test_content_change_invalidates(self):
+        """Test that changed content is a miss even with the same size"""
+        self.cache.put("sales", self.data_path, {}, "cached")
+        self.write_data('{"sales": [1, 2, 4]}')
+
+        self.assertIsNone(self.cache.get("sales", self.data_path, {}))
+
+    def test_touched_file_uses_content_hash(self):
+        """Test that a new mtime with unchanged content is still a hit"""
+        self.cache.put("sales", self.data_path, {}, "cached")
+        self.write_data('{"sales": [1, 2, 3]}', mtime_ns=1_000_000_000)
+
+        self.assertEqual(self.cache.get("sales", self.data_path, {}), "cached")
+        # The refreshed size/mtime fingerprint makes the next lookup hash-free
+        with mock.patch.object(caching, "file_digest") as file_digest:
+            self.assertEqual(self.cache.get("sales", self.data_path, {}), "cached")
+        file_digest.assert_not_called()
+
+    def test_file_changed_during_build_is_not_stored(self):
+        """Test that a stale stat fingerprint prevents caching"""
+        stat = self.cache.stat(self.data_path)
+        self.write_data('{"sales": [1, 2, 3, 4]}')
+
+        self.assertFalse(self.cache.put("sales", self.data_path, {}, "cached", stat))
+        self.assertIsNone(self.cache.get("sales", self.data_path, {}))
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that an unreadable entry is ignored"""
+        self.cache.put("sales", self.data_path, {}, "cached")
+        with open(self.cache._entry_path("sales"), "w", encoding="utf-8") as f:
+            f.write("{truncated")
+
+        self.assertIsNone(self.cache.get("sales", self.data_path, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for the dataset catalog.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.catalog import DatasetCatalog, infer_columns, summarize_dataset
+
+
+class TestDatasetCatalog(unittest.TestCase):
+    """Dataset catalog tests using a temporary directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.tmp_dir.name, ".catalog.json")
+        self.data_path = os.path.join(self.tmp_dir.name, "staff.json")
+        self.write_data({"staff": [{"name": "Alice", "age": 30}, {"name": "Bob", "age": None}]})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_data(self, data):
+        with open(self.data_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def make_catalog(self):
+        loader = mock.Mock(side_effect=lambda path: json.load(open(path, encoding="utf-8")))
+        return DatasetCatalog(self.index_path, loader=loader), loader
+
+    def test_summarize_records(self):
+        """Test the description of a single-key record dataset"""
+        summary = summarize_dataset({"staff": [{"name": "Alice", "age": 30}] * 4}, sample_size=2)
+
+        self.assertEqual(summary["key"], "staff")
+        self.assertEqual(summary["structure"], "records")
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["columns"], ["name", "age"])
+        self.assertEqual(len(summary["samples"]), 2)
+
+    def test_summarize_other_structures(self):
+        """Test the description of metrics, dictionaries and scalars"""
+        self.assertEqual(summarize_dataset({"kpi": {"a": 1, "b": 2}})["samples"], [["a", 1], ["b", 2]])
+        self.assertEqual(summarize_dataset({"a": 1, "b": 2})["structure"], "top-level keys")
+        self.assertEqual(summarize_dataset(5)["structure"], "item")
+
+    def test_infer_columns(self):
+        """Test column type inference across records"""
+        columns, types = infer_columns([{"a": 1, "b": None, "c": "x"}, {"a": 2.5, "b": True, "c": 3}])
+
+        self.assertEqual(columns, ["a", "b", "c"])
+        self.assertEqual(types, {"a": "number", "b": "boolean", "c": "mixed"})
+
+    def test_describe_is_cached_across_catalogs(self):
+        """Test that an unchanged file is only parsed once"""
+        catalog, loader = self.make_catalog()
+        first = catalog.describe("staff", self.data_path)
+        self.assertTrue(catalog.save())
+
+        catalog, loader = self.make_catalog()
+        second = catalog.describe("staff", self.data_path)
+
+        loader.assert_not_called()
+        self.assertEqual(second["count"], 2)
+        self.assertEqual(second["types"], {"name": "string", "age": "integer"})
+        self.assertEqual(first["sha256"], second["sha256"])
+
+    def test_changed_file_is_refreshed(self):
+        """Test that changed content is parsed again but a touched file is not"""
+        catalog, loader = self.make_catalog()
+        catalog.describe("staff", self.data_path)
+
+        os.utime(self.data_path, ns=(1_000_000_000, 1_000_000_000))
+        catalog.describe("staff", self.data_path)
+        self.assertEqual(loader.call_count, 1)
+
+        self.write_data({"staff": [{"name": "Carol"}]})
+        self.assertEqual(catalog.describe("staff", self.data_path)["count"], 1)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_prune_and_corrupt_index(self):
+        """Test dropping removed datasets and ignoring a corrupt index"""
+        catalog, _ = self.make_catalog()
+        catalog.describe("staff", self.data_path)
+        catalog.prune([])
+        catalog.save()
+
+        with open(self.index_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["datasets"], {})
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertEqual(DatasetCatalog(self.index_path).describe("staff", self.data_path)["count"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
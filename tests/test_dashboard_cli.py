@@ -0,0 +1,313 @@
+"""
+Tests for the dashboard CLI.
+These tests run the CLI against temporary data directories.
+"""
+
+import gzip
+import io
+import json
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from pathlib import Path
+
+from dashboard_cli import DashboardCLI, main
+
+
+class TestDashboardCLI(unittest.TestCase):
+    """Dashboard CLI tests using a temporary data directory."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        self.data_dir = self.root / "data"
+        self.data_dir.mkdir()
+
+        self.write_dataset("alpha_sales", {"alpha_sales": [
+            {"region": "North", "revenue": 1200},
+            {"region": "South", "revenue": 900}
+        ]})
+        self.write_dataset("beta_staff", {"beta_staff": [
+            {"name": "Alice", "department": "R&D"},
+            {"name": "Bob", "department": "Sales"}
+        ]})
+
+        self.cli = self.make_cli()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_dataset(self, name, data):
+        path = self.data_dir / f"{name}.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def make_cli(self):
+        cli = DashboardCLI()
+        cli.data_dir = self.data_dir
+        cli.output_dir = self.root
+        cli.available_datasets = cli._discover_datasets()
+        return cli
+
+    def run_quietly(self, func, *args, **kwargs):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            func(*args, **kwargs)
+        return output.getvalue()
+    
+    def run_quietly_value(self, func, *args):
+        with redirect_stdout(io.StringIO()):
+            return func(*args)
+
+    def test_generate_single_table(self):
+        """Test writing a single table document"""
+        self.run_quietly(self.cli.generate_single_table, "beta_staff", "staff.html")
+
+        html = (self.root / "staff.html").read_text(encoding="utf-8")
+        self.assertIn("<!DOCTYPE html>", html)
+        self.assertIn("<td>R&amp;D</td>", html)
+        self.assertIn("Beta Staff", html)
+
+    def test_single_table_streams_record_arrays(self):
+        """Test that record arrays are streamed and other datasets are loaded"""
+        self.write_dataset("metrics", {"metrics": {"total": 5}})
+        cli = self.make_cli()
+
+        with mock.patch.object(cli, "load_dataset", wraps=cli.load_dataset) as load:
+            count = cli.write_single_table("beta_staff", io.StringIO())
+            load.assert_not_called()
+            output = io.StringIO()
+            self.assertIsNone(cli.write_single_table("metrics", output))
+            load.assert_called_once_with("metrics")
+
+        self.assertEqual(count, 2)
+        self.assertIn(">total</th>", output.getvalue())
+
+    def test_single_table_rejects_data_after_record_array(self):
+        """Test that a truncated document is an error and keeps the previous output"""
+        (self.data_dir / "broken.json").write_text('{"emp": [{"a": 1}, {"a": 2}], "oops": ',
+                                                   encoding="utf-8")
+        cli = self.make_cli()
+        (self.root / "broken.html").write_text("previous", encoding="utf-8")
+
+        output = self.run_quietly(cli.generate_single_table, "broken", "broken.html")
+        self.assertIn("Error generating table", output)
+        self.assertEqual((self.root / "broken.html").read_text(encoding="utf-8"), "previous")
+
+    def test_multi_member_document_renders_like_dashboard(self):
+        """Test that a record array followed by other members falls back to the loaded document"""
+        self.write_dataset("report", {"records": [{"a": 1}, {"a": 2}], "meta": {"source": "x"}})
+        cli = self.make_cli()
+
+        output = self.run_quietly(cli.generate_single_table, "report", "report.html")
+        self.assertNotIn("Error", output)
+        html = (self.root / "report.html").read_text(encoding="utf-8")
+        section_html, _ = cli._generate_dashboard_section("report", cli.load_dataset("report"))
+        for column in ("records", "meta"):
+            self.assertIn(f">{column}</th>", html)
+            self.assertIn(f">{column}</th>", section_html)
+        self.assertEqual(html.count("<!DOCTYPE html>"), 1)
+
+        stream = io.StringIO()
+        self.assertIsNone(cli.write_single_table("report", stream))
+        self.assertEqual(stream.getvalue().count("<!DOCTYPE html>"), 1)
+
+        self.run_quietly(cli.generate_paginated_table, "report", "report_pages.html", 1)
+        index_html = (self.root / "report_pages.html").read_text(encoding="utf-8")
+        self.assertIn("1 rows in 1 pages", index_html)
+
+    def test_json_lines_datasets(self):
+        """Test discovering, listing and streaming .jsonl/.ndjson datasets"""
+        (self.data_dir / "events.jsonl").write_text(
+            '{"event": "login", "user": "alice"}\n\n{"event": "logout", "user": "bob", "ms": 5}\n',
+            encoding="utf-8")
+        (self.data_dir / "audit.ndjson").write_text('{"action": "read"}\n', encoding="utf-8")
+        cli = self.make_cli()
+
+        self.assertIn("events", cli.available_datasets)
+        self.assertIn("audit", cli.available_datasets)
+        listing = self.run_quietly(cli.list_datasets)
+        self.assertIn("events                      2 records", listing)
+
+        output = io.StringIO()
+        with mock.patch.object(cli, "load_dataset") as load:
+            self.assertEqual(cli.write_single_table("events", output), 2)
+        load.assert_not_called()
+        html = output.getvalue()
+        self.assertIn("Generated from events.jsonl", html)
+        self.assertIn(">ms</th>", html)
+        self.assertIn(">logout</td>", html)
+
+        self.run_quietly(cli.generate_dashboard, ["events", "audit"], "dash.html")
+        self.assertIn(">read</td>", (self.root / "dash.html").read_text(encoding="utf-8"))
+
+    def test_csv_table_from_path(self):
+        """Test the table command on a CSV file outside the data directory"""
+        path = self.root / "orders.csv"
+        path.write_text("id;item\n1;Pen\n2;Ink\n", encoding="utf-8")
+        output = self.root / "orders.html"
+
+        with mock.patch("sys.argv", ["dashboard_cli.py", "table", str(path), "--delimiter", ";",
+                                     "--output", str(output)]), \
+                mock.patch("dashboard_cli.DashboardCLI", self.make_cli):
+            self.run_quietly(main)
+
+        html = output.read_text(encoding="utf-8")
+        self.assertIn("<th>item</th>", html)
+        self.assertIn("<td>Ink</td>", html)
+        self.assertIn("Generated from orders.csv", html)
+
+    def test_compressed_datasets(self):
+        """Test discovering and streaming compressed datasets"""
+        with gzip.open(self.data_dir / "gamma_orders.json.gz", "wt", encoding="utf-8") as f:
+            json.dump({"gamma_orders": [{"item": "Pen", "qty": 3}]}, f)
+        with gzip.open(self.data_dir / "delta_log.csv.gz", "wt", encoding="utf-8") as f:
+            f.write("level,message\nwarn,disk low\n")
+        cli = self.make_cli()
+        cli.decompress_thread = True
+
+        self.assertEqual(cli.available_datasets["gamma_orders"],
+                         str(self.data_dir / "gamma_orders.json.gz"))
+        output = io.StringIO()
+        self.assertEqual(cli.write_single_table("delta_log", output), 1)
+        self.assertIn("<td>disk low</td>", output.getvalue())
+        self.assertIn("Generated from delta_log.csv.gz", output.getvalue())
+
+        self.run_quietly(cli.generate_dashboard, ["gamma_orders"], "dash.html")
+        self.assertIn(">Pen</td>", (self.root / "dash.html").read_text(encoding="utf-8"))
+        self.assertIn("gamma_orders                1 records", self.run_quietly(cli.list_datasets))
+
+    def test_sqlite_query_table(self):
+        """Test the table command with --sqlite and --query"""
+        database = self.root / "shop.db"
+        connection = sqlite3.connect(database)
+        connection.execute("CREATE TABLE orders (item TEXT, qty INTEGER)")
+        connection.executemany("INSERT INTO orders VALUES (?, ?)", [("Pen", 3), ("Ink", 1)])
+        connection.commit()
+        connection.close()
+        output = self.root / "orders.html"
+
+        argv = ["dashboard_cli.py", "table", "open_orders", "--sqlite", str(database),
+                "--query", "SELECT item, qty FROM orders WHERE qty > 1", "--output", str(output)]
+        with mock.patch("sys.argv", argv), mock.patch("dashboard_cli.DashboardCLI", self.make_cli):
+            printed = self.run_quietly(main)
+
+        html = output.read_text(encoding="utf-8")
+        self.assertIn("Records: 1", printed)
+        self.assertIn("Open Orders", html)
+        self.assertIn("<td>Pen</td>", html)
+        self.assertNotIn("<td>Ink</td>", html)
+
+    def test_serve_renders_on_demand_and_caches(self):
+        """Test the serve routes, the page cache and re-rendering after a data change"""
+        server = self.cli.make_server(port=0, quiet=True)
+        try:
+            with mock.patch.object(self.cli, "write_dashboard", wraps=self.cli.write_dashboard) as render:
+                dashboard = self.run_quietly_value(server.get_response, "/", {})
+                self.assertIs(self.run_quietly_value(server.get_response, "/", {}), dashboard)
+            render.assert_called_once()
+            self.assertIn(b"Alpha Sales", dashboard.body)
+
+            subset = server.get_response("/", {"datasets": ["beta_staff"]})
+            self.assertNotIn(b"Alpha Sales", subset.body)
+            self.assertIsNone(server.get_response("/", {"datasets": ["nope"]}))
+            self.assertIsNone(server.get_response("/table/nope", {}))
+
+            table = server.get_response("/table/beta_staff", {})
+            self.assertIn(b"<td>Alice</td>", table.body)
+            self.write_dataset("beta_staff", {"beta_staff": [{"name": "Carol", "department": "Ops"}]})
+            changed = server.get_response("/table/beta_staff", {})
+            self.assertIn(b"<td>Carol</td>", changed.body)
+            self.assertNotEqual(changed.etag, table.etag)
+        finally:
+            server.server_close()
+
+    def test_parallel_dashboard_keeps_order_and_reports_failures(self):
+        """Test --jobs keeps section order and skips failing sections"""
+        (self.data_dir / "broken.json").write_text("{not json", encoding="utf-8")
+        cli = self.make_cli()
+
+        output = self.run_quietly(cli.generate_dashboard,
+                                  ["beta_staff", "broken", "alpha_sales"], "dash.html", jobs=2)
+
+        html = (self.root / "dash.html").read_text(encoding="utf-8")
+        self.assertIn("Section 'broken' failed", output)
+        self.assertIn("📊 2 Data Sources", html)
+        self.assertLess(html.find("Beta Staff"), html.find("Alpha Sales"))
+
+    def test_dashboard_shared_assets(self):
+        """Test that dashboard sections share one copy of the CSS and JavaScript"""
+        self.run_quietly(self.cli.generate_dashboard, None, "dash.html", jobs=2)
+        self.run_quietly(self.cli.generate_dashboard, None, "external.html", external_assets=True)
+
+        html = (self.root / "dash.html").read_text(encoding="utf-8")
+        self.assertEqual(html.count("function sortTable("), 1)
+        self.assertEqual(html.count(".collapsible-table summary {"), 1)
+        self.assertIn("collapsible-table alpha_sales-section", html)
+
+        external = (self.root / "external.html").read_text(encoding="utf-8")
+        self.assertNotIn("function sortTable(", external)
+        self.assertEqual(len(list(self.root.glob("assets-*.js"))), 1)
+
+    def test_dashboard_compression(self):
+        """Test --compress with and without --keep-plain"""
+        self.run_quietly(self.cli.generate_dashboard, None, "dash.html", compression="gzip")
+        self.run_quietly(self.cli.generate_dashboard, None, "both.html", compression="gzip",
+                         keep_plain=True)
+
+        self.assertFalse((self.root / "dash.html").exists())
+        with gzip.open(self.root / "dash.html.gz", "rt", encoding="utf-8") as f:
+            self.assertIn("Alpha Sales", f.read())
+        with gzip.open(self.root / "both.html.gz", "rt", encoding="utf-8") as f:
+            self.assertEqual(f.read(), (self.root / "both.html").read_text(encoding="utf-8"))
+
+    def test_dashboard_incremental_rebuild(self):
+        """Test that --cache-dir only re-renders changed datasets"""
+        cache_dir = str(self.root / "cache")
+        self.run_quietly(self.cli.generate_dashboard, None, "dash.html", cache_dir=cache_dir)
+        first = (self.root / "dash.html").read_text(encoding="utf-8")
+
+        self.write_dataset("beta_staff", {"beta_staff": [{"name": "Carol", "department": "Ops"}]})
+        with mock.patch.object(self.cli, "load_dataset", wraps=self.cli.load_dataset) as load:
+            output = self.run_quietly(self.cli.generate_dashboard, None, "dash.html", cache_dir=cache_dir)
+
+        second = (self.root / "dash.html").read_text(encoding="utf-8")
+        load.assert_called_once_with("beta_staff")
+        self.assertIn("Reused 1 cached section(s), rendered 1", output)
+        self.assertIn(">North</td>", second)
+        self.assertIn(">Carol</td>", second)
+        self.assertNotIn(">Alice</td>", second)
+        self.assertEqual(first.count("function sortTable("), second.count("function sortTable("))
+
+    def test_list_and_preview_use_catalog(self):
+        """Test that list/preview read the catalog instead of parsing unchanged files"""
+        first = self.run_quietly(self.cli.list_datasets)
+        self.assertTrue((self.data_dir / ".catalog.json").exists())
+        self.assertNotIn(".catalog", self.make_cli().available_datasets)
+
+        with mock.patch("src.catalog.summarize_dataset") as summarize, \
+                mock.patch.object(self.cli, "load_dataset") as load_dataset:
+            second = self.run_quietly(self.cli.list_datasets)
+            preview = self.run_quietly(self.cli.preview_dataset, "beta_staff", 1)
+
+        summarize.assert_not_called()
+        load_dataset.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertIn("alpha_sales                 2 records", second)
+        self.assertIn("Columns: name (string), department (string)", preview)
+        self.assertIn("Record 1: {'name': 'Alice', 'department': 'R&D'}", preview)
+
+    def test_generate_paginated_table(self):
+        """Test the table command with --page-size"""
+        self.run_quietly(self.cli.generate_paginated_table, "alpha_sales", "sales.html", page_size=1)
+
+        self.assertTrue((self.root / "sales.html").exists())
+        page = (self.root / "sales_page_0002.html").read_text(encoding="utf-8")
+        self.assertIn("<td>South</td>", page)
+        self.assertNotIn("<td>North</td>", page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests for serving rendered documents over HTTP.
+"""
+
+import gzip
+import http.client
+import threading
+import unittest
+
+from src.serving import RenderedResponse, RenderServer, ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    """Size-bounded LRU response cache tests."""
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test that the total size stays bounded and recently used entries survive"""
+        responses = {key: RenderedResponse(key.encode() * 200) for key in "abc"}
+        size = responses["a"].size
+        cache = ResponseCache(max_bytes=size * 2)
+
+        cache.put("a", responses["a"])
+        cache.put("b", responses["b"])
+        self.assertIs(cache.get("a"), responses["a"])
+        cache.put("c", responses["c"])
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIs(cache.get("c"), responses["c"])
+        self.assertEqual(cache.current_bytes, size * 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_oversized_and_replaced_entries(self):
+        """Test that oversized responses are skipped and replacing a key frees its size"""
+        cache = ResponseCache(max_bytes=100)
+        self.assertFalse(cache.put("big", RenderedResponse(bytes(range(256)) * 10)))
+
+        small = RenderedResponse(b"x")
+        cache.put("key", small)
+        cache.put("key", small)
+        self.assertEqual(cache.current_bytes, small.size)
+        self.assertEqual(len(cache), 1)
+
+
+class TestRenderServer(unittest.TestCase):
+    """HTTP behaviour tests against a server on a free local port."""
+
+    def setUp(self):
+        self.version = 1
+        self.renders = 0
+        self.server = RenderServer(("127.0.0.1", 0), self.resolve, quiet=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def resolve(self, path, params):
+        if path == "/broken":
+            return ("broken",), lambda: 1 / 0
+        if path != "/page":
+            return None
+        version = self.version
+
+        def render():
+            self.renders += 1
+            return f"<p>version {version} {params.get('q', [''])[0]}</p>".encode("utf-8")
+        return ("page", version, tuple(params.get("q", []))), render
+
+    def request(self, path, method="GET", **headers):
+        connection = http.client.HTTPConnection(*self.server.server_address[:2])
+        connection.request(method, path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    def test_cached_render_etag_and_304(self):
+        """Test that responses are rendered once and revalidated with 304"""
+        response, body = self.request("/page?q=a")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"<p>version 1 a</p>")
+        etag = response.getheader("ETag")
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+
+        response, body = self.request("/page?q=a", **{"If-None-Match": f'"other", {etag}'})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+        self.assertEqual(response.getheader("ETag"), etag)
+        self.assertEqual(self.renders, 1)
+
+        # New data: the old ETag no longer matches
+        self.version = 2
+        response, body = self.request("/page?q=a", **{"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"<p>version 2 a</p>")
+        self.assertNotEqual(response.getheader("ETag"), etag)
+
+    def test_gzip_negotiation(self):
+        """Test gzip responses, refused gzip, and HEAD requests"""
+        response, body = self.request("/page", **{"Accept-Encoding": "br, gzip;q=0.8"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), b"<p>version 1 </p>")
+        self.assertTrue(response.getheader("ETag").endswith('-gzip"'))
+
+        response, body = self.request("/page", **{"Accept-Encoding": "gzip;q=0"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(body, b"<p>version 1 </p>")
+
+        response, body = self.request("/page", method="HEAD")
+        self.assertEqual(response.getheader("Content-Length"), str(len(b"<p>version 1 </p>")))
+        self.assertEqual(body, b"")
+
+    def test_errors_and_warm_up(self):
+        """Test 404 and 500 responses and warming the cache"""
+        self.assertEqual(self.request("/missing")[0].status, 404)
+        self.assertEqual(self.request("/broken")[0].status, 500)
+
+        self.assertEqual(self.server.warm(["/page?q=x", "/missing"]), ["/missing"])
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(self.request("/page?q=x")[1], b"<p>version 1 x</p>")
+        self.assertEqual(self.renders, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,288 @@
+"""
+Tests for the streaming row sources.
+"""
+
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.sources import (CSVReader, CursorReader, JSONArrayReader, JSONLinesReader,
+                         file_dataset_name, is_csv, is_json_lines, iter_csv_rows, iter_cursor_rows,
+                         iter_json_lines, iter_json_records, load_file, open_input)
+from src.table_generator import TableGenerator
+
+
+class TestJSONArrayReader(unittest.TestCase):
+    """Streaming JSON array reader tests."""
+
+    RECORDS = [
+        {"name": "Alice", "age": 30, "tags": ["a", "b"], "note": "x ] } , \" y"},
+        {"name": "Bob", "age": 12345678901234567890, "score": -1.5e3},
+        {"name": "Ünïcode ✓", "age": None, "nested": {"a": [1, {"b": []}]}}
+    ]
+
+    def read(self, text, buffer_size=3, **kwargs):
+        return list(iter_json_records(io.StringIO(text), buffer_size=buffer_size, **kwargs))
+
+    def test_records_match_json_load(self):
+        """Test that tiny and large buffers give the same records as json.load"""
+        text = json.dumps({"people": self.RECORDS}, indent=2)
+        for buffer_size in (1, 2, 7, 1024):
+            self.assertEqual(self.read(text, buffer_size), self.RECORDS)
+
+    def test_numbers_split_across_reads(self):
+        """Test that a number cut at a buffer boundary is not truncated"""
+        text = '[1234567, 89, 1e10, true, null]'
+        for buffer_size in range(1, 12):
+            self.assertEqual(self.read(text, buffer_size), [1234567, 89, 1e10, True, None])
+
+    def test_top_level_array_and_key(self):
+        """Test bare arrays, the only member, and a selected member"""
+        self.assertEqual(self.read(' [ ] '), [])
+        self.assertEqual(self.read('[{"a": 1}]'), [{"a": 1}])
+        self.assertEqual(self.read(' { "only" : [ ] } '), [])
+
+        reader = JSONArrayReader(io.StringIO('{"only": [1, 2]}'), buffer_size=4)
+        with reader:
+            self.assertEqual(reader.key, "only")
+            self.assertEqual(list(reader), [1, 2])
+        self.assertEqual(reader.count, 2)
+
+        text = '{"first": [1, 2], "second": [3]}'
+        self.assertEqual(self.read(text, key="first"), [1, 2])
+
+        text = '{"meta": {"rows": [9]}, "rows": [3, 4]}'
+        self.assertEqual(self.read(text, key="rows"), [3, 4])
+
+    def test_errors(self):
+        """Test malformed documents and documents without an array"""
+        for text in ('{"kpi": {"a": 1}}', '{}', '"text"', '[1, 2', '[1 2]', ''):
+            with self.assertRaises(ValueError, msg=text):
+                self.read(text)
+        with self.assertRaises(ValueError):
+            self.read('{"a": [1]}', key="b")
+
+    def test_data_after_implicit_array(self):
+        """Test that an implicitly picked array must be the whole document"""
+        for text in ('{"emp": [{"a": 1}, {"a": 2}], "oops": ', '{"records": [1], "meta": {}}',
+                     '{"emp": [1]} x', '[1, 2] [3]', '[1]]', '{"emp": [1]'):
+            with self.assertRaises(ValueError, msg=text):
+                self.read(text)
+
+        for text, other_members in (('{"records": [1], "meta": {}}', True), ('{"emp": [1]} x', False)):
+            reader = JSONArrayReader(io.StringIO(text))
+            with self.assertRaises(ValueError):
+                list(reader)
+            self.assertEqual(reader.other_members, other_members)
+
+    def test_binary_stream_and_path(self):
+        """Test reading from a binary stream and from a file path"""
+        text = json.dumps({"people": self.RECORDS})
+        self.assertEqual(list(iter_json_records(io.BytesIO(text.encode("utf-8")))), self.RECORDS)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "people.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            reader = JSONArrayReader(path)
+            self.assertEqual(list(reader), self.RECORDS)
+            self.assertIsNone(reader._stream)
+
+    def test_streamed_table_matches_in_memory_table(self):
+        """Test rendering a streamed array gives the in-memory table"""
+        rows = [{"id": i, "name": f"row {i}"} for i in range(50)]
+        text = json.dumps({"rows": rows})
+        generator = TableGenerator(striped=True)
+
+        streamed = ''.join(generator.iter_table(iter_json_records(io.StringIO(text), buffer_size=16)))
+        self.assertEqual(streamed, generator.generate_table(rows))
+
+
+class TestJSONLinesReader(unittest.TestCase):
+    """Streaming JSON Lines reader tests."""
+
+    def test_records_across_batches(self):
+        """Test that small and large batches give every record, skipping blank lines"""
+        records = [{"id": i, "text": "line\nbreak" if i % 3 else ""} for i in range(25)]
+        text = "\n".join(json.dumps(record) for record in records) + "\n\n  \r\n"
+        for buffer_size in (1, 40, 1024 * 1024):
+            self.assertEqual(list(iter_json_lines(io.StringIO(text), buffer_size)), records)
+
+    def test_invalid_line_reports_line_number(self):
+        """Test that an invalid line or a line with several values is reported"""
+        for text in ('{"a": 1}\n\n{"a": \n', '{"a": 1}\n\n1, 2\n'):
+            with self.assertRaisesRegex(ValueError, "line 3"):
+                list(iter_json_lines(io.StringIO(text)))
+
+    def test_load_file(self):
+        """Test loading JSON Lines files in the dataset shape"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "events.ndjson")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"a": 1}\n{"a": 2}\n')
+            self.assertEqual(load_file(path), {"events": [{"a": 1}, {"a": 2}]})
+
+
+class TestCSVReader(unittest.TestCase):
+    """Streaming CSV / TSV reader tests."""
+
+    def test_rows_render_like_csv_like_lists(self):
+        """Test that streamed CSV renders like the equivalent list of lists"""
+        text = 'name,note\r\nAlice,"multi\nline, quoted"\r\nBob,<b>\r\n'
+        rows = list(iter_csv_rows(io.StringIO(text, newline='')))
+        self.assertEqual(rows, [["name", "note"], ["Alice", "multi\nline, quoted"], ["Bob", "<b>"]])
+
+        generator = TableGenerator(striped=True)
+        streamed = ''.join(generator.iter_table(iter_csv_rows(io.StringIO(text, newline=''))))
+        self.assertEqual(streamed, generator.generate_table(rows))
+
+    def test_dialects_and_header_handling(self):
+        """Test dialect selection, format overrides and header options"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "people.tsv")
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write("a\tb\n1\t2\n")
+            self.assertEqual(list(iter_csv_rows(path)), [["a", "b"], ["1", "2"]])
+            self.assertEqual(load_file(path), {"people": [{"a": "1", "b": "2"}]})
+
+        semicolons = io.StringIO("1;2;3\n4;5\n")
+        reader = CSVReader(semicolons, header=False, delimiter=";")
+        self.assertEqual(list(reader), [["Column 1", "Column 2", "Column 3"], ["1", "2", "3"], ["4", "5"]])
+        self.assertEqual(reader.count, 2)
+
+        renamed = iter_csv_rows(io.StringIO("a,b\n1,2\n"), fieldnames=["x", "y"])
+        self.assertEqual(list(renamed), [["x", "y"], ["1", "2"]])
+        self.assertEqual(list(iter_csv_rows(io.StringIO(""))), [])
+
+    def test_invalid_csv(self):
+        """Test that csv errors are reported as ValueError"""
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            list(iter_csv_rows(io.StringIO('a\n"x"y\n'), strict=True))
+        with self.assertRaises(ValueError):
+            list(iter_csv_rows(io.StringIO('a\n'), dialect="no-such-dialect"))
+
+
+class TestCompressedInputs(unittest.TestCase):
+    """Compressed input tests for every supported codec."""
+
+    CODECS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp_dir.name, name)
+        suffix = os.path.splitext(name)[1]
+        opener = self.CODECS.get(suffix, open)
+        with opener(path, "wt", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_names_and_formats(self):
+        """Test that compression suffixes are looked through"""
+        self.assertEqual(file_dataset_name("data/events.jsonl.xz"), "events")
+        self.assertEqual(file_dataset_name("data/sales.json"), "sales")
+        self.assertTrue(is_json_lines("events.NDJSON.gz"))
+        self.assertTrue(is_csv("orders.tsv.bz2"))
+        self.assertFalse(is_csv("orders.json.gz"))
+
+    def test_readers_decompress(self):
+        """Test every reader on every codec, with and without a decompression thread"""
+        records = [{"id": i, "name": f"row {i}"} for i in range(200)]
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        table = "id\tname\n" + "".join(f"{i}\trow {i}\n" for i in range(200))
+        for suffix in self.CODECS:
+            array_path = self.write(f"rows.json{suffix}", json.dumps({"rows": records}))
+            lines_path = self.write(f"rows.jsonl{suffix}", lines)
+            tsv_path = self.write(f"rows.tsv{suffix}", table)
+            for threaded in (False, True):
+                with self.subTest(suffix=suffix, threaded=threaded):
+                    self.assertEqual(list(JSONArrayReader(array_path, buffer_size=64,
+                                                          threaded=threaded)), records)
+                    self.assertEqual(list(JSONLinesReader(lines_path, buffer_size=64,
+                                                          threaded=threaded)), records)
+                    rows = list(CSVReader(tsv_path, buffer_size=64, threaded=threaded))
+                    self.assertEqual(rows[0], ["id", "name"])
+                    self.assertEqual(rows[200], ["199", "row 199"])
+            self.assertEqual(load_file(lines_path), {"rows": records})
+            self.assertEqual(load_file(array_path), {"rows": records})
+
+    def test_threaded_reader(self):
+        """Test read-ahead results, error propagation and closing before the end"""
+        path = self.write("data.bin.gz", "x" * 100_000)
+        with open_input(path, threaded=True, buffer_size=1000) as stream:
+            self.assertEqual(stream.read(), b"x" * 100_000)
+
+        with open_input(path, threaded=True, buffer_size=10) as stream:
+            self.assertEqual(stream.read(5), b"xxxxx")
+
+        broken = os.path.join(self.tmp_dir.name, "broken.json.gz")
+        with open(broken, "wb") as f:
+            f.write(b"not gzip data")
+        with self.assertRaises(OSError):
+            list(JSONArrayReader(broken, threaded=True))
+
+
+class TestCursorReader(unittest.TestCase):
+    """DB-API cursor source tests using an in-memory SQLite database."""
+
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE orders (id INTEGER, item TEXT, price REAL)")
+        self.connection.executemany("INSERT INTO orders VALUES (?, ?, ?)",
+                                    [(i, f"item <{i}>", i * 1.5 if i % 2 else None) for i in range(25)])
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_batches_render_like_records(self):
+        """Test that fetchmany batches render like the fetched dictionaries"""
+        cursor = self.connection.execute("SELECT * FROM orders ORDER BY id")
+        fetched = []
+        original_fetchmany = cursor.fetchmany
+
+        class CountingCursor:
+            description = cursor.description
+
+            def fetchmany(self, size):
+                fetched.append(size)
+                return original_fetchmany(size)
+
+        reader = CursorReader(CountingCursor(), arraysize=10)
+        generator = TableGenerator(striped=True)
+        streamed = ''.join(generator.iter_table(reader))
+
+        records = [dict(zip(("id", "item", "price"), row))
+                   for row in self.connection.execute("SELECT * FROM orders ORDER BY id")]
+        self.assertEqual(streamed, generator.generate_table(records))
+        self.assertEqual(fetched, [10, 10, 10, 10])
+        self.assertEqual(reader.count, 25)
+
+    def test_empty_result_and_statements_without_rows(self):
+        """Test an empty result set and a statement that returns no rows"""
+        rows = list(iter_cursor_rows(self.connection.execute("SELECT id FROM orders WHERE id < 0")))
+        self.assertEqual(rows, [["id"]])
+
+        with self.assertRaises(ValueError):
+            list(iter_cursor_rows(self.connection.execute("UPDATE orders SET price = 0")))
+
+    def test_close_closes_cursor_and_connection(self):
+        """Test that close() releases the cursor and an owned connection"""
+        connection = sqlite3.connect(":memory:")
+        with CursorReader(connection.execute("SELECT 1 AS one"), connection=connection) as reader:
+            self.assertEqual(list(reader), [["one"], (1,)])
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,27 @@
+import asyncio
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import tempfile
+import pickle
+import re
+import threading
+import time
 import unittest
-from src.table_generator import TableGenerator
+import warnings
+from array import array, typecodes
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from src import table_generator
+from src.table_generator import AssetRegistry, TableGenerator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class TestTableGenerator(unittest.TestCase):
 
@@ -240,6 +262,37 @@ class TestTableGenerator(unittest.TestCase):
         self.assertIn('<th', result)
         self.assertIn('<td', result)
 
+    def test_sortable_table_sort_types(self):
+        """Test that numeric columns are typed for the client-side sort"""
+        data = [
+            {'Name': 'Alice', 'Age': 30, 'Score': None},
+            {'Name': 'Bob', 'Age': 25.5, 'Score': 'n/a'}
+        ]
+        
+        result = TableGenerator(sortable=True).generate_table(data)
+        
+        self.assertIn('<th data-sort-type="number">Age</th>', result)
+        self.assertIn('<th>Name</th>', result)
+        self.assertIn('<th>Score</th>', result)
+        self.assertNotIn('data-sort-type', TableGenerator().generate_table(data))
+
+    def test_sortable_table_sort_types_other_inputs(self):
+        """Test sort types for CSV-like and column-oriented input"""
+        generator = TableGenerator(sortable=True)
+        csv_data = [['Name', 'Age'], ['Alice', 30], ['Bob', 25]]
+        columns = {'Name': ['Alice', 'Bob'], 'Age': array('i', [30, 25])}
+        
+        self.assertIn('<th data-sort-type="number">Age</th>', generator.generate_table(csv_data))
+        self.assertIn('<th data-sort-type="number">Age</th>', generator.generate_columns(columns))
+
+    def test_sortable_javascript_uses_precomputed_keys(self):
+        """Test that the sort script parses cells once and reattaches rows in one batch"""
+        script = TableGenerator(sortable=True)._render_javascript()
+        
+        self.assertIn('getSortKeys', script)
+        self.assertIn('createDocumentFragment', script)
+        self.assertIn('dataset.sortType', script)
+
     def test_non_sortable_table_no_javascript(self):
         """Test that non-sortable tables don't include JavaScript"""
         data = {'Name': 'Alice', 'Age': 30}
@@ -449,6 +502,36 @@ class TestTableGenerator(unittest.TestCase):
         self.assertIn('<td>95.5</td>', result)
         self.assertIn('<td></td>', result)  # None values
 
+    def test_csv_like_data_matches_dictionary_rendering(self):
+        """Test that positional rendering matches the dictionary conversion"""
+        csv_data = [
+            ['Name', 'Age', 'City'],
+            ['Alice', 30],
+            ['Bob', 25, 'Paris', 'extra'],
+            ('Carol', 35, 'Rome')
+        ]
+        generator = TableGenerator(striped=True, headers_order=['City'])
+        expected = generator.generate_table(generator._convert_csv_to_dicts(csv_data))
+        
+        self.assertEqual(generator.generate_table(csv_data), expected)
+        self.assertNotIn('extra', expected)
+        
+        duplicated = [['a', 'b', 'a'], [1, 2, 3]]
+        for generator in (TableGenerator(), TableGenerator(headers_order=['b'])):
+            expected = generator.generate_table(generator._convert_csv_to_dicts(duplicated))
+            self.assertEqual(generator.generate_table(duplicated), expected)
+            self.assertEqual(''.join(generator.iter_table(iter(duplicated))), expected)
+            self.assertEqual(expected.count('<th>a</th>'), 1)
+            self.assertNotIn('<td>1</td>', expected)
+
+    def test_csv_like_data_explicit_headers(self):
+        """Test streaming CSV-like rows with an explicit header subset"""
+        rows = iter([('Name', 'Age', 'City'), ('Alice', 30, 'Paris')])
+        result = ''.join(self.table_generator.iter_table(rows, headers=['City', 'Missing']))
+        
+        self.assertIn('<td>Paris</td>\n      <td></td>', result)
+        self.assertNotIn('Alice', result)
+
     # Collapsible table tests
     def test_make_collapsible_basic(self):
         """Test basic collapsible table functionality"""
@@ -539,5 +622,723 @@ class TestTableGenerator(unittest.TestCase):
         # Should be different (though we can't easily test unique IDs without parsing)
         self.assertNotEqual(collapsible1, collapsible2)
 
+    # Streaming tests
+    def test_iter_table_matches_generate_table(self):
+        """Test that joined chunks equal the generate_table output"""
+        data = [{'ID': i, 'Name': f'User <{i}>'} for i in range(200)]
+        generator = TableGenerator(table_class='stream', striped=True)
+        
+        chunks = list(generator.iter_table(data, chunk_size=256))
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), generator.generate_table(data))
+
+    def test_iter_table_accepts_generators(self):
+        """Test streaming rows from a generator of dictionaries"""
+        rows = ({'ID': i, 'Name': f'User{i}'} for i in range(50))
+        result = ''.join(self.table_generator.iter_table(rows))
+        
+        self.assertIn('<th>ID</th>', result)
+        self.assertIn('<td>User49</td>', result)
+        self.assertEqual(result.count('<tr>'), 51)
+
+    def test_iter_table_generator_csv_like(self):
+        """Test streaming CSV-like rows where the first row holds headers"""
+        rows = iter([('Name', 'Age'), ('Alice', 30), ('Bob',)])
+        result = ''.join(self.table_generator.iter_table(rows))
+        
+        self.assertIn('<th>Age</th>', result)
+        self.assertIn('<td>30</td>', result)
+        self.assertIn('<td></td>', result)
+
+    def test_iter_table_explicit_headers(self):
+        """Test that explicit headers skip discovery"""
+        rows = iter([{'a': 1, 'b': 2, 'c': 3}])
+        result = ''.join(self.table_generator.iter_table(rows, headers=['c', 'a']))
+        
+        self.assertLess(result.find('<th>c</th>'), result.find('<th>a</th>'))
+        self.assertNotIn('<th>b</th>', result)
+
+    def test_iter_table_invalid_input(self):
+        """Test error handling for unsupported streaming input"""
+        with self.assertRaises(ValueError):
+            self.table_generator.iter_table("invalid input")
+        
+        with self.assertRaises(ValueError):
+            self.table_generator.iter_table([], chunk_size=0)
+
+    def test_write_table_to_text_and_binary_streams(self):
+        """Test writing a table directly to text and binary streams"""
+        data = [{'Name': 'José', 'Score': i} for i in range(100)]
+        expected = self.table_generator.generate_table(data)
+        
+        text_stream = io.StringIO()
+        self.table_generator.write_table(data, text_stream, chunk_size=128)
+        self.assertEqual(text_stream.getvalue(), expected)
+        
+        binary_stream = io.BytesIO()
+        self.table_generator.write_table(data, binary_stream)
+        self.assertEqual(binary_stream.getvalue().decode('utf-8'), expected)
+
+    def test_write_document_matches_render_html(self):
+        """Test that write_document produces the render_html document"""
+        data = [{'Product': 'Laptop', 'Price': 999}, {'Product': 'Mouse', 'Price': 25}]
+        generator = TableGenerator(sortable=True, striped=True)
+        expected = generator.render_html(generator.generate_table(data),
+                                         title="Products", css="body { margin: 0; }")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'products.html')
+            generator.write_document(generator.iter_table(data), path,
+                                     title="Products", css="body { margin: 0; }")
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), expected)
+
+    def test_failed_write_keeps_previous_file(self):
+        """Test that an error mid-stream leaves the existing output intact"""
+        def failing_rows():
+            for i in range(5000):
+                yield {'ID': i}
+            raise ValueError("Invalid JSON on line 5001")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'report.html')
+            self.table_generator.write_table([{'ID': 1}], path)
+            with open(path, encoding='utf-8') as f:
+                previous = f.read()
+            
+            for compression, sidecar in ((None, False), ('gzip', True)):
+                with self.assertRaises(ValueError):
+                    self.table_generator.write_table(failing_rows(), path, chunk_size=1024,
+                                                     compression=compression, sidecar=sidecar)
+                with open(path, encoding='utf-8') as f:
+                    self.assertEqual(f.read(), previous)
+                self.assertEqual(os.listdir(tmp_dir), ['report.html'])
+
+    def test_atomic_write_replaces_file_and_cleans_up_on_failure(self):
+        """Test writing text and bytes, and that a failed replace keeps the old file"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'entry.json')
+            table_generator._atomic_write(path, "first ✓")
+            table_generator._atomic_write(path, b"second")
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b"second")
+            
+            with mock.patch.object(table_generator.os, 'replace', side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    table_generator._atomic_write(path, "third")
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b"second")
+            self.assertEqual(os.listdir(tmp_dir), ['entry.json'])
+
+    def test_write_table_invalid_target(self):
+        """Test error handling for targets that cannot be written to"""
+        with self.assertRaises(ValueError):
+            self.table_generator.write_table({'Name': 'Alice'}, 123)
+
+    # Render plan tests
+    def test_render_plan_reused_for_same_shape(self):
+        """Test that repeated renders with the same headers reuse the compiled plan"""
+        generator = TableGenerator(striped=True)
+        generator.generate_table([{'a': 1, 'b': 2}])
+        generator.generate_table([{'a': 3, 'b': 4}])
+        self.assertEqual(len(generator._plan_cache), 1)
+        
+        # Changing the configuration must not reuse the stale plan
+        generator.styles = {'td': 'color: red;'}
+        result = generator.generate_table([{'a': 5, 'b': 6}])
+        self.assertIn('<td style="color: red;">5</td>', result)
+        self.assertEqual(len(generator._plan_cache), 2)
+
+    def test_render_plan_with_braces_in_styles(self):
+        """Test that braces in static markup do not break row templates"""
+        generator = TableGenerator(styles={'td': 'content: "{x}";'}, striped=True)
+        result = generator.generate_table([{'Name': '{Alice}'}, {'Name': 'Bob'}])
+        
+        self.assertIn('<td style="content: "{x}";">{Alice}</td>', result)
+        self.assertIn('<tr class="odd">', result)
+
+    # Columnar input tests
+    def test_generate_columns_matches_row_output(self):
+        """Test that columnar input renders the same table as the equivalent rows"""
+        columns = {
+            'Name': ['Alice', 'Bob <admin>', None],
+            'Age': array('i', [30, 25, 41]),
+            'Score': [95.5, 87, True]
+        }
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        generator = TableGenerator(striped=True, headers_order=['Score', 'Name', 'Age'])
+        
+        result = generator.generate_columns(columns)
+        
+        self.assertEqual(result, generator.generate_table(rows))
+        self.assertIn('<td>Bob &lt;admin&gt;</td>', result)
+
+    def test_character_arrays_are_escaped(self):
+        """Test that unicode arrays ('u', and 'w' on Python 3.13+) are escaped, not fast-pathed"""
+        for typecode in (code for code in ('u', 'w') if code in typecodes):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', DeprecationWarning)
+                values = array(typecode, '<x')
+            result = self.table_generator.generate_columns({'a': values})
+            self.assertIn('<td>&lt;</td>', result, msg=typecode)
+            self.assertNotIn('<td><</td>', result, msg=typecode)
+
+    def test_iter_columns_blocks_and_chunks(self):
+        """Test streaming columnar data across several column batches"""
+        columns = {'ID': list(range(100)), 'Value': array('d', [i / 4 for i in range(100)])}
+        chunks = list(self.table_generator.iter_columns(columns, chunk_size=200, block_size=7))
+        
+        result = ''.join(chunks)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(result.count('<tr>'), 101)
+        self.assertIn('<td>24.75</td>', result)
+
+    def test_generate_columns_length_mismatch(self):
+        """Test error handling for columns of different lengths"""
+        with self.assertRaises(ValueError):
+            self.table_generator.generate_columns({'a': [1, 2], 'b': [1]})
+        
+        with self.assertRaises(ValueError):
+            self.table_generator.generate_columns([[1, 2]])
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_generate_columns_numpy_arrays(self):
+        """Test rendering NumPy arrays with the same formatting as Python values"""
+        columns = {'Count': numpy.arange(3), 'Ratio': numpy.array([0.1, 2.5, 3.0]),
+                   'Label': numpy.array(['a&b', 'c', 'd'], dtype=object)}
+        result = self.table_generator.generate_columns(columns)
+        
+        self.assertIn('<td>2</td>', result)
+        self.assertIn('<td>0.1</td>', result)
+        self.assertIn('<td>a&amp;b</td>', result)
+
+    # Escaping tests
+    def test_escape_specialized_types(self):
+        """Test that escaping keeps the output of html.escape(str(value))"""
+        from enum import IntEnum
+        
+        class Level(IntEnum):
+            LOW = 1
+            
+            def __str__(self):
+                return '<low>'
+        
+        escape = self.table_generator._escape_html
+        self.assertEqual(escape(None), '')
+        self.assertEqual(escape(42), '42')
+        self.assertEqual(escape(2.5), '2.5')
+        self.assertEqual(escape(True), 'True')
+        self.assertEqual(escape('plain text'), 'plain text')
+        self.assertEqual(escape('Café & "Bar"'), 'Café &amp; &quot;Bar&quot;')
+        self.assertEqual(escape("it's"), 'it&#x27;s')
+        self.assertEqual(escape(Level.LOW), '&lt;low&gt;')
+
+    def test_escape_cache_counters(self):
+        """Test that repeated strings needing escaping hit the LRU cache"""
+        generator = TableGenerator(escape_cache_size=2)
+        data = [{'Dept': 'R&D', 'City': 'Zürich', 'ID': i} for i in range(10)]
+        result = generator.generate_table(data)
+        
+        info = generator.escape_cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 18)
+        self.assertEqual(info.maxsize, 2)
+        self.assertIn('<td>R&amp;D</td>', result)
+
+    # Header discovery tests
+    def test_headers_first_seen_order(self):
+        """Test that headers are discovered in deterministic first-seen order"""
+        data = [
+            {'Name': 'Alice', 'Age': 30},
+            {'City': 'Paris', 'Name': 'Bob'},
+            {'Zip': '75001', 'Age': 25}
+        ]
+        result = self.table_generator.generate_table(data)
+        
+        positions = [result.find(f'<th>{name}</th>') for name in ('Name', 'Age', 'City', 'Zip')]
+        self.assertEqual(positions, sorted(positions))
+        self.assertNotIn(-1, positions)
+
+    def test_header_sample_ignores_late_keys(self):
+        """Test that header_sample only uses the first N rows for the schema"""
+        data = [{'a': 1}, {'a': 2}, {'a': 3, 'late': 'x'}]
+        generator = TableGenerator(header_sample=2)
+        result = generator.generate_table(data)
+        
+        self.assertNotIn('late', result)
+        self.assertIn('<td>3</td>', result)
+
+    def test_header_sample_append_policy(self):
+        """Test that late keys can be appended as new columns"""
+        rows = iter([{'a': 1}, {'a': 2, 'late': 'x'}, {'a': 3}])
+        generator = TableGenerator(late_keys='append')
+        result = ''.join(generator.iter_table(rows))
+        
+        self.assertIn('<td>x</td>', result)
+        self.assertIn('<tfoot>', result)
+        self.assertEqual(result.count('<th>late</th>'), 1)
+        self.assertLess(result.find('</tbody>'), result.find('<tfoot>'))
+
+    def test_iterator_late_keys_appended_by_default(self):
+        """Test that iterators do not drop keys missing from the first row"""
+        result = ''.join(TableGenerator().iter_table(iter([{'a': 1}, {'a': 2, 'late': 'x'}])))
+        
+        self.assertIn('<td>x</td>', result)
+        self.assertEqual(result.count('<th>late</th>'), 1)
+        
+        ignored = ''.join(TableGenerator(late_keys='ignore').iter_table(iter([{'a': 1}, {'late': 'x'}])))
+        self.assertNotIn('late', ignored)
+
+    def test_header_sample_error_policy(self):
+        """Test that late keys can be rejected"""
+        data = [{'a': 1}, {'a': 2}, {'b': 3}]
+        generator = TableGenerator(header_sample=2, late_keys='error')
+        
+        with self.assertRaises(ValueError):
+            generator.generate_table(data)
+        
+        with self.assertRaises(ValueError):
+            TableGenerator(late_keys='unknown')
+
+    # Pagination tests
+    def test_write_pages_splits_rows(self):
+        """Test writing a streamed table as several linked pages"""
+        rows = ({'ID': i, 'Name': f'User{i}'} for i in range(25))
+        generator = TableGenerator(striped=True)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_path, page_paths = generator.write_pages(rows, tmp_dir, page_size=10,
+                                                           basename='users', title='Users')
+            pages = []
+            for path in page_paths:
+                with open(path, encoding='utf-8') as f:
+                    pages.append(f.read())
+            with open(index_path, encoding='utf-8') as f:
+                index_html = f.read()
+        
+        self.assertEqual([os.path.basename(path) for path in page_paths],
+                         ['users_page_0001.html', 'users_page_0002.html', 'users_page_0003.html'])
+        self.assertEqual([page.count('<tr class=') for page in pages], [10, 10, 5])
+        self.assertIn('<th>Name</th>', pages[2])
+        self.assertIn('<td>User24</td>', pages[2])
+        self.assertIn('href="users_page_0002.html" rel="next"', pages[0])
+        self.assertNotIn('rel="next"', pages[2])
+        self.assertIn('rows 21–25', index_html)
+        self.assertEqual(os.path.basename(index_path), 'users.html')
+
+    def test_write_pages_empty_data(self):
+        """Test that empty data still produces one page and an index"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_path, page_paths = self.table_generator.write_pages([], tmp_dir)
+            
+            self.assertEqual(len(page_paths), 1)
+            self.assertTrue(os.path.exists(index_path))
+            with open(index_path, encoding='utf-8') as f:
+                index_html = f.read()
+            self.assertIn('<span class="page-rows">no rows</span>', index_html)
+            self.assertNotIn('rows 1–0', index_html)
+        
+        with self.assertRaises(ValueError):
+            self.table_generator.write_pages([], '.', page_size=0)
+
+    # Parallel rendering tests
+    @mock.patch.object(table_generator, 'PARALLEL_BATCH_ROWS', 7)
+    @mock.patch.object(table_generator, 'PARALLEL_MIN_ROWS', 20)
+    def test_parallel_rendering_matches_serial(self):
+        """Test that multi-process rendering keeps row order and stripe parity"""
+        data = [{'ID': i, 'Name': f'User <{i}>'} for i in range(45)]
+        csv_data = [['ID', 'Name']] + [[i, f'User {i}'] for i in range(45)]
+        generator = TableGenerator(striped=True)
+        
+        self.assertEqual(generator.generate_table(data, workers=2), generator.generate_table(data))
+        self.assertEqual(''.join(generator.iter_table(iter(csv_data), workers=2)),
+                         generator.generate_table(csv_data))
+
+    def test_parallel_rendering_below_threshold(self):
+        """Test that small tables are rendered without starting a process pool"""
+        data = [{'ID': i} for i in range(10)]
+        
+        with mock.patch.object(table_generator, 'ProcessPoolExecutor') as pool:
+            result = self.table_generator.generate_table(data, workers=4)
+        
+        pool.assert_not_called()
+        self.assertEqual(result, self.table_generator.generate_table(data))
+
+    def test_parallel_rendering_does_not_fork(self):
+        """Test that render workers are not forked from a possibly multi-threaded process"""
+        with mock.patch.object(table_generator, 'ProcessPoolExecutor') as pool:
+            table_generator._process_pool(2)
+        
+        self.assertIn(pool.call_args.kwargs['mp_context'].get_start_method(), ('forkserver', 'spawn'))
+
+    def test_generator_pickle_roundtrip(self):
+        """Test that generators can be sent to worker processes"""
+        generator = TableGenerator(table_class='report', striped=True, escape_cache_size=16)
+        generator.generate_table({'Name': 'R&D'})
+        
+        clone = pickle.loads(pickle.dumps(generator))
+        
+        self.assertEqual(clone.generate_table({'Name': 'R&D'}), generator.generate_table({'Name': 'R&D'}))
+        self.assertEqual(clone.escape_cache_info().maxsize, 16)
+
+    # Virtual scrolling tests
+    def _virtual_payload(self, html):
+        start = html.index('class="virtual-table-data">') + len('class="virtual-table-data">')
+        return json.loads(html[start:html.index('</script>', start)])
+
+    def test_virtual_table_payload(self):
+        """Test that virtual tables ship rows as a columnar JSON payload"""
+        data = [{'Name': 'Alice', 'Age': 30, 'Score': 1.5},
+                {'Name': 'Bob', 'Age': None, 'Score': 2.0}]
+        generator = TableGenerator(virtual=True, headers_order=['Name', 'Age', 'Score'])
+        
+        result = generator.generate_table(data)
+        payload = self._virtual_payload(result)
+        
+        self.assertIn('<div class="virtual-table"', result)
+        self.assertNotIn('<td>', result)
+        self.assertEqual(payload['rows'], 2)
+        self.assertEqual(payload['columns'], [['Alice', 'Bob'], [30, ''], ['1.5', '2.0']])
+        self.assertEqual(payload['dictionaries'], {})
+
+    def test_virtual_table_dictionary_encoding_and_escaping(self):
+        """Test that repeated strings are dictionary-encoded and script-safe"""
+        data = [{'Tag': '</script>&'}] * 3 + [{'Tag': 'plain'}]
+        
+        result = TableGenerator(virtual=True).generate_table(data)
+        payload = self._virtual_payload(result)
+        
+        self.assertEqual(result.count('</script>'), 1)
+        self.assertEqual(payload['columns'], [[0, 0, 0, 1]])
+        self.assertEqual(payload['dictionaries'], {'0': ['</script>&', 'plain']})
+
+    def test_virtual_table_inputs_match(self):
+        """Test that CSV-like and column-oriented input give the same virtual table"""
+        generator = TableGenerator(virtual=True)
+        
+        from_rows = generator.generate_table([['Name', 'Age'], ['Alice', 30], ['Bob', 25]])
+        from_columns = generator.generate_columns({'Name': ['Alice', 'Bob'], 'Age': [30, 25]})
+        
+        self.assertEqual(from_rows, from_columns)
+
+    def test_virtual_table_document_scripts(self):
+        """Test that virtual documents include the virtual and sort scripts"""
+        generator = TableGenerator(virtual=True, sortable=True)
+        
+        result = generator.render_html(generator.generate_table([{'Name': 'Alice'}]))
+        
+        self.assertIn('initializeVirtualTables', result)
+        self.assertIn('table._virtualTable', result)
+        self.assertIn('.virtual-table thead th', result)
+
+    # Server-side sorting tests
+    def _first_column(self, html):
+        return re.findall(r'<tr[^>]*>\n\s*<td[^>]*>(.*?)</td>', html)
+
+    def test_sort_by_natural_and_numeric_order(self):
+        """Test typed multi-key sorting with missing values last"""
+        data = [
+            {'ID': 'EMP10', 'Salary': 5000},
+            {'ID': 'EMP2', 'Salary': None},
+            {'ID': 'emp1', 'Salary': 9000},
+            {'ID': 'EMP3', 'Salary': 5000}
+        ]
+        generator = TableGenerator(headers_order=['ID', 'Salary'])
+        
+        by_id = generator.generate_table(data, sort_by=[('ID', 'asc')])
+        by_salary = generator.generate_table(data, sort_by=[('Salary', 'desc'), ('ID', 'asc')])
+        
+        self.assertEqual(self._first_column(by_id), ['emp1', 'EMP2', 'EMP3', 'EMP10'])
+        self.assertEqual(self._first_column(by_salary), ['emp1', 'EMP3', 'EMP10', 'EMP2'])
+
+    def test_sort_by_iso_dates(self):
+        """Test that ISO 8601 strings are compared as instants"""
+        data = [
+            {'When': '2024-01-02'},
+            {'When': '2024-01-01T23:30:00-02:00'},
+            {'When': '2023-12-31T23:00:00Z'}
+        ]
+        
+        result = self.table_generator.generate_table(data, sort_by=[('When', 'asc')])
+        
+        self.assertEqual(self._first_column(result),
+                         ['2023-12-31T23:00:00Z', '2024-01-02', '2024-01-01T23:30:00-02:00'])
+
+    def test_sort_by_with_limit_matches_full_sort(self):
+        """Test that the heap-based top-N equals the head of a full stable sort"""
+        data = [{'Group': i % 3, 'Name': f'User {i % 7}', 'ID': i} for i in range(50)]
+        sort_by = [('Group', 'desc'), ('Name', 'asc')]
+        generator = TableGenerator(headers_order=['ID', 'Group', 'Name'])
+        
+        full = self._first_column(generator.generate_table(data, sort_by=sort_by))
+        top = self._first_column(generator.generate_table(data, sort_by=sort_by, limit=10))
+        
+        self.assertEqual(top, full[:10])
+        self.assertEqual(len(self._first_column(generator.generate_table(data, limit=5))), 5)
+
+    def test_sort_by_csv_data_and_streaming(self):
+        """Test sorting CSV-like rows and iter_table input"""
+        csv_data = [['Name', 'Score'], ['b', 2], ['a', 3], ['c', 1]]
+        generator = TableGenerator(collation='locale')
+        
+        result = generator.generate_table(csv_data, sort_by=[('Score', 'asc')])
+        streamed = ''.join(generator.iter_table(iter(csv_data), sort_by=[('Name', 'asc')], limit=2))
+        
+        self.assertEqual(self._first_column(result), ['c', 'b', 'a'])
+        self.assertEqual(self._first_column(streamed), ['a', 'b'])
+
+    def test_sort_by_invalid_options(self):
+        """Test validation of sort_by, limit and collation"""
+        data = [['Name'], ['a']]
+        with self.assertRaises(ValueError):
+            self.table_generator.generate_table(data, sort_by=[('Name', 'up')])
+        with self.assertRaises(ValueError):
+            self.table_generator.generate_table(data, limit=-1)
+        with self.assertRaises(ValueError):
+            self.table_generator.generate_table(data, sort_by=[('Missing', 'asc')])
+        with self.assertRaises(ValueError):
+            TableGenerator(collation='binary')
+
+    def test_sort_by_unknown_column_of_dictionary_rows(self):
+        """Test that dictionary rows reject unknown sort columns like CSV-like rows do"""
+        data = [{'a': 2}, {'a': 1}]
+        with self.assertRaisesRegex(ValueError, "Cannot sort by 'A': column not found"):
+            self.table_generator.generate_table(data, sort_by=[('A', 'asc')])
+        with self.assertRaisesRegex(ValueError, "column not found"):
+            ''.join(self.table_generator.iter_table(iter(data), sort_by=[('a', 'asc'), ('b', 'desc')], limit=1))
+        with self.assertRaisesRegex(ValueError, "column not found"):
+            ''.join(self.table_generator.iter_table(data, headers=['b'], sort_by=[('a', 'asc')]))
+
+    # Asset registry tests
+    def test_asset_registry_emits_shared_assets_once(self):
+        """Test that tables sharing a registry emit the sort and collapsible assets once"""
+        assets = AssetRegistry()
+        sections = []
+        for name in ('sales', 'staff'):
+            generator = TableGenerator(sortable=True, assets=assets)
+            table_html = generator.generate_table([{'Name': name}])
+            sections.append(generator.make_collapsible_with_css(
+                table_html, title=name, container_class=f'{name}-section', header_background='#4a90e2'))
+        
+        document = TableGenerator(assets=assets).render_html(''.join(sections))
+        
+        self.assertNotIn('<style>', ''.join(sections))
+        self.assertIn('class="collapsible-table sales-section"', document)
+        self.assertIn('--collapsible-header-background: #4a90e2;', document)
+        self.assertEqual(document.count('function sortTable('), 1)
+        self.assertEqual(document.count('.collapsible-table summary {'), 1)
+        self.assertEqual(assets.names(), ['sort', 'collapsible'])
+
+    def test_asset_registry_late_assets_and_new_documents(self):
+        """Test that assets registered while streaming still appear, once per document"""
+        assets = AssetRegistry()
+        generator = TableGenerator(assets=assets)
+        late = TableGenerator(sortable=True, assets=assets)
+        
+        stream = io.StringIO()
+        generator.write_document(late.iter_table([{'Name': 'Alice'}]), stream)
+        document = stream.getvalue()
+        second = generator.render_html('')
+        
+        self.assertLess(document.index('</head>'), document.index('.sortable th[data-sortable]'))
+        self.assertEqual(document.count('function sortTable('), 1)
+        self.assertEqual(second.count('function sortTable('), 1)
+
+    def test_asset_registry_external_files(self):
+        """Test writing the assets to content-hashed files"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            assets = AssetRegistry(tmp_dir, url_prefix='static/')
+            generator = TableGenerator(sortable=True, assets=assets)
+            
+            document = generator.render_html(generator.generate_table({'Name': 'Alice'}))
+            generator.render_html('')
+            files = sorted(os.listdir(tmp_dir))
+            
+            self.assertEqual(len(files), 2)
+            self.assertIn(f'<link rel="stylesheet" href="static/{files[0]}">', document)
+            self.assertIn(f'<script src="static/{files[1]}"></script>', document)
+            with open(os.path.join(tmp_dir, files[1]), encoding='utf-8') as f:
+                self.assertIn('function sortTable(', f.read())
+
+    # Lean markup tests
+    def _cell_texts(self, html):
+        return re.findall(r'<t[hd](?: [^>]*)?>([^<\n]*)', html)
+
+    def test_lean_markup(self):
+        """Test the lean profile: no indentation, optional end tags or per-cell attributes"""
+        data = [{'Name': 'R&D', 'Age': 30}, {'Name': 'Bob', 'Age': 25}]
+        styles = {'th': 'color: white;', 'td': 'padding: 8px;'}
+        pretty = TableGenerator(striped=True, styles=styles)
+        lean = TableGenerator(striped=True, styles=styles, markup='lean')
+        
+        result = lean.generate_table(data)
+        
+        self.assertNotIn('</td>', result)
+        self.assertNotIn('style=', result)
+        self.assertNotIn('class="odd"', result)
+        self.assertIn('\n<tr><td>R&amp;D<td>30\n', result)
+        self.assertTrue(result.endswith('\n</table>'))
+        self.assertEqual(self._cell_texts(result), self._cell_texts(pretty.generate_table(data)))
+        self.assertLess(len(result), len(pretty.generate_table(data)) / 2)
+
+    def test_lean_markup_stylesheet(self):
+        """Test that lean styles and striping move into one generated class"""
+        lean = TableGenerator(striped=True, styles={'td': 'padding: 8px;'}, markup='lean')
+        
+        table_html = lean.generate_table([{'Name': 'Alice'}])
+        lean_class = re.search(r'class="striped (lean-[0-9a-f]+)"', table_html).group(1)
+        document = lean.render_html(table_html)
+        
+        self.assertIn(f'.{lean_class} td {{\n    padding: 8px;\n}}', document)
+        self.assertIn(f'.{lean_class} > tbody > tr:nth-child(even)', document)
+        self.assertIsNone(TableGenerator(markup='lean')._get_lean_class())
+        with self.assertRaises(ValueError):
+            TableGenerator(markup='compact')
+
+    def test_lean_markup_other_inputs(self):
+        """Test lean markup for CSV-like, column-oriented and late-key data"""
+        lean = TableGenerator(markup='lean', header_sample=1, late_keys='append')
+        
+        csv_result = lean.generate_table([['Name', 'Age'], ['Alice', 30]])
+        column_result = lean.generate_columns({'Name': ['Alice'], 'Age': [30]})
+        late_result = lean.generate_table([{'Name': 'Alice'}, {'Name': 'Bob', 'Age': 25}])
+        
+        self.assertEqual(csv_result, column_result)
+        self.assertIn('\n<tfoot>\n<tr><th>Name<th>Age\n</table>', late_result)
+
+    # Compressed output tests
+    def test_write_table_compressed(self):
+        """Test that each codec produces the plain table when decompressed"""
+        data = [{'Name': f'User {i}', 'Note': 'R&D'} for i in range(100)]
+        expected = self.table_generator.generate_table(data).encode('utf-8')
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for compression, module in (('gzip', gzip), ('bz2', bz2), ('lzma', lzma)):
+                path = os.path.join(tmp_dir, f'table.{compression}')
+                self.table_generator.write_table(data, path, compression=compression, compresslevel=1)
+                with open(path, 'rb') as f:
+                    self.assertEqual(module.decompress(f.read()), expected)
+
+    def test_write_document_sidecar(self):
+        """Test writing the plain document and a compressed copy in one pass"""
+        generator = TableGenerator(sortable=True)
+        table_html = generator.generate_table({'Name': 'Alice'})
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'report.html')
+            generator.write_document(table_html, path, compression='gzip', sidecar=True)
+            generator.write_document(table_html, os.path.join(tmp_dir, 'again.html'),
+                                     compression='gzip', sidecar=True)
+            
+            with open(path, 'rb') as plain, gzip.open(path + '.gz') as compressed:
+                self.assertEqual(compressed.read(), plain.read())
+            with open(path + '.gz', 'rb') as first, open(os.path.join(tmp_dir, 'again.html.gz'), 'rb') as second:
+                # Reproducible output: no timestamp or file name in the gzip header
+                self.assertEqual(first.read(), second.read())
+
+    def test_write_table_compressed_streams(self):
+        """Test compression into binary streams and the unsupported combinations"""
+        stream = io.BytesIO()
+        self.table_generator.write_table({'Name': 'Alice'}, stream, compression='gzip')
+        
+        self.assertFalse(stream.closed)
+        self.assertEqual(gzip.decompress(stream.getvalue()).decode('utf-8'),
+                         self.table_generator.generate_table({'Name': 'Alice'}))
+        with self.assertRaises(ValueError):
+            self.table_generator.write_table({'Name': 'Alice'}, io.StringIO(), compression='gzip')
+        with self.assertRaises(ValueError):
+            self.table_generator.write_table({'Name': 'Alice'}, io.BytesIO(), compression='zip')
+        with self.assertRaises(ValueError):
+            self.table_generator.write_table({'Name': 'Alice'}, io.BytesIO(), sidecar=True)
+
+
+class TestAsyncTableGeneration(unittest.IsolatedAsyncioTestCase):
+    """aiter_table tests: same chunks as iter_table without blocking the event loop."""
+
+    def setUp(self):
+        self.rows = [{'ID': i, 'Name': f'User <{i}>'} for i in range(3000)]
+        self.generator = TableGenerator(striped=True, sortable=True)
+        # Streamed rows are not typed up front, unlike a list given to generate_table
+        self.expected = ''.join(self.generator.iter_table(iter(self.rows)))
+
+    async def collect(self, rows, **kwargs):
+        return [chunk async for chunk in self.generator.aiter_table(rows, **kwargs)]
+
+    async def async_rows(self, rows):
+        for row in rows:
+            await asyncio.sleep(0)
+            yield row
+
+    async def test_sync_rows_yield_between_chunks(self):
+        """Test that other tasks run between chunks of an inline render"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        chunks = await self.collect(iter(self.rows), chunk_size=4096)
+        task.cancel()
+
+        self.assertEqual(''.join(chunks), self.expected)
+        self.assertEqual(chunks, list(self.generator.iter_table(iter(self.rows), chunk_size=4096)))
+        self.assertGreaterEqual(ticks, len(chunks) - 1)
+
+    async def test_async_source_and_executor(self):
+        """Test async iterables (header row first too) and rendering in an executor"""
+        self.assertEqual(''.join(await self.collect(self.async_rows(self.rows))), self.expected)
+
+        csv_rows = [['ID', 'Name']] + [[row['ID'], row['Name']] for row in self.rows]
+        self.assertEqual(''.join(await self.collect(self.async_rows(csv_rows))),
+                         ''.join(self.generator.iter_table(iter(csv_rows))))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            chunks = await self.collect(self.rows, executor=executor,
+                                        sort_by=[('ID', 'desc')], limit=5)
+        self.assertEqual(''.join(chunks),
+                         self.generator.generate_table(self.rows, sort_by=[('ID', 'desc')], limit=5))
+
+    async def test_early_exit_and_errors(self):
+        """Test stopping after the first chunk and rejecting unsupported input"""
+        stream = self.generator.aiter_table(self.async_rows(self.rows), chunk_size=1024)
+        first = await stream.__anext__()
+        await stream.aclose()
+        self.assertTrue(self.expected.startswith(first))
+
+        self.assertEqual(''.join(await self.collect(self.async_rows([]))),
+                         ''.join(self.generator.iter_table(iter([]))))
+        with self.assertRaises(ValueError):
+            await self.collect('not rows')
+
+    async def test_cancel_during_executor_render(self):
+        """Test that cancelling a consumer mid-render raises CancelledError and closes the rows"""
+        closed = threading.Event()
+
+        def slow_rows():
+            try:
+                for row in self.rows:
+                    time.sleep(0.02)
+                    yield row
+            finally:
+                closed.set()
+
+        async def consume(executor):
+            async for _ in self.generator.aiter_table(slow_rows(), chunk_size=1, executor=executor):
+                pass
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task = asyncio.create_task(consume(executor))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The rows are closed once the chunk being rendered is finished
+            self.assertTrue(await asyncio.get_running_loop().run_in_executor(None, closed.wait, 5))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file